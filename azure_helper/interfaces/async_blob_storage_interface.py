@@ -0,0 +1,394 @@
+import asyncio
+import hashlib
+import threading
+from io import SEEK_END, BufferedReader, BytesIO, StringIO
+from typing import IO, Any, List, Optional, Set
+
+import pandas as pd
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.storage.blob import ContentSettings
+from azure.storage.blob.aio import BlobClient, BlobServiceClient
+
+from azure_helper.interfaces.blob_compression import (
+    SUPPORTED_ENCODINGS,
+    iter_decompressed,
+)
+from azure_helper.interfaces.blob_formats import (
+    check_csv_engine,
+    deserialize_df,
+    infer_format,
+    serialize_df,
+)
+from azure_helper.interfaces.blob_transfer import (
+    DEFAULT_BLOCK_SIZE,
+    ChunkReader,
+    UploadResult,
+    as_stream,
+    is_seekable,
+    is_unchanged,
+    iter_blocks,
+    iter_hashed,
+    open_source,
+    source_md5,
+)
+from azure_helper.logger import get_logger
+
+log = get_logger()
+
+
+class AsyncBlobStorageInterface:
+    def __init__(self, storage_acct_name: str, storage_acct_key: str):
+        """Asyncio version of the [`BlobStorageInterface`][azure_helper.interfaces.blob_storage_interface.BlobStorageInterface].
+
+        It exposes the same methods, as coroutines, on top of `azure.storage.blob.aio`. All the blobs are accessed
+        through a single `BlobServiceClient`, so all the transfers share the same HTTP session and connection pool,
+        and hundreds of them can run concurrently from a single event loop.
+
+        ```python
+        import asyncio
+
+        from azure_helper.interfaces.async_blob_storage_interface import AsyncBlobStorageInterface
+
+        async def upload_partitions(partitions):
+            async with AsyncBlobStorageInterface(
+                storage_acct_name="workspaceperso5448820782",
+                storage_acct_key="XXXXX-XXXX-XXXXX-XXXX",
+            ) as blob_storage_interface:
+                await asyncio.gather(
+                    *(
+                        blob_storage_interface.upload_df_to_blob(
+                            dataframe=partition,
+                            container_name="project-mlops-mk-5448820782",
+                            blob_path=f"raw/part-{idx}.parquet",
+                            overwrite=True,
+                        )
+                        for idx, partition in enumerate(partitions)
+                    ),
+                )
+        ```
+
+        !!! info "Information"
+
+            The asynchronous transport of the Azure SDK needs `aiohttp`, which can be installed with
+            `pip install azure_mlops_helper[aio]`.
+
+        Args:
+            storage_acct_name (str): The name of the storage account to which you want to connect.
+            storage_acct_key (str): The account key of the storage account.
+        """
+        self.storage_acct_name = storage_acct_name
+        self._known_containers: Set[str] = set()
+        self._known_containers_lock = threading.Lock()
+
+        conn_str = (
+            "DefaultEndpointsProtocol=https;"
+            + f"AccountName={storage_acct_name};"
+            + f"AccountKey={storage_acct_key};"
+            + "EndpointSuffix=core.windows.net"
+        )
+        self.blob_service_client = BlobServiceClient.from_connection_string(
+            conn_str,
+        )
+
+    async def __aenter__(self) -> "AsyncBlobStorageInterface":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the HTTP session shared by all the transfers."""
+        await self.blob_service_client.close()
+
+    async def create_container(self, container_name: str):
+        """Create a container inside the storage account.
+
+        Args:
+            container_name (str): the name of the container you want to create. This name can only contains
+                alphanumeric numbers and dashes '-'.
+        """
+        try:
+            await self.blob_service_client.create_container(container_name)
+            log.info(f"Creating blob storage container {container_name}.")
+        except ResourceExistsError:
+            log.warning(f"Blob storage container {container_name} already exists.")
+        with self._known_containers_lock:
+            self._known_containers.add(container_name)
+
+    async def ensure_container(self, container_name: str):
+        """Create a container inside the storage account, unless it is already known to exist.
+
+        Args:
+            container_name (str): the name of the container.
+        """
+        with self._known_containers_lock:
+            is_known = container_name in self._known_containers
+        if not is_known:
+            await self.create_container(container_name)
+
+    def forget_container(self, container_name: Optional[str] = None):
+        """Invalidate the cache of known containers.
+
+        Args:
+            container_name (Optional[str], optional): The container to forget. Defaults to None, ie all of them.
+        """
+        with self._known_containers_lock:
+            if container_name is None:
+                self._known_containers.clear()
+            else:
+                self._known_containers.discard(container_name)
+
+    async def upload_to_blob(
+        self,
+        dataset: Any,
+        container_name: str,
+        blob_path: str,
+        max_concurrency: int = 1,
+        overwrite: bool = False,
+        skip_unchanged: bool = False,
+    ) -> UploadResult:
+        """Upload a dataset file inside a blob.
+
+        See [`BlobStorageInterface.upload_to_blob`][azure_helper.interfaces.blob_storage_interface.BlobStorageInterface.upload_to_blob].
+
+        Args:
+            dataset (Any): The datas you want to upload. Either in-memory datas (`bytes`), a binary file-like object,
+                or the path (`pathlib.Path`) to a local file. Non seekable streams are read in memory first.
+            container_name (str): The name of the container on which you want to upload the datas.
+            blob_path (str): The path to the file.
+            max_concurrency (int, optional): The number of blocks uploaded in parallel for large datas.
+                Defaults to 1.
+            overwrite (bool, optional): Whether to replace an existing blob in a single request. Defaults to False.
+            skip_unchanged (bool, optional): Whether to skip the upload if the blob already contains the same datas.
+                Defaults to False.
+
+        Returns:
+            UploadResult: The number of bytes sent, and skipped.
+        """
+        await self.ensure_container(container_name)
+
+        blob_client = self.blob_service_client.get_blob_client(
+            container=container_name,
+            blob=blob_path,
+        )
+        with open_source(dataset) as source:
+            if not is_seekable(source):
+                source = as_stream(source).read()
+            md5 = None
+            if skip_unchanged:
+                loop = asyncio.get_running_loop()
+                md5 = await loop.run_in_executor(None, source_md5, source)
+                try:
+                    properties = await blob_client.get_blob_properties()
+                except ResourceNotFoundError:
+                    properties = None
+                if properties is not None and is_unchanged(properties, md5):
+                    log.info(
+                        f"Blob path {blob_path} already contains the same datas, skipping upload.",
+                    )
+                    return UploadResult(
+                        blob_path=blob_path,
+                        bytes_skipped=properties.size,
+                    )
+
+            stream = as_stream(source)
+            start = stream.tell()
+            size = stream.seek(0, SEEK_END) - start
+            stream.seek(start)
+            try:
+                await self._send(
+                    blob_client,
+                    stream,
+                    size,
+                    md5,
+                    overwrite,
+                    max_concurrency,
+                )
+                log.info(f"Dataset uploaded at blob path : {blob_path}.")
+            except ResourceExistsError:
+                log.warning(
+                    f"Blob path {blob_path} already contains datas. Now overwriting old datas with the new ones.",
+                )
+                # the blob is overwritten rather than deleted, so it is never lost in between.
+                stream.seek(start)
+                await self._send(blob_client, stream, size, md5, True, max_concurrency)
+                log.info(f"New dataset uploaded at blob path : {blob_path}.")
+            return UploadResult(blob_path=blob_path, bytes_sent=size)
+
+    async def _send(
+        self,
+        blob_client: BlobClient,
+        stream: IO[bytes],
+        size: int,
+        md5: Optional[bytes],
+        overwrite: bool,
+        max_concurrency: int,
+    ):
+        """Upload a stream with its Content-MD5, hashing it while it is sent if its MD5 is not known yet.
+
+        The SDK does not set the Content-MD5 of the blobs it stages in blocks, so it is always given, for
+        `skip_unchanged` to work on large files too.
+
+        Args:
+            blob_client (BlobClient): The client of the blob.
+            stream (IO[bytes]): The datas to upload.
+            size (int): The number of bytes to upload.
+            md5 (Optional[bytes]): The MD5 digest of the datas, or None to compute it from the datas sent.
+            overwrite (bool): Whether to replace an existing blob.
+            max_concurrency (int): The number of blocks uploaded in parallel for large datas.
+        """
+        if md5 is not None:
+            await blob_client.upload_blob(
+                stream,
+                length=size,
+                overwrite=overwrite,
+                max_concurrency=max_concurrency,
+                content_settings=ContentSettings(content_md5=bytearray(md5)),
+            )
+            return
+        # the datas are read once, the MD5 being updated as the SDK reads them.
+        hashed_md5 = hashlib.md5()  # noqa: S303
+        await blob_client.upload_blob(
+            BufferedReader(
+                ChunkReader(
+                    iter_hashed(iter_blocks(stream, DEFAULT_BLOCK_SIZE), hashed_md5),
+                ),
+            ),
+            length=size,
+            overwrite=overwrite,
+            max_concurrency=max_concurrency,
+        )
+        await blob_client.set_http_headers(
+            ContentSettings(content_md5=bytearray(hashed_md5.digest())),
+        )
+
+    async def upload_df_to_blob(
+        self,
+        dataframe: pd.DataFrame,
+        container_name: str,
+        blob_path: str,
+        file_format: Optional[str] = None,
+        compression: Optional[str] = None,
+        overwrite: bool = False,
+        skip_unchanged: bool = False,
+    ) -> UploadResult:
+        """Upload a pandas dataframe as a `csv` (or `parquet`, or `arrow`) file inside a blob.
+
+        The dataframe is serialized in a worker thread, so the event loop is not blocked meanwhile.
+
+        Args:
+            dataframe (pd.DataFrame): The dataframe you want to upload.
+            container_name (str): The name of the container on which you want to upload the dataframe.
+            blob_path (str): The path to the file.
+            file_format (Optional[str], optional): One of `csv`, `parquet` or `arrow`. Defaults to None, ie inferred
+                from `blob_path`.
+            compression (Optional[str], optional): The compression codec of a `parquet` or `arrow` file.
+                Defaults to None, ie the default codec of the format.
+            overwrite (bool, optional): Whether to replace an existing blob in a single request. Defaults to False.
+            skip_unchanged (bool, optional): Whether to skip the upload if the blob already contains the same datas.
+                Defaults to False.
+
+        Returns:
+            UploadResult: The number of bytes sent, and skipped.
+        """
+        file_format = infer_format(blob_path, file_format)
+        loop = asyncio.get_running_loop()
+        dataset = await loop.run_in_executor(
+            None,
+            serialize_df,
+            dataframe,
+            file_format,
+            compression,
+        )
+        return await self.upload_to_blob(
+            dataset,
+            container_name,
+            blob_path,
+            overwrite=overwrite,
+            skip_unchanged=skip_unchanged,
+        )
+
+    async def download_from_blob(self, container_name: str, blob_path: str) -> StringIO:
+        """Download a file a the given `blob_path` location and renders it as a StringIO buffer.
+
+        Args:
+            container_name (str): The name of the container.
+            blob_path (str): The path to the file.
+
+        Returns:
+            StringIO: the file as a StringIO buffer.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=container_name,
+            blob=blob_path,
+        )
+        content = await self._read_content(blob_client)
+        buffer = StringIO(content.decode())
+        log.info(f"Download from {container_name} ended successfully.")
+        return buffer
+
+    async def download_blob_to_df(
+        self,
+        container_name: str,
+        blob_path: str,
+        file_format: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        engine: str = "pandas",
+    ) -> pd.DataFrame:
+        """Download a `csv` (or `parquet`, or `arrow`) file a the given `blob_path` location and renders it as a pandas datatrame.
+
+        The file is parsed in a worker thread, so the event loop is not blocked meanwhile.
+
+        Args:
+            container_name (str): The name of the container.
+            blob_path (str): The path to the file.
+            file_format (Optional[str], optional): One of `csv`, `parquet` or `arrow`. Defaults to None, ie inferred
+                from `blob_path`.
+            columns (Optional[List[str]], optional): The columns to read. Defaults to None, ie all the columns.
+            engine (str, optional): The engine parsing a `csv` file, `pandas` or `pyarrow`. Defaults to `pandas`.
+
+        Raises:
+            ValueError: If the engine is not `pandas` or `pyarrow`.
+
+        Returns:
+            pd.DataFrame: the file as a dataframe.
+        """
+        file_format = infer_format(blob_path, file_format)
+        check_csv_engine(engine)
+        blob_client = self.blob_service_client.get_blob_client(
+            container=container_name,
+            blob=blob_path,
+        )
+        content = await self._read_content(blob_client)
+        loop = asyncio.get_running_loop()
+        dataframe = await loop.run_in_executor(
+            None,
+            deserialize_df,
+            BytesIO(content),
+            file_format,
+            columns,
+            engine,
+        )
+        log.info(f"Download from {container_name} ended successfully.")
+        return dataframe
+
+    async def _read_content(self, blob_client: BlobClient) -> bytes:
+        """Download a blob, decompressing it in a worker thread if needed.
+
+        Args:
+            blob_client (BlobClient): The client of the blob.
+
+        Returns:
+            bytes: The content of the blob.
+        """
+        # the transport would otherwise decode gzip by itself, but not zstd.
+        stream = await blob_client.download_blob(decompress=False)
+        content = await stream.readall()
+        content_encoding = stream.properties.content_settings.content_encoding
+        if content_encoding not in SUPPORTED_ENCODINGS:
+            return content
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: b"".join(iter_decompressed([content], content_encoding)),
+        )
@@ -0,0 +1,143 @@
+import threading
+import time
+from typing import Callable, Iterable, Iterator, Optional
+
+from pydantic import BaseModel
+
+
+class TransferProgress(BaseModel):
+    """Progress of a transfer, given to the progress callbacks.
+
+    Attributes:
+        bytes_done (int): The number of bytes transferred so far.
+        total_bytes (Optional[int]): The number of bytes to transfer, None if unknown, eg for compressed uploads.
+        elapsed (float): The time since the start of the transfer, in seconds.
+        bytes_per_s (float): The average throughput since the start of the transfer, in bytes per second.
+        eta (Optional[float]): The estimated time until the end of the transfer, in seconds, None if unknown.
+    """
+
+    bytes_done: int
+    total_bytes: Optional[int] = None
+    elapsed: float = 0
+    bytes_per_s: float = 0
+    eta: Optional[float] = None
+
+
+class ProgressTracker:
+    def __init__(
+        self,
+        callback: Callable[[TransferProgress], None],
+        total_bytes: Optional[int] = None,
+    ):
+        """Track the bytes transferred by the workers of a transfer, and report them to a callback.
+
+        Args:
+            callback (Callable[[TransferProgress], None]): Called after each block or file transferred. It is called
+                from the worker threads, so it should be quick, eg update a progress bar or log.
+            total_bytes (Optional[int], optional): The number of bytes to transfer. Defaults to None, ie unknown.
+        """
+        self.callback = callback
+        self.total_bytes = total_bytes
+        self._bytes_done = 0
+        self._start_time = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def update(self, size: int):
+        """Record bytes transferred, and report the progress.
+
+        Args:
+            size (int): The number of bytes just transferred.
+        """
+        with self._lock:
+            self._bytes_done += size
+            elapsed = time.perf_counter() - self._start_time
+            bytes_per_s = self._bytes_done / elapsed if elapsed > 0 else 0
+            eta = None
+            if self.total_bytes is not None and bytes_per_s > 0:
+                eta = max(self.total_bytes - self._bytes_done, 0) / bytes_per_s
+            progress = TransferProgress(
+                bytes_done=self._bytes_done,
+                total_bytes=self.total_bytes,
+                elapsed=elapsed,
+                bytes_per_s=bytes_per_s,
+                eta=eta,
+            )
+            self.callback(progress)
+
+
+class BandwidthLimiter:
+    def __init__(self, bytes_per_s: float, burst: Optional[float] = None):
+        """Cap the throughput of all the transfers sharing this limiter, with a token bucket.
+
+        The bucket fills with `bytes_per_s` tokens per second, up to `burst` tokens. Each block of datas takes as
+        many tokens as its size before being sent, waiting for the bucket to refill if needed, so the throughput
+        of all the transfers together stays at `bytes_per_s` on average, whatever their number.
+
+        ```python
+        blob_storage_interface = BlobStorageInterface(
+            storage_acct_name="workspaceperso5448820782",
+            storage_acct_key="XXXXX-XXXX-XXXXX-XXXX",
+            bandwidth_limiter=BandwidthLimiter(bytes_per_s=20 * 1024**2),
+        )
+        ```
+
+        !!! info "Information"
+
+            The datas are limited block by block, the throughput is then only smooth over durations longer than the
+            transfer of a block, ie `block_size / bytes_per_s`. Ranged reads are limited once their range is received.
+            The transfers of the `AsyncBlobStorageInterface` are not limited.
+
+        Args:
+            bytes_per_s (float): The maximum average throughput, in bytes per second.
+            burst (Optional[float], optional): The size of the bucket, in bytes. Defaults to None, ie one second of
+                throughput.
+
+        Raises:
+            ValueError: If the bandwidth is not positive.
+        """
+        if bytes_per_s <= 0:
+            raise ValueError("The bandwidth must be positive.")
+        self.bytes_per_s = bytes_per_s
+        self.burst = bytes_per_s if burst is None else burst
+        self._tokens = self.burst
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, size: int):
+        """Take `size` tokens from the bucket, waiting until the bucket is back to zero if it goes into debt.
+
+        Args:
+            size (int): The number of bytes about to be transferred.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst,
+                self._tokens + (now - self._last_refill) * self.bytes_per_s,
+            )
+            self._last_refill = now
+            # the debt is paid by waiting : the callers after this one wait for it too, so the limit holds across
+            # all the transfers.
+            self._tokens -= size
+            wait = -self._tokens / self.bytes_per_s if self._tokens < 0 else 0
+        if wait > 0:
+            time.sleep(wait)
+
+
+def throttled(
+    chunks: Iterable[bytes],
+    limiter: Optional[BandwidthLimiter],
+) -> Iterator[bytes]:
+    """Pass chunks of a download through a bandwidth limiter, if any.
+
+    Args:
+        chunks (Iterable[bytes]): The chunks being downloaded.
+        limiter (Optional[BandwidthLimiter]): The limiter, or None for no limit.
+
+    Yields:
+        bytes: The same chunks.
+    """
+    for chunk in chunks:
+        if limiter is not None:
+            limiter.consume(len(chunk))
+        yield chunk
@@ -0,0 +1,160 @@
+import hashlib
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import IO, Any, Callable, Union
+
+from pydantic import BaseModel
+
+from azure_helper.logger import get_logger
+
+log = get_logger()
+
+DEFAULT_CACHE_MAX_BYTES = 10 * 1024**3
+
+
+class CacheStats(BaseModel):
+    """Statistics of a blob cache, since its creation.
+
+    Attributes:
+        hits (int): The number of reads served from the cache.
+        misses (int): The number of reads which had to download the blob.
+        bytes_from_cache (int): The number of bytes read from the cache.
+        bytes_downloaded (int): The number of bytes downloaded to fill the cache.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    bytes_from_cache: int = 0
+    bytes_downloaded: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0
+
+
+class BlobCache:
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+    ):
+        """On-disk cache of blobs, validated by their ETag.
+
+        Each blob is stored in a file named after the hash of its storage account, container and path, and of its
+        ETag. A blob is then served from the cache only if a file exists for its current ETag, and a new version of
+        the blob is simply a new file. Files are written under a temporary name then renamed, so several processes
+        of the same node can safely share the same `cache_dir`.
+
+        When the cache grows over `max_bytes`, the least recently used files are evicted.
+
+        Args:
+            cache_dir (Union[str, Path]): The directory of the cache.
+            max_bytes (int, optional): The maximum size of the cache, in bytes. Defaults to 10GiB.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    def open(
+        self,
+        blob_key: str,
+        etag: str,
+        download: Callable[[IO[bytes]], Any],
+    ) -> IO[bytes]:
+        """Open the cached version of a blob, downloading it first if needed.
+
+        Args:
+            blob_key (str): The storage account, container and path of the blob, eg `account/container/path`.
+            etag (str): The current ETag of the blob.
+            download (Callable[[IO[bytes]], Any]): Function writing the blob to the binary file it is given.
+
+        Returns:
+            IO[bytes]: The cached blob, opened in binary mode.
+        """
+        key_hash = hashlib.sha256(blob_key.encode()).hexdigest()
+        etag_hash = hashlib.sha256(etag.encode()).hexdigest()[:16]
+        cached_path = self.cache_dir / f"{key_hash}-{etag_hash}"
+
+        try:
+            file_obj = open(cached_path, "rb")
+        except FileNotFoundError:
+            file_obj = None
+        if file_obj is not None:
+            # the modification time is used as the last access time for the LRU eviction.
+            try:
+                os.utime(cached_path)
+            except FileNotFoundError:
+                # evicted by another process since it was opened, it is downloaded again.
+                file_obj.close()
+                file_obj = None
+        if file_obj is not None:
+            self._record(hit=True, size=os.fstat(file_obj.fileno()).st_size)
+            log.info(f"Cache hit for {blob_key}.")
+            return file_obj
+
+        with tempfile.NamedTemporaryFile(
+            dir=self.cache_dir,
+            suffix=".tmp",
+            delete=False,
+        ) as tmp_file:
+            try:
+                download(tmp_file)
+            except BaseException:
+                tmp_file.close()
+                os.unlink(tmp_file.name)
+                raise
+        file_obj = open(tmp_file.name, "rb")
+        os.replace(tmp_file.name, cached_path)
+        self._record(hit=False, size=os.fstat(file_obj.fileno()).st_size)
+        log.info(f"Cache miss for {blob_key}.")
+
+        for stale_path in self.cache_dir.glob(f"{key_hash}-*"):
+            if stale_path != cached_path:
+                self._unlink(stale_path)
+        self.evict()
+        return file_obj
+
+    def evict(self):
+        """Remove the least recently used files until the cache fits in `max_bytes`."""
+        entries = []
+        for cached_path in self.cache_dir.iterdir():
+            if cached_path.suffix == ".tmp":
+                continue
+            try:
+                stat = cached_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, cached_path))
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, cached_path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            self._unlink(cached_path)
+            total_size -= size
+
+    def clear(self):
+        """Remove all the files of the cache."""
+        for cached_path in self.cache_dir.iterdir():
+            self._unlink(cached_path)
+
+    def _record(self, hit: bool, size: int):
+        with self._stats_lock:
+            if hit:
+                self.stats.hits += 1
+                self.stats.bytes_from_cache += size
+            else:
+                self.stats.misses += 1
+                self.stats.bytes_downloaded += size
+
+    def _unlink(self, cached_path: Path):
+        # Another process sharing the cache may have removed it already.
+        try:
+            cached_path.unlink()
+        except FileNotFoundError:
+            pass
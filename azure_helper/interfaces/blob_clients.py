@@ -0,0 +1,129 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from azure.core.pipeline.transport import RequestsTransport
+from azure.storage.blob import BlobServiceClient
+from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from azure_helper.logger import get_logger
+
+log = get_logger()
+
+# Clients shared by all the interfaces of the process, with their HTTP session, keyed by connection string and
+# transport options.
+_SHARED_CLIENTS: Dict[Tuple[str, Any], Tuple[BlobServiceClient, requests.Session]] = {}
+_SHARED_CLIENTS_LOCK = threading.Lock()
+
+
+class TransportOptions(BaseModel):
+    """Options of the pooled HTTP transport of a `BlobServiceClient`.
+
+    Attributes:
+        pool_connections (int): The number of hosts for which a pool of connections is kept.
+        pool_maxsize (int): The maximum number of connections kept open per host. It should be at least the number of
+            threads using the client at the same time, or connections are opened and closed for each request.
+        pool_block (bool): Whether to wait for a free connection instead of opening a new, unpooled one, when all the
+            connections of the pool are in use.
+        keep_alive (bool): Whether to keep the connections open between requests.
+        connection_timeout (float): The timeout to open a connection, in seconds.
+        read_timeout (float): The timeout between two bytes received, in seconds.
+    """
+
+    pool_connections: int = 10
+    pool_maxsize: int = 32
+    pool_block: bool = False
+    keep_alive: bool = True
+    connection_timeout: float = 20
+    read_timeout: float = 60
+
+
+def make_session(options: TransportOptions) -> requests.Session:
+    """Build a `requests` session with a pool of connections sized by `options`.
+
+    Args:
+        options (TransportOptions): The options of the transport.
+
+    Returns:
+        requests.Session: The session.
+    """
+    session = requests.Session()
+    # The Azure SDK retries the failed requests itself, urllib3 must not retry them again.
+    adapter = HTTPAdapter(
+        pool_connections=options.pool_connections,
+        pool_maxsize=options.pool_maxsize,
+        pool_block=options.pool_block,
+        max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not options.keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def make_transport(
+    options: TransportOptions,
+    session: Optional[requests.Session] = None,
+) -> RequestsTransport:
+    """Build a pooled HTTP transport for a `BlobServiceClient`.
+
+    Args:
+        options (TransportOptions): The options of the transport.
+        session (Optional[requests.Session], optional): The session of the transport, owned by the caller.
+            Defaults to None, ie a new session owned by the transport.
+
+    Returns:
+        RequestsTransport: The transport.
+    """
+    return RequestsTransport(
+        session=make_session(options) if session is None else session,
+        session_owner=session is None,
+        connection_timeout=options.connection_timeout,
+        read_timeout=options.read_timeout,
+    )
+
+
+def get_blob_service_client(
+    conn_str: str,
+    transport_options: Optional[TransportOptions] = None,
+) -> BlobServiceClient:
+    """Get the `BlobServiceClient` of a storage account shared by the whole process, creating it if needed.
+
+    All the callers asking for the same connection string and transport options get the same client, so they
+    share its pool of connections, and only pay the TCP and TLS handshakes once. The client can be used by several
+    threads at the same time.
+
+    Args:
+        conn_str (str): The connection string of the storage account.
+        transport_options (Optional[TransportOptions], optional): The options of the pooled transport.
+            Defaults to None, ie `TransportOptions()`.
+
+    Returns:
+        BlobServiceClient: The shared client.
+    """
+    options = TransportOptions() if transport_options is None else transport_options
+    key = (conn_str, tuple(vars(options).items()))
+    with _SHARED_CLIENTS_LOCK:
+        if key not in _SHARED_CLIENTS:
+            session = make_session(options)
+            blob_service_client = BlobServiceClient.from_connection_string(
+                conn_str,
+                transport=make_transport(options, session),
+            )
+            _SHARED_CLIENTS[key] = (blob_service_client, session)
+            log.info(
+                f"Created a shared client for storage account {blob_service_client.account_name}.",
+            )
+        return _SHARED_CLIENTS[key][0]
+
+
+def clear_blob_service_clients():
+    """Close the shared clients and their connections, eg before forking worker processes."""
+    with _SHARED_CLIENTS_LOCK:
+        for blob_service_client, session in _SHARED_CLIENTS.values():
+            blob_service_client.close()
+            session.close()
+        _SHARED_CLIENTS.clear()
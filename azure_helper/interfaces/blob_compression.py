@@ -0,0 +1,129 @@
+import zlib
+from typing import Any, Iterable, Iterator, Optional
+
+SUPPORTED_ENCODINGS = ("gzip", "zstd")
+
+
+def import_zstandard():
+    """Import the optional `zstandard` dependency needed by the `zstd` encoding.
+
+    Raises:
+        ImportError: If `zstandard` is not installed.
+
+    Returns:
+        module: The `zstandard` module.
+    """
+    try:
+        import zstandard  # noqa: WPS433
+    except ImportError as err:
+        raise ImportError(
+            "The 'zstd' encoding needs zstandard, install it with `pip install azure_mlops_helper[zstd]`.",
+        ) from err
+    return zstandard
+
+
+def check_encoding(content_encoding: str):
+    """Check that a content encoding is supported.
+
+    Args:
+        content_encoding (str): The content encoding.
+
+    Raises:
+        ValueError: If the encoding is not one of `SUPPORTED_ENCODINGS`.
+    """
+    if content_encoding not in SUPPORTED_ENCODINGS:
+        raise ValueError(
+            f"Unsupported content encoding {content_encoding}, must be one of {SUPPORTED_ENCODINGS}.",
+        )
+
+
+def make_compressor(content_encoding: str, level: Optional[int] = None) -> Any:
+    """Build a streaming compressor.
+
+    Args:
+        content_encoding (str): One of `SUPPORTED_ENCODINGS`.
+        level (Optional[int], optional): The compression level. Defaults to None, ie 6 for gzip and 3 for zstd.
+
+    Returns:
+        Any: An object with `compress(bytes) -> bytes` and `flush() -> bytes` methods.
+    """
+    check_encoding(content_encoding)
+    if content_encoding == "gzip":
+        # wbits=31 writes a gzip header, with no timestamp so the output only depends on the input.
+        return zlib.compressobj(6 if level is None else level, zlib.DEFLATED, 31)
+    zstandard = import_zstandard()
+    return zstandard.ZstdCompressor(level=3 if level is None else level).compressobj()
+
+
+def make_decompressor(content_encoding: str) -> Any:
+    """Build a streaming decompressor.
+
+    Args:
+        content_encoding (str): One of `SUPPORTED_ENCODINGS`.
+
+    Returns:
+        Any: An object with a `decompress(bytes) -> bytes` method.
+    """
+    check_encoding(content_encoding)
+    if content_encoding == "gzip":
+        return zlib.decompressobj(31)
+    zstandard = import_zstandard()
+    return zstandard.ZstdDecompressor().decompressobj()
+
+
+def iter_compressed(
+    blocks: Iterable[bytes],
+    content_encoding: str,
+    block_size: int,
+    level: Optional[int] = None,
+) -> Iterator[bytes]:
+    """Compress a stream of blocks, re-chunking the output in blocks of `block_size` bytes.
+
+    Only one input block and one output block are held in memory at a time.
+
+    Args:
+        blocks (Iterable[bytes]): The uncompressed blocks.
+        content_encoding (str): One of `SUPPORTED_ENCODINGS`.
+        block_size (int): The size of the compressed blocks, in bytes. The last one may be smaller.
+        level (Optional[int], optional): The compression level. Defaults to None, ie the default of the codec.
+
+    Yields:
+        bytes: The next compressed block.
+    """
+    compressor = make_compressor(content_encoding, level)
+    pending = bytearray()
+    for block in blocks:
+        pending += compressor.compress(block)
+        while len(pending) >= block_size:
+            yield bytes(pending[:block_size])
+            del pending[:block_size]
+    pending += compressor.flush()
+    while pending:
+        yield bytes(pending[:block_size])
+        del pending[:block_size]
+
+
+def iter_decompressed(
+    chunks: Iterable[bytes],
+    content_encoding: Optional[str],
+) -> Iterator[bytes]:
+    """Decompress a stream of chunks, if it is encoded with one of `SUPPORTED_ENCODINGS`.
+
+    Args:
+        chunks (Iterable[bytes]): The chunks of the blob, as stored.
+        content_encoding (Optional[str]): The content encoding of the blob.
+
+    Yields:
+        bytes: The next decompressed chunk, or the chunk as is if the blob is not compressed.
+    """
+    if content_encoding not in SUPPORTED_ENCODINGS:
+        yield from chunks
+        return
+    decompressor = make_decompressor(content_encoding)
+    for chunk in chunks:
+        decompressed = decompressor.decompress(chunk)
+        if decompressed:
+            yield decompressed
+    tail = decompressor.flush()
+    if tail:
+        yield tail
@@ -0,0 +1,185 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import IO, Any, Iterator, List, Optional
+
+import pandas as pd
+
+SUPPORTED_FORMATS = ("csv", "parquet", "arrow")
+CSV_ENGINES = ("pandas", "pyarrow")
+
+FORMAT_SUFFIXES = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+
+
+def infer_format(blob_path: str, file_format: Optional[str] = None) -> str:
+    """Find the format of a dataframe file, from its extension if not given explicitly.
+
+    Args:
+        blob_path (str): The path to the file.
+        file_format (Optional[str], optional): The format of the file, if known. Defaults to None.
+
+    Raises:
+        ValueError: If the format is not one of `SUPPORTED_FORMATS`.
+
+    Returns:
+        str: The format of the file, `csv` if it can not be inferred.
+    """
+    if file_format is None:
+        file_format = FORMAT_SUFFIXES.get(
+            PurePosixPath(blob_path).suffix.lower(),
+            "csv",
+        )
+    if file_format not in SUPPORTED_FORMATS:
+        raise ValueError(
+            f"Unsupported format {file_format}, must be one of {SUPPORTED_FORMATS}.",
+        )
+    return file_format
+
+
+def import_pyarrow_csv():
+    """Import the optional `pyarrow.csv` module needed by the `pyarrow` csv engine.
+
+    Raises:
+        ImportError: If `pyarrow` is not installed.
+
+    Returns:
+        module: The `pyarrow.csv` module.
+    """
+    try:
+        from pyarrow import csv  # noqa: WPS433
+    except ImportError as err:
+        raise ImportError(
+            "The 'pyarrow' csv engine needs pyarrow, install it with `pip install azure_mlops_helper[parquet]`.",
+        ) from err
+    return csv
+
+
+def check_csv_engine(engine: str) -> str:
+    """Check the engine parsing a `csv` file.
+
+    The engine is never chosen automatically: `pyarrow` infers some types differently than `pandas`, so the dtypes of
+    a dataframe would depend on the size of its file.
+
+    Args:
+        engine (str): The engine.
+
+    Raises:
+        ValueError: If the engine is not one of `CSV_ENGINES`.
+
+    Returns:
+        str: The engine.
+    """
+    if engine not in CSV_ENGINES:
+        raise ValueError(
+            f"Unsupported csv engine {engine}, must be one of {CSV_ENGINES}.",
+        )
+    return engine
+
+
+def serialize_df(
+    dataframe: pd.DataFrame,
+    file_format: str,
+    compression: Optional[str] = None,
+) -> bytes:
+    """Serialize a dataframe in the given format.
+
+    The `parquet` and `arrow` (Arrow IPC, aka Feather v2) formats need the optional `pyarrow` dependency, which can be
+    installed with `pip install azure_mlops_helper[parquet]`.
+
+    Args:
+        dataframe (pd.DataFrame): The dataframe to serialize.
+        file_format (str): One of `SUPPORTED_FORMATS`.
+        compression (Optional[str], optional): The compression codec used inside a columnar file, eg `snappy`, `zstd`
+            or `gzip` for parquet, `zstd` or `lz4` for arrow. Defaults to None, ie `snappy` for parquet and `lz4` for
+            arrow.
+
+    Raises:
+        ValueError: If a compression is asked for a `csv` file.
+
+    Returns:
+        bytes: The serialized dataframe.
+    """
+    if file_format == "csv":
+        if compression is not None:
+            raise ValueError(
+                "Compression is only supported by the 'parquet' and 'arrow' formats.",
+            )
+        return dataframe.to_csv(index=False, header=True).encode()
+
+    buffer = BytesIO()
+    if file_format == "parquet":
+        dataframe.to_parquet(buffer, index=False, compression=compression or "snappy")
+    else:
+        dataframe.reset_index(drop=True).to_feather(
+            buffer,
+            compression=compression or "lz4",
+        )
+    return buffer.getvalue()
+
+
+def iter_csv_chunks(dataframe: pd.DataFrame, chunksize: int) -> Iterator[bytes]:
+    """Serialize a dataframe as a `csv` file, `chunksize` rows at a time.
+
+    Joining the chunks gives the same file as `serialize_df(dataframe, "csv")`.
+
+    Args:
+        dataframe (pd.DataFrame): The dataframe to serialize.
+        chunksize (int): The number of rows of each chunk.
+
+    Yields:
+        bytes: The next serialized chunk, the first one starting with the header.
+    """
+    yield dataframe.iloc[:0].to_csv(index=False, header=True).encode()
+    for start in range(0, len(dataframe), chunksize):
+        yield dataframe.iloc[start : start + chunksize].to_csv(
+            index=False,
+            header=False,
+        ).encode()
+
+
+def deserialize_df(
+    source: IO[Any],
+    file_format: str,
+    columns: Optional[List[str]] = None,
+    engine: str = "pandas",
+) -> pd.DataFrame:
+    """Read a dataframe serialized in the given format.
+
+    For the `parquet` format, giving a seekable `source` allows to only read the footer of the file and the `columns`
+    asked for.
+
+    A `csv` file is parsed by a single thread with the `pandas` engine, or by all the cores of the node with the
+    `pyarrow` engine, which reads a binary `source` directly. `pyarrow` infers some types differently, eg it parses
+    the ISO 8601 datetimes as datetimes where `pandas` keeps strings.
+
+    Args:
+        source (IO[Any]): The serialized dataframe, as a file-like object.
+        file_format (str): One of `SUPPORTED_FORMATS`.
+        columns (Optional[List[str]], optional): The columns to read. Defaults to None, ie all the columns.
+        engine (str, optional): The engine parsing a `csv` file, one of `CSV_ENGINES`. Defaults to `pandas`.
+
+    Raises:
+        ValueError: If the engine is not one of `CSV_ENGINES`.
+
+    Returns:
+        pd.DataFrame: The dataframe.
+    """
+    if file_format == "csv" and check_csv_engine(engine) == "pyarrow":
+        csv = import_pyarrow_csv()
+        table = csv.read_csv(
+            source,
+            read_options=csv.ReadOptions(use_threads=True),
+            convert_options=csv.ConvertOptions(include_columns=columns),
+        )
+        return table.to_pandas()
+    if file_format == "csv":
+        return pd.read_csv(source, usecols=columns)
+    if file_format == "parquet":
+        return pd.read_parquet(source, columns=columns)
+    return pd.read_feather(source, columns=columns)
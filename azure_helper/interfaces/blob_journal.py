@@ -0,0 +1,109 @@
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import IO, Set, Union
+
+from pydantic import BaseModel, ValidationError
+
+from azure_helper.logger import get_logger
+
+log = get_logger()
+
+JOURNAL_SUFFIX = ".journal"
+
+
+class JournalHeader(BaseModel):
+    """What a journal was written for : a blob, and a version of a local file cut in blocks of a given size.
+
+    Attributes:
+        blob_url (str): The url of the blob.
+        source_size (int): The size of the local file, in bytes.
+        source_mtime_ns (int): The modification time of the local file, in nanoseconds.
+        block_size (int): The size of the blocks, in bytes.
+    """
+
+    blob_url: str
+    source_size: int
+    source_mtime_ns: int
+    block_size: int
+
+
+class UploadJournal:
+    def __init__(self, path: Path, header: JournalHeader):
+        """A local record of the blocks of a chunked upload already staged, to resume the upload if it dies.
+
+        The journal is a text file, with the header as its first line, then the id of each block staged, one per
+        line, appended as soon as the block is staged. A journal written for another blob, another version of the
+        file or another block size is discarded, and the upload starts again from the first block.
+
+        Args:
+            path (Path): The path of the journal.
+            header (JournalHeader): What the upload is for.
+        """
+        self.path = path
+        self.header = header
+        self.staged_ids: Set[str] = set()
+        self._lock = threading.Lock()
+
+        if path.exists():
+            # the last line, without its newline, may have been cut short by the crash of the previous upload.
+            lines = path.read_text().split("\n")[:-1]
+            try:
+                same_upload = (
+                    bool(lines) and JournalHeader.parse_raw(lines[0]) == header
+                )
+            except ValidationError:
+                same_upload = False
+            if same_upload:
+                self.staged_ids = set(lines[1:])
+                log.info(
+                    f"Resuming upload to {header.blob_url} : {len(self.staged_ids)} blocks already staged.",
+                )
+        if not self.staged_ids:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(header.json() + "\n")
+
+    def record(self, block_id: str):
+        """Record a block as staged.
+
+        Args:
+            block_id (str): The id of the block.
+        """
+        with self._lock:
+            with open(self.path, "a") as file_obj:
+                file_obj.write(f"{block_id}\n")
+
+    def remove(self):
+        """Remove the journal, once the upload is committed."""
+        self.path.unlink(missing_ok=True)
+
+
+def open_journal(
+    journal_dir: Union[str, Path],
+    blob_url: str,
+    source: IO[bytes],
+    block_size: int,
+) -> UploadJournal:
+    """Open the journal of the upload of a local file, resuming it if it matches the file.
+
+    Args:
+        journal_dir (Union[str, Path]): The directory of the journals.
+        blob_url (str): The url of the blob.
+        source (IO[bytes]): The local file, opened in binary mode.
+        block_size (int): The size of the blocks, in bytes.
+
+    Returns:
+        UploadJournal: The journal.
+    """
+    stat = os.fstat(source.fileno())
+    name = hashlib.md5(blob_url.encode()).hexdigest()  # noqa: S303
+    return UploadJournal(
+        Path(journal_dir) / f"{name}{JOURNAL_SUFFIX}",
+        JournalHeader(
+            blob_url=blob_url,
+            source_size=stat.st_size,
+            source_mtime_ns=stat.st_mtime_ns,
+            block_size=block_size,
+        ),
+    )
@@ -0,0 +1,282 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+METRICS_SAMPLE_SIZE = 1024
+METRICS_QUANTILES = (0.5, 0.95, 0.99)
+PROMETHEUS_PREFIX = "azure_helper_blob_operation"
+
+
+class OperationStats(BaseModel):
+    """Statistics of an operation on the blobs of a container.
+
+    Attributes:
+        operation (str): The operation, eg `upload` or `download`.
+        container (str): The name of the container.
+        count (int): The number of operations.
+        errors (int): The number of operations which raised an error.
+        retries (int): The number of requests retried by the Azure SDK during the operations.
+        bytes (int): The number of bytes transferred.
+        total_seconds (float): The total duration of the operations, in seconds.
+        p50 (float): The median duration of the last operations, in seconds.
+        p95 (float): The 95th percentile of the duration of the last operations, in seconds.
+        p99 (float): The 99th percentile of the duration of the last operations, in seconds.
+    """
+
+    operation: str
+    container: str
+    count: int = 0
+    errors: int = 0
+    retries: int = 0
+    bytes: int = 0
+    total_seconds: float = 0
+    p50: float = 0
+    p95: float = 0
+    p99: float = 0
+
+    @property
+    def mb_per_s(self) -> float:
+        return self.bytes / self.total_seconds / 1e6 if self.total_seconds else 0
+
+
+class Measurement:
+    def __init__(self):
+        """Measure of a single operation, filled by the operation while it runs.
+
+        Attributes:
+            size (int): The number of bytes transferred.
+            retries (int): The number of requests retried by the Azure SDK.
+        """
+        self.size = 0
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    @property
+    def request_kwargs(self) -> Dict[str, Any]:
+        """The keyword arguments to give to the requests of the operation, so their retries are counted."""
+        return {"retry_hook": self._on_retry}
+
+    def _on_retry(self, **kwargs):
+        with self._lock:
+            self.retries += 1
+
+
+class _NoMeasurement(Measurement):
+    @property
+    def request_kwargs(self) -> Dict[str, Any]:
+        return {}
+
+
+class BlobMetrics:
+    def __init__(self, sample_size: int = METRICS_SAMPLE_SIZE):
+        """Metrics of the operations of one or several blob storage interfaces, per operation and container.
+
+        The counters cover the whole life of the metrics, the latency percentiles the last `sample_size` operations
+        of each operation and container.
+
+        ```python
+        metrics = BlobMetrics()
+        blob_storage_interface = BlobStorageInterface(
+            storage_acct_name="workspaceperso5448820782",
+            storage_acct_key="XXXXX-XXXX-XXXXX-XXXX",
+            metrics=metrics,
+        )
+        ...
+        for stats in metrics.snapshot():
+            print(stats.operation, stats.container, stats.p95, stats.mb_per_s)
+        # or expose them to a Prometheus scrapper
+        metrics.to_prometheus()
+        ```
+
+        Args:
+            sample_size (int, optional): The number of durations kept per operation and container to compute the
+                percentiles. Defaults to 1024.
+        """
+        self.sample_size = sample_size
+        self._stats: Dict[Tuple[str, str], OperationStats] = {}
+        self._durations: Dict[Tuple[str, str], Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        operation: str,
+        container: str,
+        elapsed: float,
+        size: int = 0,
+        retries: int = 0,
+        error: bool = False,
+    ):
+        """Record an operation.
+
+        Args:
+            operation (str): The operation, eg `upload`.
+            container (str): The name of the container.
+            elapsed (float): The duration of the operation, in seconds.
+            size (int, optional): The number of bytes transferred. Defaults to 0.
+            retries (int, optional): The number of requests retried. Defaults to 0.
+            error (bool, optional): Whether the operation raised an error. Defaults to False.
+        """
+        key = (operation, container)
+        with self._lock:
+            if key not in self._stats:
+                self._stats[key] = OperationStats(
+                    operation=operation,
+                    container=container,
+                )
+                self._durations[key] = deque(maxlen=self.sample_size)
+            stats = self._stats[key]
+            stats.count += 1
+            stats.errors += int(error)
+            stats.retries += retries
+            stats.bytes += size
+            stats.total_seconds += elapsed
+            self._durations[key].append(elapsed)
+
+    def snapshot(self) -> List[OperationStats]:
+        """Get the statistics of each operation and container.
+
+        Returns:
+            List[OperationStats]: The statistics, sorted by operation and container.
+        """
+        with self._lock:
+            snapshot = []
+            for key in sorted(self._stats):
+                stats = self._stats[key].copy()
+                durations = sorted(self._durations[key])
+                stats.p50, stats.p95, stats.p99 = (
+                    durations[min(int(quantile * len(durations)), len(durations) - 1)]
+                    for quantile in METRICS_QUANTILES
+                )
+                snapshot.append(stats)
+        return snapshot
+
+    def reset(self):
+        """Forget all the operations recorded."""
+        with self._lock:
+            self._stats.clear()
+            self._durations.clear()
+
+    def to_json(self) -> str:
+        """Export the statistics as JSON.
+
+        Returns:
+            str: A JSON list with one object per operation and container.
+        """
+        return json.dumps(
+            [dict(stats.dict(), mb_per_s=stats.mb_per_s) for stats in self.snapshot()],
+        )
+
+    def to_prometheus(self) -> str:
+        """Export the statistics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics, with the durations as a summary and the bytes, errors and retries as counters.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f"# HELP {PROMETHEUS_PREFIX}_seconds Duration of the blob operations.",
+            f"# TYPE {PROMETHEUS_PREFIX}_seconds summary",
+        ]
+        for stats in snapshot:
+            labels = f'operation="{stats.operation}",container="{stats.container}"'
+            for quantile, duration in zip(
+                METRICS_QUANTILES,
+                (stats.p50, stats.p95, stats.p99),
+            ):
+                lines.append(
+                    f'{PROMETHEUS_PREFIX}_seconds{{{labels},quantile="{quantile}"}} {duration}',
+                )
+            lines.append(
+                f"{PROMETHEUS_PREFIX}_seconds_sum{{{labels}}} {stats.total_seconds}",
+            )
+            lines.append(f"{PROMETHEUS_PREFIX}_seconds_count{{{labels}}} {stats.count}")
+
+        for name, description in (
+            ("bytes", "Bytes transferred by the blob operations."),
+            ("errors", "Blob operations which raised an error."),
+            ("retries", "Requests retried during the blob operations."),
+        ):
+            lines.append(f"# HELP {PROMETHEUS_PREFIX}_{name}_total {description}")
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}_{name}_total counter")
+            for stats in snapshot:
+                labels = f'operation="{stats.operation}",container="{stats.container}"'
+                lines.append(
+                    f"{PROMETHEUS_PREFIX}_{name}_total{{{labels}}} {getattr(stats, name)}",
+                )
+        return "\n".join(lines) + "\n"
+
+
+@contextmanager
+def measured(
+    metrics: Optional[BlobMetrics],
+    operation: str,
+    container: str,
+) -> Iterator[Measurement]:
+    """Measure an operation, if metrics are enabled.
+
+    Args:
+        metrics (Optional[BlobMetrics]): The metrics, or None to measure nothing.
+        operation (str): The operation, eg `upload`.
+        container (str): The name of the container.
+
+    Yields:
+        Measurement: The measure, whose `size` must be set by the operation, and whose `request_kwargs` must be
+            given to its requests.
+    """
+    if metrics is None:
+        yield _NoMeasurement()
+        return
+    measurement = Measurement()
+    start_time = time.perf_counter()
+    try:
+        yield measurement
+    except BaseException:
+        metrics.record(
+            operation,
+            container,
+            time.perf_counter() - start_time,
+            measurement.size,
+            measurement.retries,
+            error=True,
+        )
+        raise
+    metrics.record(
+        operation,
+        container,
+        time.perf_counter() - start_time,
+        measurement.size,
+        measurement.retries,
+    )
+
+
+def iter_measured(
+    metrics: Optional[BlobMetrics],
+    operation: str,
+    container: str,
+    download: Callable[[Dict[str, Any]], Iterable[bytes]],
+) -> Iterator[bytes]:
+    """Measure a streamed operation, from its first request until its last chunk is consumed.
+
+    Args:
+        metrics (Optional[BlobMetrics]): The metrics, or None to measure nothing.
+        operation (str): The operation, eg `download`.
+        container (str): The name of the container.
+        download (Callable[[Dict[str, Any]], Iterable[bytes]]): Function starting the download, given the
+            `request_kwargs` of the measure, and returning its chunks.
+
+    Yields:
+        bytes: The next chunk.
+    """
+    with measured(metrics, operation, container) as measurement:
+        try:
+            for chunk in download(measurement.request_kwargs):
+                measurement.size += len(chunk)
+                yield chunk
+        except GeneratorExit:
+            # the stream was closed before its end, which is not an error.
+            return
@@ -0,0 +1,122 @@
+import uuid
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, TypeVar
+
+from pydantic import BaseModel
+
+MANIFEST_NAME = "_manifest.json"
+SYNC_MANIFEST_NAME = "_sync_manifest.json"
+MANIFEST_RETRIES = 5
+
+
+class Partition(BaseModel):
+    """A partition of a dataset, ie a blob holding the datas appended for a date.
+
+    Attributes:
+        partition_date (date): The date of the datas.
+        blob_path (str): The path of the blob.
+        file_format (str): The format of the blob, one of `csv`, `parquet` or `arrow`.
+        rows (int): The number of rows of the partition.
+        size (int): The size of the blob, in bytes.
+        created_at (datetime): When the partition was appended.
+    """
+
+    partition_date: date
+    blob_path: str
+    file_format: str
+    rows: int
+    size: int
+    created_at: datetime
+
+
+class PartitionManifest(BaseModel):
+    """The list of the partitions of a dataset, stored in a `_manifest.json` blob next to them.
+
+    Attributes:
+        partitions (List[Partition]): The partitions, in the order they were appended.
+    """
+
+    partitions: List[Partition] = []
+
+    def select(
+        self,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> List[Partition]:
+        """Select the partitions of a time window.
+
+        Args:
+            start (Optional[date], optional): The first date of the window. Defaults to None, ie no lower bound.
+            end (Optional[date], optional): The last date of the window, included. Defaults to None, ie no upper
+                bound.
+
+        Returns:
+            List[Partition]: The partitions of the window, sorted by date then by order of append.
+        """
+        selected = [
+            partition
+            for partition in self.partitions
+            if (start is None or partition.partition_date >= start)
+            and (end is None or partition.partition_date <= end)
+        ]
+        return sorted(selected, key=lambda partition: partition.partition_date)
+
+
+class SyncedFile(BaseModel):
+    """The fingerprint of a file synced to a blob.
+
+    Attributes:
+        md5 (str): The hexadecimal MD5 digest of the file.
+        size (int): The size of the file, in bytes.
+    """
+
+    md5: str
+    size: int
+
+
+class SyncManifest(BaseModel):
+    """The fingerprints of the files synced under a prefix, stored in a `_sync_manifest.json` blob next to them.
+
+    Attributes:
+        files (Dict[str, SyncedFile]): The fingerprints, by path relative to the prefix.
+    """
+
+    files: Dict[str, SyncedFile] = {}
+
+
+# The manifests are read and updated by the same optimistic concurrency loop, see `BlobStorageInterface`.
+Manifest = TypeVar("Manifest", bound=BaseModel)
+
+
+def manifest_path(prefix: str, name: str = MANIFEST_NAME) -> str:
+    """Get the path of the manifest of a dataset.
+
+    Args:
+        prefix (str): The prefix of the dataset, eg `raw/sales`.
+        name (str, optional): The name of the manifest. Defaults to `MANIFEST_NAME`.
+
+    Returns:
+        str: The path of its manifest.
+    """
+    return "/".join(part for part in (prefix.strip("/"), name) if part)
+
+
+def partition_path(prefix: str, partition_date: date, suffix: str) -> str:
+    """Get a new, unique, path for a partition of a dataset.
+
+    Several partitions can be appended for the same date, each one gets its own blob, so a partition is never
+    overwritten.
+
+    Args:
+        prefix (str): The prefix of the dataset, eg `raw/sales`.
+        partition_date (date): The date of the datas.
+        suffix (str): The extension of the blob, eg `.csv`.
+
+    Returns:
+        str: The path of the partition, eg `raw/sales/date=2022-09-01/part-20220901T235959-1a2b3c4d.csv`.
+    """
+    created_at = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    return (
+        f"{prefix.rstrip('/')}/date={partition_date.isoformat()}/"
+        + f"part-{created_at}-{uuid.uuid4().hex[:8]}{suffix}"
+    )
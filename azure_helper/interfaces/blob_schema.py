@@ -0,0 +1,188 @@
+import json
+from typing import IO, Any, Dict, List, Optional
+
+import pandas as pd
+
+SCHEMA_SUFFIX = ".schema.json"
+SCHEMA_VERSION = 2
+DATE_FORMAT = "%Y-%m-%d"
+SECONDS_FORMAT = "%Y-%m-%d %H:%M:%S"
+MICROSECONDS_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+# tz-aware datetimes are written with their UTC offset, and converted back to their time zone when read.
+TZ_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f%z"
+# the nulls of the text columns are written as `\N`, so they are not confused with empty strings.
+NULL_SENTINEL = "\\N"
+
+
+def schema_path(blob_path: str) -> str:
+    """Get the path of the schema sidecar of a `csv` file.
+
+    Args:
+        blob_path (str): The path to the `csv` file.
+
+    Returns:
+        str: The path to its schema, next to it.
+    """
+    return f"{blob_path}{SCHEMA_SUFFIX}"
+
+
+def make_schema(dataframe: pd.DataFrame) -> Dict[str, Any]:
+    """Describe the columns of a dataframe, to read its `csv` file back with the same dtypes.
+
+    Args:
+        dataframe (pd.DataFrame): The dataframe.
+
+    Returns:
+        Dict[str, Any]: The schema, serializable as JSON. Each column has a `dtype`, the `categories` and `ordered`
+            flag of a categorical column, the `format` and `tz` of a datetime column, or the `na_rep` written for
+            the nulls of a text column. Datetimes are kept to the microsecond.
+    """
+    columns = []
+    for name, dtype in dataframe.dtypes.items():
+        column: Dict[str, Any] = {"name": name, "dtype": str(dtype)}
+        if isinstance(dtype, pd.CategoricalDtype):
+            column["dtype"] = "category"
+            column["categories"] = dtype.categories.tolist()
+            column["ordered"] = bool(dtype.ordered)
+            column["na_rep"] = NULL_SENTINEL
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            column["na_rep"] = NULL_SENTINEL
+        elif pd.api.types.is_datetime64_any_dtype(dtype):
+            tz = getattr(dtype, "tz", None)
+            column["format"] = (
+                datetime_format(dataframe[name]) if tz is None else TZ_DATETIME_FORMAT
+            )
+            column["tz"] = None if tz is None else str(tz)
+        columns.append(column)
+    return {"version": SCHEMA_VERSION, "columns": columns}
+
+
+def datetime_format(datetimes: pd.Series) -> str:
+    """Find the shortest format keeping all the naive datetimes of a column, to the microsecond.
+
+    Args:
+        datetimes (pd.Series): The datetimes.
+
+    Returns:
+        str: The format, without the time if all the datetimes are dates, or without the microseconds if none has.
+    """
+    if (datetimes.dt.microsecond != 0).any():
+        return MICROSECONDS_FORMAT
+    if (datetimes.dt.normalize() != datetimes).any():
+        return SECONDS_FORMAT
+    return DATE_FORMAT
+
+
+def dumps_schema(schema: Dict[str, Any]) -> bytes:
+    """Serialize a schema as compact JSON.
+
+    Args:
+        schema (Dict[str, Any]): The schema.
+
+    Returns:
+        bytes: The serialized schema.
+    """
+    return json.dumps(schema, separators=(",", ":")).encode()
+
+
+def format_datetimes(dataframe: pd.DataFrame, schema: Dict[str, Any]) -> pd.DataFrame:
+    """Format the datetime columns of a dataframe as strings, with the format given by its schema.
+
+    The nulls of the text columns are replaced by their `na_rep`. The other columns are not copied.
+
+    Args:
+        dataframe (pd.DataFrame): The dataframe.
+        schema (Dict[str, Any]): The schema of the dataframe, from `make_schema`.
+
+    Returns:
+        pd.DataFrame: The dataframe, ready to be serialized as `csv`.
+    """
+    formatted = {}
+    for column in schema["columns"]:
+        series = dataframe[column["name"]]
+        if "format" in column:
+            formatted[column["name"]] = series.dt.strftime(column["format"])
+        elif "na_rep" in column and series.hasnans:
+            formatted[column["name"]] = series.astype(object).where(
+                series.notna(),
+                column["na_rep"],
+            )
+    return dataframe.assign(**formatted) if formatted else dataframe
+
+
+def read_csv_with_schema(
+    source: IO[Any],
+    schema: Dict[str, Any],
+    columns: Optional[List[str]] = None,
+    exact_floats: bool = False,
+) -> pd.DataFrame:
+    """Read a `csv` file with the explicit dtypes of its schema, instead of inferring them.
+
+    Only the empty fields, or the `na_rep` of the text columns, are read as nulls: strings like `NA` or `null`, and
+    the empty strings of the text columns, are kept as they are.
+
+    The default float parser of `pandas` may be off by one unit in the last place for about a third of the doubles.
+    `exact_floats=True` reads them back exactly, with the slower `round_trip` parser.
+
+    Args:
+        source (IO[Any]): The `csv` file.
+        schema (Dict[str, Any]): The schema of the file, from `make_schema`.
+        columns (Optional[List[str]], optional): The columns to read. Defaults to None, ie all the columns.
+        exact_floats (bool, optional): Whether to read the floats back exactly. Defaults to False.
+
+    Returns:
+        pd.DataFrame: The dataframe, with the dtypes it had when written.
+    """
+    schema_columns = [
+        column
+        for column in schema["columns"]
+        if columns is None or column["name"] in columns
+    ]
+    dtypes: Dict[str, Any] = {}
+    for column in schema_columns:
+        if column["dtype"] == "category":
+            dtypes[column["name"]] = pd.CategoricalDtype(
+                column["categories"],
+                column["ordered"],
+            )
+        elif "format" in column or is_timedelta(column):
+            dtypes[column["name"]] = "object"
+        else:
+            dtypes[column["name"]] = column["dtype"]
+
+    dataframe = pd.read_csv(
+        source,
+        usecols=columns,
+        dtype=dtypes,
+        keep_default_na=False,
+        na_values={
+            column["name"]: [column.get("na_rep", "")] for column in schema_columns
+        },
+        float_precision="round_trip" if exact_floats else None,
+    )
+    for column in schema_columns:
+        if is_timedelta(column):
+            timedeltas = pd.to_timedelta(dataframe[column["name"]])
+            dataframe[column["name"]] = timedeltas.astype(column["dtype"])
+        elif "format" in column:
+            datetimes = pd.to_datetime(
+                dataframe[column["name"]],
+                format=column["format"],
+                utc=column["tz"] is not None,
+            )
+            if column["tz"] is not None:
+                datetimes = datetimes.dt.tz_convert(column["tz"])
+            dataframe[column["name"]] = datetimes.astype(column["dtype"])
+    return dataframe
+
+
+def is_timedelta(column: Dict[str, Any]) -> bool:
+    """Whether a column of a schema holds timedeltas, which `pd.read_csv` can not parse by itself.
+
+    Args:
+        column (Dict[str, Any]): The column, from `make_schema`.
+
+    Returns:
+        bool: True if the column holds timedeltas.
+    """
+    return column["dtype"].startswith("timedelta64")
@@ -1,16 +1,162 @@
-from io import StringIO
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
+import random
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from datetime import date, datetime, timezone
+from io import SEEK_END, BufferedReader, BytesIO, RawIOBase, StringIO
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 import pandas as pd
-from azure.core.exceptions import ResourceExistsError
-from azure.storage.blob import BlobServiceClient
+from azure.core import MatchConditions
+from azure.core.exceptions import (
+    AzureError,
+    ResourceExistsError,
+    ResourceModifiedError,
+    ResourceNotFoundError,
+)
+from azure.storage.blob import (
+    BlobClient,
+    BlobProperties,
+    BlobServiceClient,
+    ContentSettings,
+    StorageStreamDownloader,
+)
 
+from azure_helper.interfaces.blob_bandwidth import (
+    BandwidthLimiter,
+    ProgressTracker,
+    TransferProgress,
+    throttled,
+)
+from azure_helper.interfaces.blob_cache import DEFAULT_CACHE_MAX_BYTES, BlobCache
+from azure_helper.interfaces.blob_clients import (
+    TransportOptions,
+    get_blob_service_client,
+    make_transport,
+)
+from azure_helper.interfaces.blob_compression import (
+    SUPPORTED_ENCODINGS,
+    iter_compressed,
+    iter_decompressed,
+)
+from azure_helper.interfaces.blob_formats import (
+    check_csv_engine,
+    deserialize_df,
+    infer_format,
+    iter_csv_chunks,
+    serialize_df,
+)
+from azure_helper.interfaces.blob_journal import open_journal
+from azure_helper.interfaces.blob_metrics import (
+    BlobMetrics,
+    Measurement,
+    iter_measured,
+    measured,
+)
+from azure_helper.interfaces.blob_partitions import (
+    MANIFEST_RETRIES,
+    SYNC_MANIFEST_NAME,
+    Manifest,
+    Partition,
+    PartitionManifest,
+    SyncedFile,
+    SyncManifest,
+    manifest_path,
+    partition_path,
+)
+from azure_helper.interfaces.blob_schema import (
+    dumps_schema,
+    format_datetimes,
+    make_schema,
+    read_csv_with_schema,
+    schema_path,
+)
+from azure_helper.interfaces.blob_throttling import (
+    AdaptiveConcurrencyLimiter,
+    iter_limited,
+    limited,
+)
+from azure_helper.interfaces.blob_transfer import (
+    DEFAULT_BLOCK_SIZE,
+    SOURCE_MD5_KEY,
+    BlobRangeReader,
+    ChunkReader,
+    CopyResult,
+    DownloadResult,
+    UploadOptions,
+    UploadResult,
+    as_stream,
+    dataset_size,
+    is_downloaded,
+    is_seekable,
+    is_unchanged,
+    iter_blocks,
+    iter_hashed,
+    iter_prefetched,
+    open_source,
+    source_md5,
+    stage_blocks,
+)
+from azure_helper.interfaces.blob_versions import (
+    BlobVersion,
+    VersionIndex,
+    versions_path,
+)
 from azure_helper.logger import get_logger
 
 log = get_logger()
 
+RANGE_READ_BUFFER_SIZE = 1024 * 1024
+RETRY_BACKOFF = 0.5
+HEAD_READ_SIZE = 64 * 1024
+SAMPLE_WINDOW = 64 * 1024
+COPY_POLL_INTERVAL = 1.0
+
+# (storage account, container) pairs known to exist, shared by the interfaces created
+# with `share_container_cache=True`.
+_SHARED_KNOWN_CONTAINERS: Set[Tuple[str, str]] = set()
+_SHARED_KNOWN_CONTAINERS_LOCK = threading.Lock()
+
 
 class BlobStorageInterface:
-    def __init__(self, storage_acct_name: str, storage_acct_key: str):
+    def __init__(
+        self,
+        storage_acct_name: str,
+        storage_acct_key: str,
+        share_container_cache: bool = False,
+        cache_dir: Optional[Union[str, Path]] = None,
+        cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+        shared_client: bool = False,
+        transport_options: Optional[TransportOptions] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        metrics: Optional[BlobMetrics] = None,
+        bandwidth_limiter: Optional[BandwidthLimiter] = None,
+    ):
         """Class responsible to interact with an existing Azure Storage Account.
 
         It uses a connection string to connect to the Storage Account.
@@ -38,19 +184,88 @@ class BlobStorageInterface:
         * Uploading a dataframe (as a `csv` for now) inside a blob in one of the container of the storage account.
         * Download a `csv` from a blob in one of the container of the storage account and render it as a pandas dataframe.
 
+        The containers created or found to already exist are remembered, so the uploads to a known container do not
+        ask the storage account to create it again. This cache is owned by the interface, or shared by all the
+        interfaces of the process created with `share_container_cache=True`. If a container is deleted behind its
+        back, use [`forget_container`][azure_helper.interfaces.blob_storage_interface.BlobStorageInterface.forget_container].
+
+        Giving a `cache_dir` enables an on-disk [`BlobCache`][azure_helper.interfaces.blob_cache.BlobCache] for
+        the downloads : each read first asks for the ETag of the blob, and is served from the disk if the blob did not
+        change since it was cached, at the cost of a single metadata request. The hits and misses are available in
+        `blob_storage_interface.cache.stats`.
+
+        Each interface opens its own HTTP session by default. Services creating many interfaces, eg one per request,
+        should use `shared_client=True` : all the interfaces of the process for the same storage account then share
+        the same client from [`get_blob_service_client`][azure_helper.interfaces.blob_clients.get_blob_service_client],
+        and its pool of open connections. The size of the pool and the timeouts are set with `transport_options`.
+
+        Giving a [`concurrency_limiter`][azure_helper.interfaces.blob_throttling.AdaptiveConcurrencyLimiter] adapts the
+        number of concurrent uploads, downloads, range reads and copies to the throttling of the storage account. A
+        slot is held during each request, or while each chunk of a streamed download is fetched. Its current limit and
+        throughput are available in `blob_storage_interface.concurrency_limiter.stats`.
+
+        Giving [`metrics`][azure_helper.interfaces.blob_metrics.BlobMetrics] records the count, bytes, duration and
+        retries of the uploads, downloads and range reads, per container.
+
+        Giving a [`bandwidth_limiter`][azure_helper.interfaces.blob_bandwidth.BandwidthLimiter] caps the throughput of
+        all the uploads and downloads of the interface together, eg to leave room for the production traffic of the
+        host. Uploads are then always sent block by block.
+
         Args:
             storage_acct_name (str): The name of the storage account to which you want to connect.
             storage_acct_key (str): The account key of the storage account.
+            share_container_cache (bool, optional): Whether to use the process-wide cache of known containers.
+                Defaults to False.
+            cache_dir (Optional[Union[str, Path]], optional): The directory of the download cache, which can be
+                shared by several processes. Defaults to None, ie no cache.
+            cache_max_bytes (int, optional): The maximum size of the download cache, in bytes. Defaults to 10GiB.
+            shared_client (bool, optional): Whether to use the process-wide client of the storage account.
+                Defaults to False.
+            transport_options (Optional[TransportOptions], optional): The options of the pooled HTTP transport.
+                Defaults to None, ie the default transport of the Azure SDK, or `TransportOptions()` for a shared
+                client.
+            concurrency_limiter (Optional[AdaptiveConcurrencyLimiter], optional): The limiter of the concurrent
+                requests, which can be shared by several interfaces. Defaults to None, ie no limit but the number of
+                workers of each transfer.
+            metrics (Optional[BlobMetrics], optional): The metrics of the operations, which can be shared by several
+                interfaces. Defaults to None, ie no metrics.
+            bandwidth_limiter (Optional[BandwidthLimiter], optional): The limiter of the throughput of the transfers,
+                which can be shared by several interfaces. Defaults to None, ie no limit.
         """
+        self.storage_acct_name = storage_acct_name
+        self.concurrency_limiter = concurrency_limiter
+        self.metrics = metrics
+        self.bandwidth_limiter = bandwidth_limiter
+        if share_container_cache:
+            self._known_containers = _SHARED_KNOWN_CONTAINERS
+            self._known_containers_lock = _SHARED_KNOWN_CONTAINERS_LOCK
+        else:
+            self._known_containers = set()
+            self._known_containers_lock = threading.Lock()
+        self.cache = (
+            None if cache_dir is None else BlobCache(cache_dir, cache_max_bytes)
+        )
+
         conn_str = (
             "DefaultEndpointsProtocol=https;"
             + f"AccountName={storage_acct_name};"
             + f"AccountKey={storage_acct_key};"
             + "EndpointSuffix=core.windows.net"
         )
-        self.blob_service_client = BlobServiceClient.from_connection_string(
-            conn_str,
-        )
+        if shared_client:
+            self.blob_service_client = get_blob_service_client(
+                conn_str,
+                transport_options,
+            )
+        elif transport_options is not None:
+            self.blob_service_client = BlobServiceClient.from_connection_string(
+                conn_str,
+                transport=make_transport(transport_options),
+            )
+        else:
+            self.blob_service_client = BlobServiceClient.from_connection_string(
+                conn_str,
+            )
 
     def create_container(self, container_name: str):
         """Create a container inside the storage account.
@@ -64,14 +279,59 @@ class BlobStorageInterface:
             log.info(f"Creating blob storage container {container_name}.")
         except ResourceExistsError:
             log.warning(f"Blob storage container {container_name} already exists.")
-            pass
+        with self._known_containers_lock:
+            self._known_containers.add((self.storage_acct_name, container_name))
+
+    def ensure_container(self, container_name: str):
+        """Create a container inside the storage account, unless it is already known to exist.
+
+        Args:
+            container_name (str): the name of the container.
+        """
+        with self._known_containers_lock:
+            is_known = (
+                self.storage_acct_name,
+                container_name,
+            ) in self._known_containers
+        if not is_known:
+            self.create_container(container_name)
+
+    def forget_container(self, container_name: Optional[str] = None):
+        """Invalidate the cache of known containers.
+
+        The next upload to a forgotten container will ask the storage account to create it again.
+
+        Args:
+            container_name (Optional[str], optional): The container to forget. Defaults to None, ie all the
+                containers of the storage account.
+        """
+        with self._known_containers_lock:
+            if container_name is None:
+                self._known_containers.difference_update(
+                    {
+                        key
+                        for key in self._known_containers
+                        if key[0] == self.storage_acct_name
+                    },
+                )
+            else:
+                self._known_containers.discard((self.storage_acct_name, container_name))
 
     def upload_to_blob(
         self,
         dataset,
         container_name: str,
         blob_path: str,
-    ):
+        block_size: Optional[int] = None,
+        max_concurrency: int = 1,
+        overwrite: bool = False,
+        skip_unchanged: bool = False,
+        content_encoding: Optional[str] = None,
+        compression_level: Optional[int] = None,
+        keep_version: bool = False,
+        journal_dir: Optional[Union[str, Path]] = None,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
+    ) -> UploadResult:
         """Upload a dataset file inside a blob.
 
         Eg the following code.
@@ -108,40 +368,401 @@ class BlobStorageInterface:
 
         !!! attention "Attention"
 
-            As of now, there is no **data versioning**. Meaning that if the `blob_path` already exists, it will be
-            overwritten with new datas.
+            By default, there is no **data versioning**. Meaning that if the `blob_path` already exists, it will be
+            overwritten with new datas. With `keep_version=True`, each upload is kept as a new version of the blob,
+            see [`list_versions`][azure_helper.interfaces.blob_storage_interface.BlobStorageInterface.list_versions].
+
+        For large files, giving a `block_size` or a `max_concurrency` greater than 1 switches to a chunked upload :
+        the datas are cut into blocks of `block_size` bytes, which are staged in parallel by `max_concurrency`
+        workers, then committed all at once. At most `max_concurrency` blocks are held in memory at the same time.
+
+        ```python
+        blob_storage_interface.upload_to_blob(
+            dataset=Path("dumps/train.csv"),
+            container_name="project-mlops-mk-5448820782",
+            blob_path="raw/train.csv",
+            block_size=16 * 1024 * 1024,
+            max_concurrency=8,
+        )
+        ```
+
+        By default, uploading to an existing blob costs three requests (a failed upload, a deletion, a second upload),
+        and the blob is missing in between. With `overwrite=True`, the existing blob is replaced atomically in a single
+        request. With `skip_unchanged=True`, the MD5 of the datas is compared with the one of the existing blob first,
+        and nothing is sent if they match.
+
+        ```python
+        result = blob_storage_interface.upload_to_blob(
+            dataset=dataset,
+            container_name="project-mlops-mk-5448820782",
+            blob_path="raw/data.csv",
+            overwrite=True,
+            skip_unchanged=True,
+        )
+        print(result.bytes_sent, result.bytes_skipped)
+        ```
+
+        With a `content_encoding` (`gzip` or `zstd`), the datas are compressed block by block while they are uploaded,
+        and the `Content-Encoding` of the blob is set accordingly. The download methods of this class decompress them
+        transparently. The `zstd` codec needs the optional `zstandard` dependency
+        (`pip install azure_mlops_helper[zstd]`).
+
+        A chunked upload of a local file can be made resumable by giving a `journal_dir` : the id of each block is
+        appended to a small journal in this directory as soon as the block is staged. If the upload dies, calling
+        `upload_to_blob` again with the same arguments only sends the blocks which are not staged yet, then commits
+        the blob and removes the journal. The journal is discarded if the file was modified in between.
+
+        ```python
+        result = blob_storage_interface.upload_to_blob(
+            dataset=Path("dumps/train.csv"),
+            container_name="project-mlops-mk-5448820782",
+            blob_path="raw/train.csv",
+            max_concurrency=8,
+            journal_dir=".upload-journals",
+        )
+        print(result.bytes_sent, result.bytes_resumed)
+        ```
+
+        !!! info "Information"
+
+            The storage account discards the blocks staged but not committed after a week, or as soon as another
+            upload commits the blob. The upload then starts again from the first block.
+
+        Giving a `progress_callback` switches to a chunked upload, and reports the progress after each block.
 
+        ```python
+        blob_storage_interface.upload_to_blob(
+            dataset=Path("dumps/train.csv"),
+            container_name="project-mlops-mk-5448820782",
+            blob_path="raw/train.csv",
+            progress_callback=lambda progress: print(progress.bytes_done, progress.bytes_per_s, progress.eta),
+        )
+        ```
 
         Args:
-            dataset (Any): The datas you want to upload.
+            dataset (Any): The datas you want to upload. Either in-memory datas (`bytes`), a binary file-like object,
+                or the path (`pathlib.Path`) to a local file.
             container_name (str): The name of the container on which you want to upload the dataframe.
             blob_path (str): The path to the csv
+            block_size (Optional[int], optional): The size of the blocks of a chunked upload, in bytes.
+                Defaults to None, ie 8MiB if `max_concurrency` is greater than 1, otherwise a single request upload.
+            max_concurrency (int, optional): The number of blocks staged in parallel. Defaults to 1.
+            overwrite (bool, optional): Whether to replace an existing blob in a single request. Defaults to False.
+            skip_unchanged (bool, optional): Whether to skip the upload if the blob already contains the same datas.
+                Only possible if the datas are in memory, a local file or a seekable stream. Defaults to False.
+            content_encoding (Optional[str], optional): The codec used to compress the datas, `gzip` or `zstd`.
+                Defaults to None, ie no compression.
+            compression_level (Optional[int], optional): The compression level of the codec. Defaults to None, ie 6
+                for gzip and 3 for zstd.
+            keep_version (bool, optional): Whether to keep the datas uploaded as a new version of the blob. Implies
+                `overwrite=True`. Defaults to False.
+            journal_dir (Optional[Union[str, Path]], optional): The directory of the journal making the upload
+                resumable, only for a local file without `content_encoding`. Defaults to None, ie not resumable.
+            progress_callback (Optional[Callable[[TransferProgress], None]], optional): Called with the bytes done,
+                throughput and estimated time left after each block uploaded. Defaults to None.
+
+        Raises:
+            ValueError: If a `journal_dir` is given for something else than an uncompressed local file.
+
+        Returns:
+            UploadResult: The number of bytes sent, skipped, and resumed.
         """
-        self.create_container(container_name)
+        if journal_dir is not None and (
+            not isinstance(dataset, os.PathLike) or content_encoding is not None
+        ):
+            raise ValueError(
+                "Only the uploads of uncompressed local files can be resumed.",
+            )
+        options = UploadOptions(
+            block_size=block_size,
+            max_concurrency=max_concurrency,
+            overwrite=overwrite or keep_version,
+            skip_unchanged=skip_unchanged,
+            content_encoding=content_encoding,
+            compression_level=compression_level,
+            journal_dir=None if journal_dir is None else str(journal_dir),
+            progress_callback=progress_callback,
+        )
+        self.ensure_container(container_name)
 
         blob_client = self.blob_service_client.get_blob_client(
             container=container_name,
             blob=blob_path,
         )
+        with open_source(dataset) as source:
+            result = self._upload(blob_client, blob_path, source, options)
+        if keep_version and not result.skipped:
+            self._add_version(blob_client, container_name, blob_path, result.bytes_sent)
+        return result
 
-        try:
-            blob_client.upload_blob(dataset)
-            log.info(f"Dataset uploaded at blob path : {blob_path}.")
-        except ResourceExistsError:
-            log.warning(
-                f"Blob path {blob_path} already contains datas. Now deleting old datas tu upload the new ones.",
+    def _upload(
+        self,
+        blob_client: BlobClient,
+        blob_path: str,
+        source: Union[bytes, IO[bytes]],
+        options: UploadOptions,
+        remote_blobs: Optional[Dict[str, BlobProperties]] = None,
+    ) -> UploadResult:
+        start_time = time.perf_counter()
+        with measured(
+            self.metrics,
+            "upload",
+            blob_client.container_name,
+        ) as measurement:
+            result = self._send(
+                blob_client,
+                blob_path,
+                source,
+                options,
+                remote_blobs,
+                measurement.request_kwargs,
+            )
+            measurement.size = result.bytes_sent
+        result.elapsed = time.perf_counter() - start_time
+        return result
+
+    def _send(
+        self,
+        blob_client: BlobClient,
+        blob_path: str,
+        source: Union[bytes, IO[bytes]],
+        options: UploadOptions,
+        remote_blobs: Optional[Dict[str, BlobProperties]],
+        request_kwargs: Dict[str, Any],
+    ) -> UploadResult:
+        seekable = is_seekable(source)
+        # a bandwidth limit is applied block by block.
+        in_blocks = (
+            options.chunked or self.bandwidth_limiter is not None or not seekable
+        )
+        # the blocks are hashed while they are staged, the source is only read beforehand to skip it, or to send it
+        # in a single request.
+        md5 = None
+        if seekable and (options.skip_unchanged or not in_blocks):
+            md5 = source_md5(source)
+        if options.skip_unchanged and md5 is not None:
+            if remote_blobs is None:
+                properties = self._get_properties(blob_client)
+            else:
+                properties = remote_blobs.get(blob_path)
+            if properties is not None and is_unchanged(properties, md5):
+                log.info(
+                    f"Blob path {blob_path} already contains the same datas, skipping upload.",
+                )
+                return UploadResult(blob_path=blob_path, bytes_skipped=properties.size)
+
+        if in_blocks or md5 is None:
+            return self._send_blocks(
+                blob_client,
+                blob_path,
+                source,
+                options,
+                request_kwargs,
+            )
+
+        stream = as_stream(source)
+        start = stream.tell()
+        size = stream.seek(0, SEEK_END) - start
+        stream.seek(start)
+        # the SDK only sets the Content-MD5 of the blobs sent in a single request, not of the ones it stages in blocks
+        # past `max_single_put_size`, so it is always given, for `skip_unchanged` to work on large files too.
+        content_settings = ContentSettings(content_md5=bytearray(md5))
+
+        with limited(self.concurrency_limiter) as limiter_kwargs:
+            request_kwargs = dict(request_kwargs, **limiter_kwargs)
+            if options.overwrite:
+                blob_client.upload_blob(
+                    source,
+                    overwrite=True,
+                    content_settings=content_settings,
+                    **request_kwargs,
+                )
+                log.info(f"Dataset uploaded at blob path : {blob_path}.")
+                return UploadResult(blob_path=blob_path, bytes_sent=size)
+
+            try:
+                blob_client.upload_blob(
+                    source,
+                    content_settings=content_settings,
+                    **request_kwargs,
+                )
+                log.info(f"Dataset uploaded at blob path : {blob_path}.")
+            except ResourceExistsError:
+                log.warning(
+                    f"Blob path {blob_path} already contains datas. Now overwriting old datas with the new ones.",
+                )
+                # the blob is overwritten rather than deleted, which would fail if it has snapshots of its versions.
+                stream.seek(start)
+                blob_client.upload_blob(
+                    source,
+                    overwrite=True,
+                    content_settings=content_settings,
+                    **request_kwargs,
+                )
+                log.info(f"New dataset uploaded at blob path : {blob_path}.")
+        return UploadResult(blob_path=blob_path, bytes_sent=size)
+
+    def _send_blocks(
+        self,
+        blob_client: BlobClient,
+        blob_path: str,
+        source: Union[bytes, IO[bytes]],
+        options: UploadOptions,
+        request_kwargs: Dict[str, Any],
+    ) -> UploadResult:
+        block_size = options.block_size or DEFAULT_BLOCK_SIZE
+        tracker = None
+        if options.progress_callback is not None:
+            total_bytes = None
+            if options.content_encoding is None and is_seekable(source):
+                stream = as_stream(source)
+                start = stream.tell()
+                total_bytes = stream.seek(0, SEEK_END) - start
+                stream.seek(start)
+            tracker = ProgressTracker(options.progress_callback, total_bytes)
+
+        md5 = hashlib.md5()  # noqa: S303
+        blocks = iter_hashed(iter_blocks(as_stream(source), block_size), md5)
+        metadata = None
+        if options.content_encoding is not None:
+            compressed_md5 = hashlib.md5()  # noqa: S303
+            blocks = iter_hashed(
+                iter_compressed(
+                    blocks,
+                    options.content_encoding,
+                    block_size,
+                    options.compression_level,
+                ),
+                compressed_md5,
             )
-            blob_client.delete_blob()
-            blob_client.upload_blob(dataset)
-            log.info(f"New dataset uploaded at blob path : {blob_path}.")
+
+        journal = None
+        staged_ids: Set[str] = set()
+        if options.journal_dir is not None:
+            journal = open_journal(options.journal_dir, blob_client.url, source, block_size)  # type: ignore
+            # only the blocks still kept by the storage account are not sent again.
+            staged_ids = journal.staged_ids & self._uncommitted_ids(blob_client)
+
+        def on_staged(block_id: str, size: int):
+            if journal is not None and block_id not in staged_ids:
+                journal.record(block_id)
+            if tracker is not None:
+                tracker.update(size)
+
+        block_list = stage_blocks(
+            blob_client,
+            blocks,
+            options.max_concurrency,
+            self.concurrency_limiter,
+            request_kwargs,
+            staged_ids,
+            on_staged,
+            self.bandwidth_limiter,
+        )
+
+        content_md5 = md5.digest()
+        if options.content_encoding is not None:
+            metadata = {SOURCE_MD5_KEY: content_md5.hex()}
+            content_md5 = compressed_md5.digest()
+        with limited(self.concurrency_limiter) as limiter_kwargs:
+            blob_client.commit_block_list(
+                block_list,
+                content_settings=ContentSettings(
+                    content_md5=bytearray(content_md5),
+                    content_encoding=options.content_encoding,
+                ),
+                metadata=metadata,
+                **request_kwargs,
+                **limiter_kwargs,
+            )
+        if journal is not None:
+            journal.remove()
+        log.info(
+            f"Dataset uploaded at blob path : {blob_path} in {len(block_list)} blocks.",
+        )
+        return UploadResult(
+            blob_path=blob_path,
+            bytes_sent=sum(
+                block.size for block in block_list if block.id not in staged_ids
+            ),
+            bytes_resumed=sum(
+                block.size for block in block_list if block.id in staged_ids
+            ),
+        )
+
+    def _uncommitted_ids(self, blob_client: BlobClient) -> Set[str]:
+        """Get the ids of the blocks staged but not yet committed of a blob.
+
+        Args:
+            blob_client (BlobClient): The client of the blob.
+
+        Returns:
+            Set[str]: The ids of the uncommitted blocks.
+        """
+        try:
+            _, uncommitted = blob_client.get_block_list("uncommitted")
+        except ResourceNotFoundError:
+            return set()
+        return {block.id for block in uncommitted}
+
+    def _get_properties(self, blob_client: BlobClient) -> Optional[BlobProperties]:
+        """Get the properties of a blob.
+
+        Args:
+            blob_client (BlobClient): The client of the blob.
+
+        Returns:
+            Optional[BlobProperties]: The properties of the blob, None if it does not exist.
+        """
+        try:
+            return blob_client.get_blob_properties()
+        except ResourceNotFoundError:
+            return None
+
+    def _list_properties(
+        self,
+        container_name: str,
+        prefix: str,
+    ) -> Dict[str, BlobProperties]:
+        """List the properties of all the blobs under a prefix, in as few requests as possible.
+
+        Args:
+            container_name (str): The name of the container.
+            prefix (str): The prefix of the blobs.
+
+        Returns:
+            Dict[str, BlobProperties]: The properties of each blob, by name.
+        """
+        container_client = self.blob_service_client.get_container_client(container_name)
+        try:
+            return {
+                properties.name: properties
+                for properties in container_client.list_blobs(
+                    name_starts_with=prefix or None,
+                    include=["metadata"],
+                )
+            }
+        except ResourceNotFoundError:
+            return {}
 
     def upload_df_to_blob(
         self,
         dataframe: pd.DataFrame,
         container_name: str,
         blob_path: str,
-    ):
-        """Upload a pandas dataframe as a `csv` file inside a blob.
+        file_format: Optional[str] = None,
+        compression: Optional[str] = None,
+        overwrite: bool = False,
+        skip_unchanged: bool = False,
+        content_encoding: Optional[str] = None,
+        chunksize: Optional[int] = None,
+        block_size: Optional[int] = None,
+        max_concurrency: int = 1,
+        write_schema: bool = False,
+        keep_version: bool = False,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
+    ) -> UploadResult:
+        """Upload a pandas dataframe as a `csv` (or `parquet`, or `arrow`) file inside a blob.
 
         Eg the following code.
 
@@ -181,41 +802,411 @@ class BlobStorageInterface:
 
         !!! attention "Attention"
 
-            As of now, there is no **data versioning**. Meaning that if the `blob_path` already exists, it will be
-            overwritten with new datas.
+            By default, there is no **data versioning**. Meaning that if the `blob_path` already exists, it will be
+            overwritten with new datas. With `keep_version=True`, each upload is kept as a new version of the blob,
+            see [`list_versions`][azure_helper.interfaces.blob_storage_interface.BlobStorageInterface.list_versions].
+
+
+        The format of the file is inferred from the extension of `blob_path` (`.parquet`, `.arrow`, `.feather`,
+        `csv` otherwise) unless given explicitly. The columnar formats are faster to write and read, smaller, keep the
+        dtypes of the dataframe, and can be compressed with the `compression` codec.
+
+        ```python
+        blob_storage_interface.upload_df_to_blob(
+            dataframe=x_train,
+            container_name="project-mlops-mk-5448820782",
+            blob_path="train/x_train.parquet",
+            compression="zstd",
+        )
+        ```
+
+        By default, the whole `csv` file is built in memory before being sent. For large dataframes, giving a
+        `chunksize` serializes the dataframe `chunksize` rows at a time instead, and each serialized chunk is cut in
+        blocks which are staged by `max_concurrency` workers while the next chunk is serialized. The extra memory used
+        is then bounded by the size of a chunk plus `max_concurrency` blocks, but the upload can not be skipped if
+        unchanged.
+
+        ```python
+        blob_storage_interface.upload_df_to_blob(
+            dataframe=huge_dataframe,
+            container_name="project-mlops-mk-5448820782",
+            blob_path="raw/huge.csv",
+            overwrite=True,
+            chunksize=500_000,
+            max_concurrency=4,
+        )
+        ```
 
+        A `csv` file does not keep the dtypes of the dataframe, which are inferred again, sometimes wrongly, when it
+        is read. Giving `write_schema=True` writes a small `<blob_path>.schema.json` sidecar next to the file, with the
+        dtypes, categories and datetime formats of the columns. Reading the file with
+        [`download_blob_to_df`][azure_helper.interfaces.blob_storage_interface.BlobStorageInterface.download_blob_to_df]
+        and `use_schema=True` then skips the inference and gives back the same dataframe, datetimes being kept to the
+        microsecond, and floats to their last digit with `exact_floats=True`.
 
         Args:
             dataframe (pd.DataFrame): The dataframe you want to upload.
             container_name (str): The name of the container on which you want to upload the dataframe.
             blob_path (str): The path to the csv
+            file_format (Optional[str], optional): One of `csv`, `parquet` or `arrow`. Defaults to None, ie inferred
+                from `blob_path`.
+            compression (Optional[str], optional): The compression codec of a `parquet` or `arrow` file.
+                Defaults to None, ie the default codec of the format.
+            overwrite (bool, optional): Whether to replace an existing blob in a single request. Defaults to False.
+            skip_unchanged (bool, optional): Whether to skip the upload if the blob already contains the same datas.
+                Defaults to False.
+            content_encoding (Optional[str], optional): The codec used to compress the file, `gzip` or `zstd`.
+                Useful for `csv` files. Defaults to None, ie no compression.
+            chunksize (Optional[int], optional): The number of rows serialized at a time, only for `csv` files.
+                Defaults to None, ie the whole dataframe at once.
+            block_size (Optional[int], optional): The size of the blocks of a chunked upload, in bytes.
+                Defaults to None, ie 8MiB for a chunked upload.
+            max_concurrency (int, optional): The number of blocks staged in parallel. Defaults to 1.
+            write_schema (bool, optional): Whether to write the schema sidecar of a `csv` file. Defaults to False.
+            keep_version (bool, optional): Whether to keep the file uploaded as a new version of the blob. Implies
+                `overwrite=True`. The schema sidecar is not versioned. Defaults to False.
+            progress_callback (Optional[Callable[[TransferProgress], None]], optional): Called with the bytes done,
+                throughput and estimated time left after each block uploaded. Defaults to None.
+
+        Raises:
+            ValueError: If a `chunksize` is given, or a schema asked, for another format than `csv`.
+
+        Returns:
+            UploadResult: The number of bytes sent, and skipped.
         """
         log.warning(
             "The function 'upload_df_to_blob' will be deprecated in favour of a more generic version 'upload_to_blob' in the near future.",
         )
-        self.create_container(container_name)
+        file_format = infer_format(blob_path, file_format)
+        self.ensure_container(container_name)
 
         blob_client = self.blob_service_client.get_blob_client(
             container=container_name,
             blob=blob_path,
         )
-
-        try:
-            blob_client.upload_blob(
-                dataframe.to_csv(index=False, header=True).encode(),
-            )
-            log.info(f"Dataset uploaded at blob path : {blob_path}.")
-        except ResourceExistsError:
-            log.warning(
-                f"Blob path {blob_path} already contains datas. Now deleting old datas tu upload the new ones.",
+        if write_schema:
+            if file_format != "csv":
+                raise ValueError("A schema can only be written for the 'csv' format.")
+            schema = make_schema(dataframe)
+            dataframe = format_datetimes(dataframe, schema)
+        source: Union[bytes, IO[bytes]]
+        if chunksize is None:
+            source = serialize_df(dataframe, file_format, compression)
+        elif file_format == "csv":
+            source = BufferedReader(ChunkReader(iter_csv_chunks(dataframe, chunksize)))
+        else:
+            raise ValueError("A chunksize can only be given for the 'csv' format.")
+        result = self._upload(
+            blob_client,
+            blob_path,
+            source,
+            UploadOptions(
+                block_size=block_size,
+                max_concurrency=max_concurrency,
+                overwrite=overwrite or keep_version,
+                skip_unchanged=skip_unchanged,
+                content_encoding=content_encoding,
+                progress_callback=progress_callback,
+            ),
+        )
+        if keep_version and not result.skipped:
+            self._add_version(blob_client, container_name, blob_path, result.bytes_sent)
+        if write_schema:
+            self._upload(
+                self.blob_service_client.get_blob_client(
+                    container=container_name,
+                    blob=schema_path(blob_path),
+                ),
+                schema_path(blob_path),
+                dumps_schema(schema),
+                UploadOptions(overwrite=True, skip_unchanged=skip_unchanged),
             )
-            blob_client.delete_blob()
-            blob_client.upload_blob(
-                dataframe.to_csv(index=False, header=True).encode(),
+        return result
+
+    def upload_many(
+        self,
+        datasets: Iterable[Tuple[Any, str]],
+        container_name: str,
+        max_workers: int = 8,
+        skip_unchanged: bool = True,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
+    ) -> List[UploadResult]:
+        """Upload many dataset files, each inside its own blob, with a pool of `max_workers` workers.
+
+        Existing blobs are overwritten in a single request, unless they already contain the same datas and
+        `skip_unchanged` is True.
+
+        ```python
+        results = blob_storage_interface.upload_many(
+            datasets=[
+                (Path("dumps/2022-09-01.csv"), "raw/2022-09-01.csv"),
+                (Path("dumps/2022-09-02.csv"), "raw/2022-09-02.csv"),
+            ],
+            container_name="project-mlops-mk-5448820782",
+        )
+        ```
+
+        Args:
+            datasets (Iterable[Tuple[Any, str]]): The datas to upload (see
+                [`upload_to_blob`][azure_helper.interfaces.blob_storage_interface.BlobStorageInterface.upload_to_blob]),
+                with the path of their blob.
+            container_name (str): The name of the container on which you want to upload the datas.
+            max_workers (int, optional): The number of files uploaded at the same time. Defaults to 8.
+            skip_unchanged (bool, optional): Whether to skip the blobs which already contain the same datas.
+                Defaults to True.
+            progress_callback (Optional[Callable[[TransferProgress], None]], optional): Called with the bytes done,
+                throughput and estimated time left after each file uploaded. Defaults to None.
+
+        Returns:
+            List[UploadResult]: The number of bytes sent, skipped, and the duration of the upload of each file, in
+                the order of `datasets`.
+        """
+        datasets = list(datasets)
+        self.ensure_container(container_name)
+        return self._upload_many(
+            datasets,
+            container_name,
+            max_workers,
+            skip_unchanged,
+            progress_callback=progress_callback,
+        )
+
+    def upload_directory(
+        self,
+        local_dir: Union[str, Path],
+        container_name: str,
+        prefix: str = "",
+        max_workers: int = 8,
+        skip_unchanged: bool = True,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
+    ) -> List[UploadResult]:
+        """Upload all the files of a local directory tree.
+
+        The path of each file relative to `local_dir` is kept as the path of its blob, under `prefix`. The blobs
+        already under `prefix` are listed once beforehand, so the unchanged files are skipped without any extra
+        request.
+
+        ```python
+        results = blob_storage_interface.upload_directory(
+            local_dir="dumps/partitions",
+            container_name="project-mlops-mk-5448820782",
+            prefix="raw/partitions",
+        )
+        ```
+
+        Args:
+            local_dir (Union[str, Path]): The directory to upload.
+            container_name (str): The name of the container on which you want to upload the files.
+            prefix (str, optional): The path under which the files are uploaded. Defaults to "".
+            max_workers (int, optional): The number of files uploaded at the same time. Defaults to 8.
+            skip_unchanged (bool, optional): Whether to skip the files which are already uploaded. Defaults to True.
+            progress_callback (Optional[Callable[[TransferProgress], None]], optional): Called with the bytes done,
+                throughput and estimated time left after each file uploaded. Defaults to None.
+
+        Returns:
+            List[UploadResult]: The number of bytes sent, skipped, and the duration of the upload of each file.
+        """
+        local_dir = Path(local_dir)
+        prefix = f"{prefix.strip('/')}/" if prefix.strip("/") else ""
+        datasets = [
+            (file_path, f"{prefix}{file_path.relative_to(local_dir).as_posix()}")
+            for file_path in sorted(local_dir.rglob("*"))
+            if file_path.is_file()
+        ]
+        self.ensure_container(container_name)
+        remote_blobs = (
+            self._list_properties(container_name, prefix) if skip_unchanged else None
+        )
+        return self._upload_many(
+            datasets,
+            container_name,
+            max_workers,
+            skip_unchanged,
+            remote_blobs,
+            progress_callback,
+        )
+
+    def _upload_many(
+        self,
+        datasets: List[Tuple[Any, str]],
+        container_name: str,
+        max_workers: int,
+        skip_unchanged: bool,
+        remote_blobs: Optional[Dict[str, BlobProperties]] = None,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
+    ) -> List[UploadResult]:
+        tracker = None
+        if progress_callback is not None:
+            sizes = [dataset_size(dataset) for dataset, _ in datasets]
+            tracker = ProgressTracker(progress_callback, None if None in sizes else sum(sizes))  # type: ignore
+
+        def upload_one(dataset: Any, blob_path: str) -> UploadResult:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=container_name,
+                blob=blob_path,
             )
-            log.info(f"New dataset uploaded at blob path : {blob_path}.")
+            with open_source(dataset) as source:
+                result = self._upload(
+                    blob_client,
+                    blob_path,
+                    source,
+                    UploadOptions(overwrite=True, skip_unchanged=skip_unchanged),
+                    remote_blobs,
+                )
+            if tracker is not None:
+                tracker.update(result.bytes_sent + result.bytes_skipped)
+            return result
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(upload_one, dataset, blob_path)
+                for dataset, blob_path in datasets
+            ]
+            results = [future.result() for future in futures]
+        self._log_uploads(results, container_name, time.perf_counter() - start_time)
+        return results
+
+    def _log_uploads(
+        self,
+        results: List[UploadResult],
+        container_name: str,
+        elapsed: float,
+    ):
+        bytes_sent = sum(result.bytes_sent for result in results)
+        log.info(
+            f"Uploaded {len(results)} files to {container_name} in {elapsed:.2f}s : "
+            + f"{bytes_sent} bytes sent ({bytes_sent / max(elapsed, 1e-9) / 1024**2:.1f} MiB/s), "
+            + f"{sum(result.bytes_skipped for result in results)} bytes skipped.",
+        )
+
+    def upload_dfs(
+        self,
+        dataframes: Iterable[Tuple[pd.DataFrame, str]],
+        container_name: str,
+        file_format: Optional[str] = None,
+        compression: Optional[str] = None,
+        max_serializers: Optional[int] = None,
+        max_uploads: int = 4,
+        queue_size: int = 4,
+        skip_unchanged: bool = True,
+    ) -> List[UploadResult]:
+        """Upload many dataframes, overlapping the serialization of the next ones with the upload of the previous ones.
+
+        The dataframes are serialized by a pool of `max_serializers` processes, so they use several cores, and
+        uploaded by a pool of `max_uploads` threads. Both pools are connected by a queue of at most `queue_size`
+        dataframes being serialized or waiting to be uploaded, so the memory used is bounded by
+        `queue_size + max_uploads` serialized dataframes. The total duration then gets close to the longest of the
+        serialization and the upload, instead of their sum.
+
+        ```python
+        results = blob_storage_interface.upload_dfs(
+            dataframes=[
+                (x_train, "train/X_train.parquet"),
+                (y_train, "train/y_train.parquet"),
+                (x_test, "test/X_test.parquet"),
+                (y_test, "test/y_test.parquet"),
+            ],
+            container_name="project-mlops-mk-5448820782",
+        )
+        ```
+
+        Existing blobs are overwritten in a single request, unless they already contain the same datas and
+        `skip_unchanged` is True.
+
+        !!! info "Information"
+
+            The dataframes are sent to the serialization processes by pickling them, which is much faster than
+            serializing them as `csv` but is not free for very wide dataframes. The processes are spawned, not
+            forked, so the script calling `upload_dfs` must be guarded by `if __name__ == "__main__":`.
+
+        Args:
+            dataframes (Iterable[Tuple[pd.DataFrame, str]]): The dataframes to upload, with the path of their blob.
+            container_name (str): The name of the container on which you want to upload the dataframes.
+            file_format (Optional[str], optional): One of `csv`, `parquet` or `arrow`. Defaults to None, ie inferred
+                from the path of each blob.
+            compression (Optional[str], optional): The compression codec of the `parquet` or `arrow` files.
+                Defaults to None, ie the default codec of the format.
+            max_serializers (Optional[int], optional): The number of serialization processes. Defaults to None, ie
+                the number of cores.
+            max_uploads (int, optional): The number of files uploaded at the same time. Defaults to 4.
+            queue_size (int, optional): The maximum number of dataframes serialized ahead of the uploads.
+                Defaults to 4.
+            skip_unchanged (bool, optional): Whether to skip the blobs which already contain the same datas.
+                Defaults to True.
+
+        Returns:
+            List[UploadResult]: The number of bytes sent, skipped, and the duration of the upload of each dataframe,
+                in the order of `dataframes`.
+        """
+        self.ensure_container(container_name)
+        results: Dict[int, UploadResult] = {}
+        errors: List[BaseException] = []
+        # the index, blob path and serialization of each dataframe, then None for each uploader.
+        serialized: "queue.Queue[Optional[Tuple[int, str, Future[bytes]]]]"
+        serialized = queue.Queue(maxsize=queue_size)
+
+        def upload_serialized():
+            while True:
+                item = serialized.get()
+                if item is None:
+                    return
+                index, blob_path, future = item
+                try:
+                    blob_client = self.blob_service_client.get_blob_client(
+                        container=container_name,
+                        blob=blob_path,
+                    )
+                    results[index] = self._upload(
+                        blob_client,
+                        blob_path,
+                        future.result(),
+                        UploadOptions(overwrite=True, skip_unchanged=skip_unchanged),
+                    )
+                except BaseException as err:  # noqa: B902
+                    # The queue is still drained, so the producer never blocks on a failed pipeline.
+                    errors.append(err)
+
+        start_time = time.perf_counter()
+        # forking a process while the upload threads run could copy locks they hold, so the workers are spawned.
+        with ProcessPoolExecutor(
+            max_workers=max_serializers,
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as serializers:
+            with ThreadPoolExecutor(max_workers=max_uploads) as uploaders:
+                workers = [
+                    uploaders.submit(upload_serialized) for _ in range(max_uploads)
+                ]
+                for index, (dataframe, blob_path) in enumerate(dataframes):
+                    if errors:
+                        break
+                    future = serializers.submit(
+                        serialize_df,
+                        dataframe,
+                        infer_format(blob_path, file_format),
+                        compression,
+                    )
+                    serialized.put((index, blob_path, future))
+                for _ in workers:
+                    serialized.put(None)
+        if errors:
+            raise errors[0]
+
+        ordered_results = [results[index] for index in sorted(results)]
+        self._log_uploads(
+            ordered_results,
+            container_name,
+            time.perf_counter() - start_time,
+        )
+        return ordered_results
 
-    def download_from_blob(self, container_name: str, blob_path: str) -> StringIO:
+    def download_from_blob(
+        self,
+        container_name: str,
+        blob_path: str,
+        version: Optional[int] = None,
+        as_of: Optional[datetime] = None,
+    ) -> StringIO:
         """Download a file a the given `blob_path` location and renders it as a StringIO buffer.
 
         ```bash
@@ -244,67 +1235,1614 @@ class BlobStorageInterface:
         dataframe = pd.read_csv(df_buffer)
         ```
 
+        A blob uploaded with `keep_version=True` can be read as it was at a given `version`, or `as_of` a given date.
+
         Args:
             container_name (str): The name of the container.
             blob_path (str): The path to the `csv` file.
+            version (Optional[int], optional): The version to read. Defaults to None, ie the current datas.
+            as_of (Optional[datetime], optional): Read the last version uploaded before this date. Defaults to None.
 
         Returns:
             StringIO: the file as a StringIO buffer.
         """
 
-        blob_client = self.blob_service_client.get_blob_client(
-            container=container_name,
-            blob=blob_path,
+        blob_client, cache_path = self._versioned_client(
+            container_name,
+            blob_path,
+            version,
+            as_of,
         )
-        stream = blob_client.download_blob()
-        buffer = StringIO(stream.content_as_text())
+        with measured(self.metrics, "download", container_name) as measurement:
+            cached_file = self._open_cached(blob_client, container_name, cache_path)
+            if cached_file is not None:
+                with cached_file:
+                    content = cached_file.read()
+                measurement.size = len(content)
+                buffer = StringIO(content.decode())
+            else:
+                buffer = StringIO(self._download_text(blob_client, measurement))
         log.info(f"Download from {container_name} ended successfully.")
         return buffer
 
-    def download_blob_to_df(self, container_name: str, blob_path: str) -> pd.DataFrame:
-        """Download a `csv` file a the given `blob_path` location and renders it as a pandas datatrame.
-
-        ```bash
-        Storage_Account : workspaceperso5448820782
-            │
-            ├── Container : project-mlops-mk-5448820782
-            │   ├── blob : train
-            │   │           ├── x_train.csv
-            │   │           └── y_train.csv
-            │   └── blob : test
-        ```
+    def _download_text(
+        self,
+        blob_client: BlobClient,
+        measurement: Optional[Measurement] = None,
+    ) -> str:
+        """Download a blob as text, decompressing it if needed.
 
-        ```python
-        from azure_helper.utils.blob_storage_interface import BlobStorageInterface
+        Args:
+            blob_client (BlobClient): The client of the blob.
+            measurement (Optional[Measurement], optional): The measure of the download, if any. Defaults to None.
 
-        blob_storage_interface = BlobStorageInterface(
-            storage_acct_name="workspaceperso5448820782",
-            storage_acct_key="XXXXX-XXXX-XXXXX-XXXX",
+        Returns:
+            str: The content of the blob.
+        """
+        request_kwargs = {} if measurement is None else measurement.request_kwargs
+        with limited(self.concurrency_limiter) as limiter_kwargs:
+            # the transport would otherwise decode gzip by itself, but not zstd.
+            stream = blob_client.download_blob(
+                decompress=False,
+                **request_kwargs,
+                **limiter_kwargs,
             )
+            if measurement is not None:
+                measurement.size = stream.size
+            return self._read_content(stream).decode()
 
-        df = blob_storage_interface.download_blob_to_df(
-            container_name="project-mlops-mk-5448820782",
-            blob_path="train/x_train.csv",
+    def _read_content(self, stream: "StorageStreamDownloader[bytes]") -> bytes:
+        """Read a blob being downloaded, decompressing it if needed.
+
+        Args:
+            stream (StorageStreamDownloader[bytes]): The download of the blob, started with `decompress=False`.
+
+        Returns:
+            bytes: The content of the blob.
+        """
+        content_encoding = stream.properties.content_settings.content_encoding
+        if (
+            content_encoding in SUPPORTED_ENCODINGS
+            or self.bandwidth_limiter is not None
+        ):
+            chunks = throttled(stream.chunks(), self.bandwidth_limiter)
+            return b"".join(iter_decompressed(chunks, content_encoding))
+        return stream.readall()
+
+    def _iter_chunks(self, blob_client: BlobClient, **kwargs) -> Iterator[bytes]:
+        """Download a blob chunk by chunk, decompressing it if needed.
+
+        Args:
+            blob_client (BlobClient): The client of the blob.
+            kwargs: Extra keyword arguments of `BlobClient.download_blob`.
+
+        Returns:
+            Iterator[bytes]: The successive chunks of the blob.
+        """
+        with limited(self.concurrency_limiter) as limiter_kwargs:
+            stream = blob_client.download_blob(
+                decompress=False,
+                **kwargs,
+                **limiter_kwargs,
+            )
+        chunks = iter_limited(stream.chunks(), self.concurrency_limiter)
+        return iter_decompressed(
+            throttled(chunks, self.bandwidth_limiter),
+            stream.properties.content_settings.content_encoding,
         )
-        ```
+
+    def _versioned_client(
+        self,
+        container_name: str,
+        blob_path: str,
+        version: Optional[int],
+        as_of: Optional[datetime],
+    ) -> Tuple[BlobClient, str]:
+        """Get the client of a version of a blob, found in its version index.
 
         Args:
             container_name (str): The name of the container.
-            blob_path (str): The path to the `csv` file.
+            blob_path (str): The path of the blob.
+            version (Optional[int]): The number of the version, None for the current datas if `as_of` is None too.
+            as_of (Optional[datetime]): Get the last version uploaded before this date.
 
         Returns:
-            pd.DataFrame: the `csv` file as a dataframe.
+            Tuple[BlobClient, str]: The client of the snapshot of the version, and the path under which it is cached.
         """
-        log.warning(
-            "The function 'download_blob_to_df' will be deprecated in favour of a more generic version 'download_from_blob' in the near future.",
+        if version is None and as_of is None:
+            return (
+                self.blob_service_client.get_blob_client(
+                    container=container_name,
+                    blob=blob_path,
+                ),
+                blob_path,
+            )
+        blob_version = self.list_versions(container_name, blob_path).find(
+            version,
+            as_of,
         )
-
         blob_client = self.blob_service_client.get_blob_client(
             container=container_name,
             blob=blob_path,
+            snapshot=blob_version.snapshot,
+        )
+        # a snapshot never changes, its cached copy stays valid.
+        return blob_client, f"{blob_path}?snapshot={blob_version.snapshot}"
+
+    def _open_cached(
+        self,
+        blob_client: BlobClient,
+        container_name: str,
+        blob_path: str,
+    ) -> Optional[IO[bytes]]:
+        """Open the blob from the download cache, if it is enabled.
+
+        Args:
+            blob_client (BlobClient): The client of the blob.
+            container_name (str): The name of the container.
+            blob_path (str): The path to the file.
+
+        Returns:
+            Optional[IO[bytes]]: The cached blob, None if there is no download cache.
+        """
+        if self.cache is None:
+            return None
+        etag = blob_client.get_blob_properties().etag
+
+        def download(file_obj: IO[bytes]):
+            for chunk in self._iter_chunks(
+                blob_client,
+                etag=etag,
+                match_condition=MatchConditions.IfNotModified,
+            ):
+                file_obj.write(chunk)
+
+        return self.cache.open(
+            f"{self.storage_acct_name}/{container_name}/{blob_path}",
+            etag,
+            download,
+        )
+
+    def stream_from_blob(self, container_name: str, blob_path: str) -> BufferedReader:
+        """Open a file a the given `blob_path` location as a lazy, binary, file-like object.
+
+        Contrary to [`download_from_blob`][azure_helper.interfaces.blob_storage_interface.BlobStorageInterface.download_from_blob],
+        the file is not downloaded all at once : it is fetched chunk by chunk while it is read, so the memory used stays
+        bounded by the size of a chunk (4MiB, 32MiB for the first one) whatever the size of the blob.
+
+        ```python
+        from azure_helper.utils.blob_storage_interface import BlobStorageInterface
+
+        blob_storage_interface = BlobStorageInterface(
+            storage_acct_name="workspaceperso5448820782",
+            storage_acct_key="XXXXX-XXXX-XXXXX-XXXX",
+            )
+
+        with blob_storage_interface.stream_from_blob(
+            container_name="project-mlops-mk-5448820782",
+            blob_path="train/x_train.csv",
+        ) as reader:
+            dataframe = pd.read_csv(reader)
+        ```
+
+        Args:
+            container_name (str): The name of the container.
+            blob_path (str): The path to the file.
+
+        Returns:
+            BufferedReader: the file as a binary stream.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=container_name,
+            blob=blob_path,
+        )
+        log.info(f"Streaming {blob_path} from {container_name}.")
+        chunks = iter_measured(
+            self.metrics,
+            "download",
+            container_name,
+            lambda request_kwargs: self._iter_chunks(blob_client, **request_kwargs),
+        )
+        return BufferedReader(ChunkReader(chunks))
+
+    def download_prefix(
+        self,
+        container_name: str,
+        prefix: str,
+        local_dir: Union[str, Path],
+        max_workers: int = 8,
+        retries: int = 3,
+        progress_callback: Optional[Callable[[TransferProgress], None]] = None,
+    ) -> List[DownloadResult]:
+        """Download all the blobs under a prefix into a local directory, with a pool of `max_workers` workers.
+
+        The path of each blob relative to `prefix` is kept as the path of its local file under `local_dir`. Blobs are
+        streamed straight to disk, in a temporary `.part` file renamed once complete, and the modification time of
+        the local file is set to the one of the blob. Files which have the same size and modification time as their
+        blob are skipped, so an interrupted sync can simply be resumed by calling this method again. Blobs are copied
+        as they are stored, compressed blobs are not decompressed.
+
+        ```python
+        results = blob_storage_interface.download_prefix(
+            container_name="project-mlops-mk-5448820782",
+            prefix="train/",
+            local_dir="data/train",
+        )
+        ```
+
+        Args:
+            container_name (str): The name of the container.
+            prefix (str): The folder of the blobs to download, with or without its trailing slash.
+            local_dir (Union[str, Path]): The directory in which the blobs are downloaded.
+            max_workers (int, optional): The number of blobs downloaded at the same time. Defaults to 8.
+            retries (int, optional): The number of times a failed download is retried. Defaults to 3.
+            progress_callback (Optional[Callable[[TransferProgress], None]], optional): Called with the bytes done,
+                throughput and estimated time left after each blob downloaded, or skipped. Defaults to None.
+
+        Returns:
+            List[DownloadResult]: The number of bytes received and the duration of the download of each blob, or
+                the error met if it failed after all its retries.
+        """
+        local_dir = Path(local_dir).resolve()
+        # "raw" and "raw/" both mean the folder raw/, and do not match raw2/.
+        prefix = f"{prefix.strip('/')}/" if prefix.strip("/") else ""
+        remote_blobs = self._list_properties(container_name, prefix)
+        tracker = None
+        if progress_callback is not None:
+            tracker = ProgressTracker(
+                progress_callback,
+                sum(properties.size for properties in remote_blobs.values()),
+            )
+
+        def download_one(properties: BlobProperties) -> DownloadResult:
+            local_path = local_dir / properties.name[len(prefix) :]
+            result = DownloadResult(
+                blob_path=properties.name,
+                local_path=str(local_path),
+            )
+            if local_dir not in local_path.resolve().parents:
+                result.error = (
+                    f"{properties.name} would be written outside of {local_dir}."
+                )
+                return result
+            if is_downloaded(local_path, properties):
+                result.skipped = True
+                return result
+
+            start_time = time.perf_counter()
+            for attempt in range(retries + 1):
+                try:
+                    result.bytes_received = self._download_to_file(
+                        container_name,
+                        properties,
+                        local_path,
+                    )
+                    result.error = None
+                    break
+                except AzureError as err:
+                    result.error = str(err)
+                    log.warning(
+                        f"Download of {properties.name} failed (attempt {attempt + 1}/{retries + 1}) : {err}",
+                    )
+                    if attempt < retries:
+                        time.sleep(RETRY_BACKOFF * 2**attempt)
+            result.elapsed = time.perf_counter() - start_time
+            return result
+
+        def download_tracked(properties: BlobProperties) -> DownloadResult:
+            result = download_one(properties)
+            if tracker is not None:
+                # a failed download is left out of the bytes done.
+                tracker.update(properties.size if result.error is None else 0)
+            return result
+
+        start_time = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(download_tracked, remote_blobs.values()))
+        elapsed = time.perf_counter() - start_time
+
+        bytes_received = sum(result.bytes_received for result in results)
+        failed = [result.blob_path for result in results if result.error is not None]
+        log.info(
+            f"Downloaded {len(results)} blobs from {container_name}/{prefix} in {elapsed:.2f}s : "
+            + f"{bytes_received} bytes received ({bytes_received / max(elapsed, 1e-9) / 1024**2:.1f} MiB/s), "
+            + f"{sum(result.skipped for result in results)} files already up to date.",
+        )
+        if failed:
+            log.error(f"Download of {len(failed)} blobs failed : {failed}.")
+        return results
+
+    def _download_to_file(
+        self,
+        container_name: str,
+        properties: BlobProperties,
+        local_path: Path,
+    ) -> int:
+        """Stream a blob to a local file, through a temporary `.part` file.
+
+        Args:
+            container_name (str): The name of the container.
+            properties (BlobProperties): The properties of the blob.
+            local_path (Path): The path of the local file.
+
+        Returns:
+            int: The number of bytes downloaded.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=container_name,
+            blob=properties.name,
+        )
+        local_path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = local_path.with_name(f"{local_path.name}.part")
+        with measured(self.metrics, "download", container_name) as measurement:
+            with open(part_path, "wb") as file_obj:
+                with limited(self.concurrency_limiter) as limiter_kwargs:
+                    stream = blob_client.download_blob(
+                        decompress=False,
+                        **measurement.request_kwargs,
+                        **limiter_kwargs,
+                    )
+                    if self.bandwidth_limiter is None:
+                        size = stream.readinto(file_obj)
+                    else:
+                        size = sum(
+                            file_obj.write(chunk)
+                            for chunk in throttled(
+                                stream.chunks(),
+                                self.bandwidth_limiter,
+                            )
+                        )
+            measurement.size = size
+        last_modified = properties.last_modified.timestamp()
+        os.utime(part_path, (last_modified, last_modified))
+        os.replace(part_path, local_path)
+        return size
+
+    def copy_blob(
+        self,
+        source_container: str,
+        source_path: str,
+        dest_container: str,
+        dest_path: str,
+        timeout: Optional[float] = None,
+    ) -> CopyResult:
+        """Copy a blob with a server-side copy, without the datas going through this machine.
+
+        See [`copy_prefix`][azure_helper.interfaces.blob_storage_interface.BlobStorageInterface.copy_prefix].
+
+        Args:
+            source_container (str): The name of the container of the source blob.
+            source_path (str): The path of the source blob.
+            dest_container (str): The name of the container of the copy.
+            dest_path (str): The path of the copy.
+            timeout (Optional[float], optional): The time after which a copy still pending is aborted, in seconds.
+                Defaults to None, ie no timeout.
+
+        Returns:
+            CopyResult: The status of the copy.
+        """
+        (result,) = self._copy_many(
+            [CopyResult(source_path=source_path, blob_path=dest_path)],
+            source_container,
+            dest_container,
+            max_workers=1,
+            poll_interval=COPY_POLL_INTERVAL,
+            timeout=timeout,
+            delete_source=False,
+        )
+        return result
+
+    def copy_prefix(
+        self,
+        source_container: str,
+        prefix: str,
+        dest_container: str,
+        dest_prefix: str,
+        max_workers: int = 8,
+        poll_interval: float = COPY_POLL_INTERVAL,
+        timeout: Optional[float] = None,
+    ) -> List[CopyResult]:
+        """Copy all the blobs under a prefix to another prefix, or another container, with server-side copies.
+
+        The copies are submitted by a pool of `max_workers` workers, then their status is polled every
+        `poll_interval` seconds until they are all complete. The datas never go through this machine : within a
+        storage account, the copies are usually complete as soon as submitted, whatever the size of the blobs.
+
+        ```python
+        results = blob_storage_interface.copy_prefix(
+            source_container="project-mlops-mk-5448820782",
+            prefix="raw/",
+            dest_container="project-mlops-mk-5448820782",
+            dest_prefix="train/",
+        )
+        ```
+
+        !!! attention "Attention"
+
+            The source blobs must be in the storage account of the interface, which authorizes the copies. The copies
+            already submitted are not rolled back if another one fails, check the `error` of each result.
+
+        Args:
+            source_container (str): The name of the container of the source blobs.
+            prefix (str): The prefix of the blobs to copy.
+            dest_container (str): The name of the container of the copies.
+            dest_prefix (str): The prefix replacing `prefix` in the path of the copies.
+            max_workers (int, optional): The number of copies submitted, or polled, at the same time. Defaults to 8.
+            poll_interval (float, optional): The time between two polls of the pending copies, in seconds.
+                Defaults to 1.
+            timeout (Optional[float], optional): The time after which the copies still pending are aborted, in
+                seconds. Defaults to None, ie no timeout.
+
+        Returns:
+            List[CopyResult]: The status of the copy of each blob.
+        """
+        return self._copy_many(
+            self._prefix_copies(source_container, prefix, dest_prefix),
+            source_container,
+            dest_container,
+            max_workers,
+            poll_interval,
+            timeout,
+            delete_source=False,
+        )
+
+    def move_prefix(
+        self,
+        source_container: str,
+        prefix: str,
+        dest_container: str,
+        dest_prefix: str,
+        max_workers: int = 8,
+        poll_interval: float = COPY_POLL_INTERVAL,
+        timeout: Optional[float] = None,
+        delete_versions: bool = False,
+    ) -> List[CopyResult]:
+        """Move all the blobs under a prefix to another prefix, or another container, with server-side copies.
+
+        Same as [`copy_prefix`][azure_helper.interfaces.blob_storage_interface.BlobStorageInterface.copy_prefix],
+        except that each source blob is deleted once its copy succeeded. The blobs whose copy failed are kept.
+
+        !!! attention "Attention"
+
+            A copy does not carry the snapshots of the versions of a blob uploaded with `keep_version=True`. Such a
+            blob can not be deleted with its versions unless `delete_versions=True`, and is kept, with an `error`.
+
+        Args:
+            source_container (str): The name of the container of the source blobs.
+            prefix (str): The prefix of the blobs to move.
+            dest_container (str): The name of the container of the moved blobs.
+            dest_prefix (str): The prefix replacing `prefix` in the path of the moved blobs.
+            max_workers (int, optional): The number of copies submitted, or polled, at the same time. Defaults to 8.
+            poll_interval (float, optional): The time between two polls of the pending copies, in seconds.
+                Defaults to 1.
+            timeout (Optional[float], optional): The time after which the copies still pending are aborted, in
+                seconds. Defaults to None, ie no timeout.
+            delete_versions (bool, optional): Whether to delete the versions of the source blobs with them, for good.
+                Defaults to False.
+
+        Returns:
+            List[CopyResult]: The status of the move of each blob.
+        """
+        return self._copy_many(
+            self._prefix_copies(source_container, prefix, dest_prefix),
+            source_container,
+            dest_container,
+            max_workers,
+            poll_interval,
+            timeout,
+            delete_source=True,
+            delete_versions=delete_versions,
+        )
+
+    def _prefix_copies(
+        self,
+        source_container: str,
+        prefix: str,
+        dest_prefix: str,
+    ) -> List[CopyResult]:
+        # "raw" and "raw/" both mean the folder raw/, and do not match raw_old/.
+        prefix = f"{prefix.strip('/')}/" if prefix.strip("/") else ""
+        dest_prefix = f"{dest_prefix.strip('/')}/" if dest_prefix.strip("/") else ""
+        return [
+            CopyResult(
+                source_path=name,
+                blob_path=dest_prefix + name[len(prefix) :],
+                size=properties.size,
+            )
+            for name, properties in self._list_properties(
+                source_container,
+                prefix,
+            ).items()
+        ]
+
+    def _copy_many(
+        self,
+        copies: List[CopyResult],
+        source_container: str,
+        dest_container: str,
+        max_workers: int,
+        poll_interval: float,
+        timeout: Optional[float],
+        delete_source: bool,
+        delete_versions: bool = False,
+    ) -> List[CopyResult]:
+        self.ensure_container(dest_container)
+        start_time = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(
+                executor.map(
+                    lambda result: self._submit_copy(
+                        result,
+                        source_container,
+                        dest_container,
+                    ),
+                    copies,
+                ),
+            )
+            self._wait_copies(
+                executor,
+                copies,
+                dest_container,
+                poll_interval,
+                timeout,
+                start_time,
+            )
+            elapsed = time.perf_counter() - start_time
+            for result in copies:
+                result.elapsed = elapsed
+            if delete_source:
+                list(
+                    executor.map(
+                        lambda result: self._delete_copy_source(
+                            result,
+                            source_container,
+                            delete_versions,
+                        ),
+                        [result for result in copies if result.status == "success"],
+                    ),
+                )
+
+        failed = [result.source_path for result in copies if result.status != "success"]
+        log.info(
+            f"Copied {len(copies) - len(failed)} blobs from {source_container} to {dest_container} in "
+            + f"{elapsed:.2f}s, {sum(result.size for result in copies if result.status == 'success')} bytes copied server-side.",
+        )
+        if failed:
+            log.error(f"Copy of {len(failed)} blobs failed : {failed}.")
+        return copies
+
+    def _wait_copies(
+        self,
+        executor: ThreadPoolExecutor,
+        copies: List[CopyResult],
+        dest_container: str,
+        poll_interval: float,
+        timeout: Optional[float],
+        start_time: float,
+    ):
+        pending = [result for result in copies if result.status == "pending"]
+        while pending:
+            if timeout is not None and time.perf_counter() - start_time > timeout:
+                for result in pending:
+                    result.error = f"Copy still pending after {timeout}s."
+                list(
+                    executor.map(
+                        lambda result: self._abort_copy(result, dest_container),
+                        pending,
+                    ),
+                )
+                return
+            time.sleep(poll_interval)
+            list(
+                executor.map(
+                    lambda result: self._poll_copy(result, dest_container),
+                    pending,
+                ),
+            )
+            pending = [result for result in copies if result.status == "pending"]
+
+    def _submit_copy(
+        self,
+        result: CopyResult,
+        source_container: str,
+        dest_container: str,
+    ):
+        source_client = self.blob_service_client.get_blob_client(
+            container=source_container,
+            blob=result.source_path,
+        )
+        try:
+            with measured(self.metrics, "copy", dest_container) as measurement:
+                with limited(self.concurrency_limiter) as limiter_kwargs:
+                    copy = self.blob_service_client.get_blob_client(
+                        container=dest_container,
+                        blob=result.blob_path,
+                    ).start_copy_from_url(
+                        source_client.url,
+                        **measurement.request_kwargs,
+                        **limiter_kwargs,
+                    )
+            result.copy_id = str(copy["copy_id"])
+            result.status = str(copy["copy_status"])
+        except AzureError as err:
+            result.status = "failed"
+            result.error = str(err)
+
+    def _poll_copy(self, result: CopyResult, dest_container: str):
+        try:
+            copy = (
+                self.blob_service_client.get_blob_client(
+                    container=dest_container,
+                    blob=result.blob_path,
+                )
+                .get_blob_properties()
+                .copy
+            )
+            result.status = str(copy.status)
+            if copy.status in ("failed", "aborted"):
+                result.error = copy.status_description
+        except AzureError as err:
+            log.warning(f"Could not poll the copy of {result.source_path} : {err}")
+
+    def _abort_copy(self, result: CopyResult, dest_container: str):
+        try:
+            self.blob_service_client.get_blob_client(
+                container=dest_container,
+                blob=result.blob_path,
+            ).abort_copy(str(result.copy_id))
+            result.status = "aborted"
+        except AzureError as err:
+            result.error = str(err)
+
+    def _delete_copy_source(
+        self,
+        result: CopyResult,
+        source_container: str,
+        delete_versions: bool,
+    ):
+        try:
+            # a blob with snapshots can only be deleted along with them.
+            self.blob_service_client.get_blob_client(
+                container=source_container,
+                blob=result.source_path,
+            ).delete_blob(delete_snapshots="include" if delete_versions else None)
+        except AzureError as err:
+            result.error = f"Copied, but the source could not be deleted : {err}"
+
+    def iter_df_chunks(
+        self,
+        container_name: str,
+        blob_path: str,
+        chunksize: int,
+        usecols: Optional[List[str]] = None,
+        dtype: Optional[Dict[str, Any]] = None,
+        prefetch: int = 2,
+    ) -> Iterator[pd.DataFrame]:
+        """Read a `csv` file a the given `blob_path` location as successive dataframes of `chunksize` rows.
+
+        The blob is streamed and never held in memory as a whole, so files larger than the memory of the node can be
+        processed. The next chunks of the blob are downloaded by a background thread while the current ones are parsed,
+        at most `prefetch` chunks (4MiB each) ahead.
+
+        ```python
+        for dataframe in blob_storage_interface.iter_df_chunks(
+            container_name="project-mlops-mk-5448820782",
+            blob_path="raw/huge.csv",
+            chunksize=1_000_000,
+            usecols=["A", "B"],
+        ):
+            process(dataframe)
+        ```
+
+        Args:
+            container_name (str): The name of the container.
+            blob_path (str): The path to the `csv` file.
+            chunksize (int): The number of rows of each dataframe.
+            usecols (Optional[List[str]], optional): The columns to read. Defaults to None, ie all the columns.
+            dtype (Optional[Dict[str, Any]], optional): The dtypes of the columns. Defaults to None, ie inferred.
+            prefetch (int, optional): The number of chunks of the blob downloaded ahead. Defaults to 2.
+
+        Yields:
+            Iterator[pd.DataFrame]: The next `chunksize` rows of the file.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=container_name,
+            blob=blob_path,
+        )
+        chunks = iter_measured(
+            self.metrics,
+            "download",
+            container_name,
+            lambda request_kwargs: self._iter_chunks(blob_client, **request_kwargs),
+        )
+        reader = BufferedReader(ChunkReader(iter_prefetched(chunks, prefetch)))
+        with pd.read_csv(
+            reader,
+            chunksize=chunksize,
+            usecols=usecols,
+            dtype=dtype,
+        ) as csv_reader:
+            yield from csv_reader
+        log.info(f"Download from {container_name} ended successfully.")
+
+    def read_range(
+        self,
+        container_name: str,
+        blob_path: str,
+        start: int,
+        end: int,
+    ) -> bytes:
+        """Read the bytes `[start, end)` of a blob, with a single ranged request.
+
+        Ranges are read as stored, they are not decompressed for blobs uploaded with a `content_encoding`.
+
+        Args:
+            container_name (str): The name of the container.
+            blob_path (str): The path to the file.
+            start (int): The offset of the first byte to read.
+            end (int): The offset after the last byte to read.
+
+        Returns:
+            bytes: The bytes read, fewer than `end - start` if the blob ends before `end`.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=container_name,
+            blob=blob_path,
+        )
+        with measured(self.metrics, "read_range", container_name) as measurement:
+            with limited(self.concurrency_limiter) as limiter_kwargs:
+                datas = blob_client.download_blob(
+                    offset=start,
+                    length=end - start,
+                    decompress=False,
+                    **measurement.request_kwargs,
+                    **limiter_kwargs,
+                ).readall()
+            measurement.size = len(datas)
+        if self.bandwidth_limiter is not None:
+            self.bandwidth_limiter.consume(len(datas))
+        return datas
+
+    def head_df(
+        self,
+        container_name: str,
+        blob_path: str,
+        nrows: int = 10,
+    ) -> pd.DataFrame:
+        """Read the first `nrows` rows of a `csv` file, eg to preview it or infer its schema.
+
+        Only the first bytes of the blob are downloaded, with ranged requests of 64KiB, whatever its size. A blob
+        uploaded with a `content_encoding` is downloaded and decompressed chunk by chunk instead, until `nrows` rows
+        are read.
+
+        ```python
+        preview = blob_storage_interface.head_df(
+            container_name="project-mlops-mk-5448820782",
+            blob_path="raw/huge.csv",
+            nrows=100,
+        )
+        ```
+
+        Args:
+            container_name (str): The name of the container.
+            blob_path (str): The path to the `csv` file.
+            nrows (int, optional): The number of rows to read. Defaults to 10.
+
+        Returns:
+            pd.DataFrame: The first rows of the file.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=container_name,
+            blob=blob_path,
+        )
+        properties = blob_client.get_blob_properties()
+        # compressed datas can not be read from an arbitrary offset.
+        if properties.content_settings.content_encoding in SUPPORTED_ENCODINGS:
+            raw: RawIOBase = ChunkReader(self._iter_chunks(blob_client))
+        else:
+            raw = BlobRangeReader(
+                blob_client,
+                size=properties.size,
+                limiter=self.concurrency_limiter,
+                bandwidth_limiter=self.bandwidth_limiter,
+            )
+        reader = BufferedReader(raw, buffer_size=HEAD_READ_SIZE)
+        return pd.read_csv(reader, nrows=nrows)
+
+    def sample_df(
+        self,
+        container_name: str,
+        blob_path: str,
+        n_samples: int,
+        max_workers: int = 8,
+        random_state: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """Take an approximate random sample of the rows of a `csv` file, without downloading it.
+
+        `n_samples` offsets are drawn uniformly in the blob, and a small range is read at each of them, by
+        `max_workers` concurrent requests. The first full row following each offset is kept. Offsets falling in the
+        same row give a single sample, so slightly fewer than `n_samples` rows may be returned.
+
+        !!! attention "Attention"
+
+            This is not a uniform sample of the rows: a row is drawn with a probability proportional to the length of
+            the row before it, so rows following long rows are over-represented. This is close to a uniform sample
+            only when rows have similar lengths, which is usually the case for numerical datas. For an exact sample,
+            read the file with `iter_df_chunks` and sample each chunk with `DataFrame.sample`.
+
+            The rows of a blob uploaded with a `content_encoding` can not be reached by offset, so it can not be
+            sampled this way.
+
+        ```python
+        sample = blob_storage_interface.sample_df(
+            container_name="project-mlops-mk-5448820782",
+            blob_path="raw/huge.csv",
+            n_samples=1000,
+        )
+        ```
+
+        Args:
+            container_name (str): The name of the container.
+            blob_path (str): The path to the `csv` file.
+            n_samples (int): The number of rows to draw.
+            max_workers (int, optional): The number of ranges read at the same time. Defaults to 8.
+            random_state (Optional[int], optional): The seed of the random offsets. Defaults to None.
+
+        Raises:
+            ValueError: If the blob was uploaded with a `content_encoding`.
+
+        Returns:
+            pd.DataFrame: The sampled rows, in the order of the file.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=container_name,
+            blob=blob_path,
+        )
+        properties = blob_client.get_blob_properties()
+        content_encoding = properties.content_settings.content_encoding
+        if content_encoding in SUPPORTED_ENCODINGS:
+            raise ValueError(
+                f"Blob path {blob_path} is compressed with {content_encoding}, its rows can not be sampled.",
+            )
+        size = properties.size
+        head = self._read_lines(container_name, blob_path, 0, 1)
+        if not head:
+            return pd.DataFrame()
+        header = head[: head.find(b"\n") + 1] or head + b"\n"
+        if size <= len(header):
+            return pd.read_csv(BytesIO(header))
+
+        rng = random.Random(random_state)
+        offsets = sorted(rng.randrange(len(header) - 1, size) for _ in range(n_samples))
+
+        def first_row(offset: int) -> Optional[Tuple[int, bytes]]:
+            window = self._read_lines(container_name, blob_path, offset, 2)
+            row_start = window.find(b"\n") + 1
+            if row_start == 0 or row_start == len(window):
+                return None
+            row_end = window.find(b"\n", row_start)
+            # the last row may not end with a line break.
+            row = (
+                window[row_start:] + b"\n"
+                if row_end == -1
+                else window[row_start : row_end + 1]
+            )
+            return offset + row_start, row
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            rows = dict(
+                row for row in executor.map(first_row, offsets) if row is not None
+            )
+        log.info(f"Sampled {len(rows)} rows from {blob_path}.")
+        return pd.read_csv(
+            BytesIO(header + b"".join(rows[key] for key in sorted(rows))),
+        )
+
+    def _read_lines(
+        self,
+        container_name: str,
+        blob_path: str,
+        start: int,
+        n_lines: int,
+    ) -> bytes:
+        """Read a blob from `start` until it contains `n_lines` line breaks, or until its end.
+
+        The range read starts at `SAMPLE_WINDOW` bytes, and doubles until it is large enough.
+
+        Args:
+            container_name (str): The name of the container.
+            blob_path (str): The path to the file.
+            start (int): The offset of the first byte to read.
+            n_lines (int): The number of line breaks to read.
+
+        Returns:
+            bytes: The bytes read.
+        """
+        window_size = SAMPLE_WINDOW
+        while True:
+            window = self.read_range(
+                container_name,
+                blob_path,
+                start,
+                start + window_size,
+            )
+            if window.count(b"\n") >= n_lines or len(window) < window_size:
+                return window
+            window_size *= 2
+
+    def download_blob_to_df(
+        self,
+        container_name: str,
+        blob_path: str,
+        file_format: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        use_schema: bool = False,
+        engine: str = "pandas",
+        version: Optional[int] = None,
+        as_of: Optional[datetime] = None,
+        exact_floats: bool = False,
+    ) -> pd.DataFrame:
+        """Download a `csv` (or `parquet`, or `arrow`) file a the given `blob_path` location and renders it as a pandas datatrame.
+
+        ```bash
+        Storage_Account : workspaceperso5448820782
+            │
+            ├── Container : project-mlops-mk-5448820782
+            │   ├── blob : train
+            │   │           ├── x_train.csv
+            │   │           └── y_train.csv
+            │   └── blob : test
+        ```
+
+        ```python
+        from azure_helper.utils.blob_storage_interface import BlobStorageInterface
+
+        blob_storage_interface = BlobStorageInterface(
+            storage_acct_name="workspaceperso5448820782",
+            storage_acct_key="XXXXX-XXXX-XXXXX-XXXX",
+            )
+
+        df = blob_storage_interface.download_blob_to_df(
+            container_name="project-mlops-mk-5448820782",
+            blob_path="train/x_train.csv",
+        )
+        ```
+
+        Only the `columns` asked for are kept. For a `parquet` file, they are also the only ones downloaded : the
+        footer of the file is read first, then each column with a ranged request.
+
+        ```python
+        df = blob_storage_interface.download_blob_to_df(
+            container_name="project-mlops-mk-5448820782",
+            blob_path="train/x_train.parquet",
+            columns=["A", "B"],
+        )
+        ```
+
+        A `csv` file uploaded with `write_schema=True` can be read with `use_schema=True` : its columns are then
+        parsed with the dtypes of its schema sidecar, instead of inferring them. This gives back the dtypes of the
+        uploaded dataframe, usually in a smaller dataframe, but it is not faster : the datetimes are parsed, instead
+        of being left as strings. The floats may differ in their last digit, unless read with `exact_floats=True`,
+        which is slower (see [`read_csv_with_schema`][azure_helper.interfaces.blob_schema.read_csv_with_schema]).
+
+        With `engine="pyarrow"`, `csv` files are parsed by the multi-threaded csv reader of `pyarrow` (see
+        [`deserialize_df`][azure_helper.interfaces.blob_formats.deserialize_df]), straight from the downloaded bytes,
+        which uses all the cores of the node instead of one. It is not the default, as `pyarrow` infers some dtypes
+        differently than `pandas`.
+
+        A blob uploaded with `keep_version=True` can be read as it was at a given `version`, or `as_of` a given date.
+
+        ```python
+        df = blob_storage_interface.download_blob_to_df(
+            container_name="project-mlops-mk-5448820782",
+            blob_path="train/x_train.parquet",
+            version=3,
+        )
+        ```
+
+        Args:
+            container_name (str): The name of the container.
+            blob_path (str): The path to the `csv` file.
+            file_format (Optional[str], optional): One of `csv`, `parquet` or `arrow`. Defaults to None, ie inferred
+                from `blob_path`.
+            columns (Optional[List[str]], optional): The columns to read. Defaults to None, ie all the columns.
+            use_schema (bool, optional): Whether to read a `csv` file with the dtypes of its schema sidecar.
+                Defaults to False.
+            engine (str, optional): The engine parsing a `csv` file, `pandas` or `pyarrow`. Defaults to `pandas`.
+                Ignored with `use_schema=True`.
+            version (Optional[int], optional): The version to read. Defaults to None, ie the current datas.
+            as_of (Optional[datetime], optional): Read the last version uploaded before this date. Defaults to None.
+            exact_floats (bool, optional): Whether to read the floats of a `csv` file back exactly, with
+                `use_schema=True`. Defaults to False.
+
+        Raises:
+            ValueError: If a schema is asked for another format than `csv`, or if the engine is not `pandas` or
+                `pyarrow`.
+
+        Returns:
+            pd.DataFrame: the `csv` file as a dataframe.
+        """
+        log.warning(
+            "The function 'download_blob_to_df' will be deprecated in favour of a more generic version 'download_from_blob' in the near future.",
+        )
+        file_format = infer_format(blob_path, file_format)
+        check_csv_engine(engine)
+        schema = None
+        if use_schema:
+            if file_format != "csv":
+                raise ValueError("A schema can only be used for the 'csv' format.")
+            schema_client = self.blob_service_client.get_blob_client(
+                container=container_name,
+                blob=schema_path(blob_path),
+            )
+            schema = json.loads(self._download_text(schema_client))
+
+        def parse(source: IO[Any]) -> pd.DataFrame:
+            if schema is not None:
+                return read_csv_with_schema(source, schema, columns, exact_floats)
+            return deserialize_df(source, file_format, columns, engine)
+
+        blob_client, cache_path = self._versioned_client(
+            container_name,
+            blob_path,
+            version,
+            as_of,
+        )
+        with measured(self.metrics, "download", container_name) as measurement:
+            cached_file = self._open_cached(blob_client, container_name, cache_path)
+            if cached_file is not None:
+                with cached_file:
+                    measurement.size = os.fstat(cached_file.fileno()).st_size
+                    dataframe = parse(cached_file)
+                log.info(f"Download from {container_name} ended successfully.")
+                return dataframe
+
+            if file_format == "parquet" and columns is not None:
+                # the ranges are downloaded while the file is parsed, so the parsing is measured too.
+                range_reader = BlobRangeReader(
+                    blob_client,
+                    limiter=self.concurrency_limiter,
+                    request_kwargs=measurement.request_kwargs,
+                    bandwidth_limiter=self.bandwidth_limiter,
+                )
+                dataframe = parse(
+                    BufferedReader(range_reader, buffer_size=RANGE_READ_BUFFER_SIZE),
+                )
+                measurement.size = range_reader.bytes_read
+                log.info(f"Download from {container_name} ended successfully.")
+                return dataframe
+
+            if file_format == "csv":
+                with limited(self.concurrency_limiter) as limiter_kwargs:
+                    stream = blob_client.download_blob(
+                        decompress=False,
+                        **measurement.request_kwargs,
+                        **limiter_kwargs,
+                    )
+                    measurement.size = stream.size
+                    content = self._read_content(stream)
+            else:
+                content = b"".join(
+                    self._iter_chunks(blob_client, **measurement.request_kwargs),
+                )
+                measurement.size = len(content)
+        dataframe = parse(BytesIO(content))
+        log.info(f"Download from {container_name} ended successfully.")
+        return dataframe
+
+    def append_df(
+        self,
+        dataframe: pd.DataFrame,
+        container_name: str,
+        prefix: str,
+        partition_date: date,
+        file_format: str = "csv",
+        compression: Optional[str] = None,
+    ) -> Partition:
+        """Append a dataframe to a date-partitioned dataset, eg the daily dump of a table.
+
+        The dataframe is uploaded as a new blob under `<prefix>/date=<partition_date>/`, and added to the manifest
+        of the dataset, `<prefix>/_manifest.json`. The existing partitions are never read nor rewritten, so the cost
+        of an append only depends on the size of the new datas. Several partitions can be appended for the same date.
+
+        ```python
+        blob_storage_interface.append_df(
+            dataframe=todays_sales,
+            container_name="project-mlops-mk-5448820782",
+            prefix="raw/sales",
+            partition_date=date.today(),
+        )
+        ```
+
+        ```bash
+        Container : project-mlops-mk-5448820782
+            └── raw/sales
+                ├── _manifest.json
+                ├── date=2022-09-01
+                │   └── part-20220901T235959-1a2b3c4d.csv
+                └── date=2022-09-02
+                    └── part-20220902T235959-5e6f7a8b.csv
+        ```
+
+        The manifest is updated with an optimistic concurrency control on its ETag, so concurrent appends to the
+        same dataset do not lose each other's partitions.
+
+        Args:
+            dataframe (pd.DataFrame): The datas to append.
+            container_name (str): The name of the container.
+            prefix (str): The prefix of the dataset.
+            partition_date (date): The date of the datas.
+            file_format (str, optional): One of `csv`, `parquet` or `arrow`. Defaults to `csv`.
+            compression (Optional[str], optional): The compression codec of a `parquet` or `arrow` file.
+                Defaults to None, ie the default codec of the format.
+
+        Returns:
+            Partition: The partition appended.
+        """
+        file_format = infer_format(prefix, file_format)
+        self.ensure_container(container_name)
+        blob_path = partition_path(prefix, partition_date, f".{file_format}")
+        blob_client = self.blob_service_client.get_blob_client(
+            container=container_name,
+            blob=blob_path,
+        )
+        result = self._upload(
+            blob_client,
+            blob_path,
+            serialize_df(dataframe, file_format, compression),
+            UploadOptions(),
+        )
+        partition = Partition(
+            partition_date=partition_date,
+            blob_path=blob_path,
+            file_format=file_format,
+            rows=len(dataframe),
+            size=result.bytes_sent,
+            created_at=datetime.now(timezone.utc),
+        )
+
+        def add_partition(manifest: PartitionManifest) -> PartitionManifest:
+            manifest.partitions.append(partition)
+            return manifest
+
+        self._update_manifest(
+            container_name,
+            manifest_path(prefix),
+            PartitionManifest,
+            add_partition,
+        )
+        log.info(f"Appended {len(dataframe)} rows to {prefix} for {partition_date}.")
+        return partition
+
+    def get_manifest(self, container_name: str, prefix: str) -> PartitionManifest:
+        """Get the manifest of a date-partitioned dataset.
+
+        Args:
+            container_name (str): The name of the container.
+            prefix (str): The prefix of the dataset.
+
+        Returns:
+            PartitionManifest: The manifest, empty if the dataset does not exist yet.
+        """
+        manifest, _ = self._read_manifest(
+            container_name,
+            manifest_path(prefix),
+            PartitionManifest,
+        )
+        return manifest
+
+    def read_partitions(
+        self,
+        container_name: str,
+        prefix: str,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        columns: Optional[List[str]] = None,
+        max_workers: int = 8,
+    ) -> pd.DataFrame:
+        """Read the partitions of a date-partitioned dataset for a time window, as a single dataframe.
+
+        Only the manifest and the partitions of the window are downloaded, by `max_workers` workers.
+
+        ```python
+        last_week = blob_storage_interface.read_partitions(
+            container_name="project-mlops-mk-5448820782",
+            prefix="raw/sales",
+            start=date.today() - timedelta(days=7),
+        )
+        ```
+
+        Args:
+            container_name (str): The name of the container.
+            prefix (str): The prefix of the dataset.
+            start (Optional[date], optional): The first date of the window. Defaults to None, ie no lower bound.
+            end (Optional[date], optional): The last date of the window, included. Defaults to None, ie no upper
+                bound.
+            columns (Optional[List[str]], optional): The columns to read. Defaults to None, ie all the columns.
+            max_workers (int, optional): The number of partitions downloaded at the same time. Defaults to 8.
+
+        Returns:
+            pd.DataFrame: The rows of the partitions, sorted by date then by order of append.
+        """
+        partitions = self.get_manifest(container_name, prefix).select(start, end)
+
+        def read_one(partition: Partition) -> pd.DataFrame:
+            blob_client = self.blob_service_client.get_blob_client(
+                container=container_name,
+                blob=partition.blob_path,
+            )
+            with measured(self.metrics, "download", container_name) as measurement:
+                content = b"".join(
+                    self._iter_chunks(blob_client, **measurement.request_kwargs),
+                )
+                measurement.size = len(content)
+            return deserialize_df(BytesIO(content), partition.file_format, columns)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            dataframes = list(executor.map(read_one, partitions))
+        log.info(
+            f"Read {len(partitions)} partitions of {prefix} from {container_name}.",
+        )
+        if not dataframes:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(dataframes, ignore_index=True)
+
+    def list_versions(self, container_name: str, blob_path: str) -> VersionIndex:
+        """Get the versions of a blob uploaded with `keep_version=True`.
+
+        Each upload with `keep_version=True` takes a snapshot of the blob, and records it in a small
+        `<blob_path>.versions.json` index next to the blob. A snapshot is a read-only view of the blob kept by the
+        storage account, which bills only the blocks it does not share with the blob : no datas are copied to keep a
+        version, and reading a version only costs a lookup in the index.
+
+        ```python
+        blob_storage_interface.upload_df_to_blob(
+            dataframe=x_train,
+            container_name="project-mlops-mk-5448820782",
+            blob_path="train/x_train.parquet",
+            keep_version=True,
+        )
+        index = blob_storage_interface.list_versions("project-mlops-mk-5448820782", "train/x_train.parquet")
+        print([(blob_version.version, blob_version.created_at) for blob_version in index.versions])
+        df = blob_storage_interface.download_blob_to_df(
+            container_name="project-mlops-mk-5448820782",
+            blob_path="train/x_train.parquet",
+            as_of=datetime(2022, 9, 1, tzinfo=timezone.utc),
+        )
+        ```
+
+        !!! attention "Attention"
+
+            The snapshots of the versions prevent the deletion of the blob : it must be deleted with
+            `delete_snapshots="include"`, which deletes its versions for good. Two processes uploading versions of the
+            same blob at the same time may record the datas of one of them twice.
+
+        Args:
+            container_name (str): The name of the container.
+            blob_path (str): The path of the blob.
+
+        Returns:
+            VersionIndex: The index of the versions, empty if the blob was never uploaded with `keep_version=True`.
+        """
+        index, _ = self._read_manifest(
+            container_name,
+            versions_path(blob_path),
+            VersionIndex,
+        )
+        return index
+
+    def _add_version(
+        self,
+        blob_client: BlobClient,
+        container_name: str,
+        blob_path: str,
+        size: int,
+    ) -> BlobVersion:
+        """Snapshot a blob just uploaded, and record the snapshot as its next version.
+
+        Args:
+            blob_client (BlobClient): The client of the blob.
+            container_name (str): The name of the container.
+            blob_path (str): The path of the blob.
+            size (int): The size of the datas uploaded.
+
+        Returns:
+            BlobVersion: The new version.
+        """
+        snapshot = str(blob_client.create_snapshot()["snapshot"])
+        created_at = datetime.now(timezone.utc)
+
+        def add(index: VersionIndex) -> VersionIndex:
+            index.versions.append(
+                BlobVersion(
+                    version=index.next_version,
+                    snapshot=snapshot,
+                    size=size,
+                    created_at=created_at,
+                ),
+            )
+            return index
+
+        index = self._update_manifest(
+            container_name,
+            versions_path(blob_path),
+            VersionIndex,
+            add,
+        )
+        blob_version = index.versions[-1]
+        log.info(f"Blob path {blob_path} kept as version {blob_version.version}.")
+        return blob_version
+
+    def sync_directory(
+        self,
+        local_dir: Union[str, Path],
+        container_name: str,
+        prefix: str,
+        max_workers: int = 8,
+    ) -> List[UploadResult]:
+        """Publish the files of a local directory under a prefix, uploading only the files which changed.
+
+        The MD5 digest of each file uploaded is recorded in a `<prefix>/_sync_manifest.json` manifest. A sync reads
+        this manifest once, hashes the local files, uploads the ones whose digest changed, then updates the manifest
+        in a single conditional write. Republishing a dataset of 500 partitions where 3 changed then uploads these 3
+        partitions, with no request per unchanged partition.
+
+        ```python
+        results = blob_storage_interface.sync_directory(
+            local_dir="data/features",
+            container_name="project-mlops-mk-5448820782",
+            prefix="features",
+        )
+        ```
+
+        !!! attention "Attention"
+
+            The files removed from `local_dir` are not removed from the storage account. The manifest only knows the
+            files uploaded by a sync, so a blob modified by other means is not uploaded again until its local file
+            changes.
+
+        Args:
+            local_dir (Union[str, Path]): The local directory to publish.
+            container_name (str): The name of the container.
+            prefix (str): The path under which the files are uploaded.
+            max_workers (int, optional): The number of files hashed, then uploaded, at the same time. Defaults to 8.
+
+        Returns:
+            List[UploadResult]: The number of bytes sent, or skipped, for each file.
+        """
+        local_dir = Path(local_dir)
+        datasets = [
+            (file_path, file_path.relative_to(local_dir).as_posix())
+            for file_path in sorted(local_dir.rglob("*"))
+            if file_path.is_file()
+        ]
+        return self._sync(datasets, container_name, prefix, max_workers)
+
+    def sync_dfs(
+        self,
+        dataframes: Iterable[Tuple[pd.DataFrame, str]],
+        container_name: str,
+        prefix: str,
+        file_format: Optional[str] = None,
+        compression: Optional[str] = None,
+        max_workers: int = 8,
+    ) -> List[UploadResult]:
+        """Publish dataframes under a prefix, uploading only the ones which changed.
+
+        See [`sync_directory`][azure_helper.interfaces.blob_storage_interface.BlobStorageInterface.sync_directory].
+
+        Args:
+            dataframes (Iterable[Tuple[pd.DataFrame, str]]): The dataframes, with their path relative to `prefix`.
+            container_name (str): The name of the container.
+            prefix (str): The path under which the dataframes are uploaded.
+            file_format (Optional[str], optional): One of `csv`, `parquet` or `arrow`. Defaults to None, ie inferred
+                from the path of each dataframe.
+            compression (Optional[str], optional): The compression codec of the `parquet` or `arrow` files.
+                Defaults to None, ie the default codec of the format.
+            max_workers (int, optional): The number of dataframes serialized, then uploaded, at the same time.
+                Defaults to 8.
+
+        Returns:
+            List[UploadResult]: The number of bytes sent, or skipped, for each dataframe.
+        """
+        return self._sync(
+            dataframes,
+            container_name,
+            prefix,
+            max_workers,
+            # serialized by the workers, so at most `max_workers` serialized dataframes are in memory.
+            lambda dataframe, name: serialize_df(
+                dataframe,
+                infer_format(name, file_format),
+                compression,
+            ),
+        )
+
+    def _sync(
+        self,
+        datasets: Iterable[Tuple[Any, str]],
+        container_name: str,
+        prefix: str,
+        max_workers: int,
+        prepare: Callable[[Any, str], Any] = lambda dataset, _: dataset,
+    ) -> List[UploadResult]:
+        """Upload the datasets whose digest is not the one recorded in the sync manifest, then record them.
+
+        Each dataset is prepared, hashed, then uploaded if it changed, by one of `max_workers` workers. At most
+        `max_workers` datasets are taken from `datasets` ahead of the uploads, so only as many prepared datasets are
+        held in memory at the same time.
+
+        Args:
+            datasets (Iterable[Tuple[Any, str]]): The datasets, with their path relative to `prefix`.
+            container_name (str): The name of the container.
+            prefix (str): The path under which the datasets are uploaded.
+            max_workers (int): The number of datasets prepared, hashed then uploaded at the same time.
+            prepare (Callable[[Any, str], Any], optional): Function turning a dataset, given with its path, into datas
+                accepted by `upload_to_blob`. Defaults to the dataset itself.
+
+        Returns:
+            List[UploadResult]: The number of bytes sent, or skipped, for each dataset.
+        """
+        self.ensure_container(container_name)
+        root = prefix.strip("/")
+        sync_manifest_path = manifest_path(prefix, SYNC_MANIFEST_NAME)
+        manifest, _ = self._read_manifest(
+            container_name,
+            sync_manifest_path,
+            SyncManifest,
+        )
+
+        def sync_one(dataset: Any, name: str) -> Tuple[UploadResult, SyncedFile, bool]:
+            blob_path = f"{root}/{name}" if root else name
+            with open_source(prepare(dataset, name)) as source:
+                stream = as_stream(source)
+                start = stream.tell()
+                size = stream.seek(0, SEEK_END) - start
+                stream.seek(start)
+                synced_file = SyncedFile(md5=source_md5(source).hex(), size=size)
+                if manifest.files.get(name) == synced_file:
+                    return (
+                        UploadResult(blob_path=blob_path, bytes_skipped=size),
+                        synced_file,
+                        False,
+                    )
+                blob_client = self.blob_service_client.get_blob_client(
+                    container=container_name,
+                    blob=blob_path,
+                )
+                result = self._upload(
+                    blob_client,
+                    blob_path,
+                    source,
+                    UploadOptions(overwrite=True),
+                )
+            return result, synced_file, True
+
+        start_time = time.perf_counter()
+        names = []
+        futures: List["Future[Tuple[UploadResult, SyncedFile, bool]]"] = []
+        pending: Set["Future[Tuple[UploadResult, SyncedFile, bool]]"] = set()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for dataset, name in datasets:
+                if len(pending) >= max_workers:
+                    _, pending = wait(pending, return_when=FIRST_COMPLETED)
+                future = executor.submit(sync_one, dataset, name)
+                pending.add(future)
+                futures.append(future)
+                names.append(name)
+            synced = [future.result() for future in futures]
+
+        changed = {
+            name: synced_file
+            for name, (_, synced_file, is_changed) in zip(names, synced)
+            if is_changed
+        }
+        results = [result for result, _, _ in synced]
+        if changed:
+            self._log_uploads(
+                [result for result, _, is_changed in synced if is_changed],
+                container_name,
+                time.perf_counter() - start_time,
+            )
+
+            def record_changes(current: SyncManifest) -> SyncManifest:
+                current.files.update(changed)
+                return current
+
+            # Written after the uploads : files uploaded by an interrupted sync are simply uploaded again.
+            self._update_manifest(
+                container_name,
+                sync_manifest_path,
+                SyncManifest,
+                record_changes,
+            )
+
+        log.info(f"Synced {prefix} : {len(changed)} of {len(results)} files changed.")
+        return results
+
+    def _read_manifest(
+        self,
+        container_name: str,
+        blob_path: str,
+        manifest_type: Type[Manifest],
+    ) -> Tuple[Manifest, Optional[str]]:
+        """Read a manifest, with its ETag.
+
+        Args:
+            container_name (str): The name of the container.
+            blob_path (str): The path of the manifest.
+            manifest_type (Type[Manifest]): The model of the manifest.
+
+        Returns:
+            Tuple[Manifest, Optional[str]]: The manifest, and its ETag, None if it does not exist yet.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=container_name,
+            blob=blob_path,
+        )
+        with limited(self.concurrency_limiter) as limiter_kwargs:
+            try:
+                stream = blob_client.download_blob(**limiter_kwargs)
+            except ResourceNotFoundError:
+                return manifest_type(), None
+            return manifest_type.parse_raw(stream.readall()), stream.properties.etag
+
+    def _update_manifest(
+        self,
+        container_name: str,
+        blob_path: str,
+        manifest_type: Type[Manifest],
+        update: Callable[[Manifest], Manifest],
+    ) -> Manifest:
+        """Read, update then write a manifest, only if no one else wrote it meanwhile.
+
+        If the manifest was modified since it was read, it is read and updated again, up to `MANIFEST_RETRIES` times.
+
+        Args:
+            container_name (str): The name of the container.
+            blob_path (str): The path of the manifest.
+            manifest_type (Type[Manifest]): The model of the manifest.
+            update (Callable[[Manifest], Manifest]): The update of the manifest.
+
+        Raises:
+            ResourceModifiedError: If the manifest was still modified by someone else after all the retries.
+
+        Returns:
+            Manifest: The manifest written.
+        """
+        blob_client = self.blob_service_client.get_blob_client(
+            container=container_name,
+            blob=blob_path,
+        )
+        for attempt in range(MANIFEST_RETRIES):
+            manifest, etag = self._read_manifest(
+                container_name,
+                blob_path,
+                manifest_type,
+            )
+            manifest = update(manifest)
+            try:
+                with limited(self.concurrency_limiter) as limiter_kwargs:
+                    if etag is None:
+                        # fails if someone else created the manifest meanwhile.
+                        blob_client.upload_blob(
+                            manifest.json().encode(),
+                            **limiter_kwargs,
+                        )
+                    else:
+                        blob_client.upload_blob(
+                            manifest.json().encode(),
+                            overwrite=True,
+                            etag=etag,
+                            match_condition=MatchConditions.IfNotModified,
+                            **limiter_kwargs,
+                        )
+                return manifest
+            except (ResourceExistsError, ResourceModifiedError):
+                log.warning(
+                    f"Manifest {blob_path} modified concurrently, retrying ({attempt + 1}/{MANIFEST_RETRIES}).",
+                )
+        raise ResourceModifiedError(
+            f"Could not update the manifest {blob_path} after {MANIFEST_RETRIES} attempts.",
         )
-        stream = blob_client.download_blob()
-        buffer = StringIO(stream.content_as_text())
-        dataframe = pd.read_csv(buffer)
-        log.info(f"Download from {container_name} ended successfully.")
-        return dataframe
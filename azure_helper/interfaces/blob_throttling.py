@@ -0,0 +1,255 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterable, Iterator, Optional, Tuple
+
+from pydantic import BaseModel
+
+from azure_helper.logger import get_logger
+
+log = get_logger()
+
+THROTTLING_STATUS_CODES = (503,)
+THROTTLING_ERROR_CODES = (
+    "ServerBusy",
+    "IngressOverAccountLimit",
+    "EgressOverAccountLimit",
+)
+THROTTLING_COOLDOWN = 1.0
+
+
+class ConcurrencyStats(BaseModel):
+    """Snapshot of the state of an adaptive concurrency limiter.
+
+    Attributes:
+        limit (int): The current number of requests allowed at the same time.
+        in_flight (int): The number of requests running.
+        successes (int): The number of successful requests, since the creation of the limiter.
+        throttled (int): The number of requests throttled by the storage account, since the creation of the limiter.
+        mb_per_s (float): The throughput of the successful requests over the last seconds, in MB/s.
+    """
+
+    limit: int
+    in_flight: int
+    successes: int = 0
+    throttled: int = 0
+    mb_per_s: float = 0
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(
+        self,
+        initial_limit: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        decrease_factor: float = 0.5,
+        throughput_window: float = 5,
+    ):
+        """Limit the number of concurrent requests to a storage account, adapting the limit to its throttling.
+
+        The limit follows an AIMD (additive increase, multiplicative decrease) law, as TCP congestion control does :
+
+        * it grows by one after `limit` successful requests, ie by about one per round of requests,
+        * it is multiplied by `decrease_factor` when the storage account answers `503 ServerBusy`. The requests
+            already in flight when the limit decreases may be throttled too, so a single decrease happens per round of
+            requests, or per second while no request succeeds.
+
+        The limit then oscillates just under the maximum concurrency the storage account can sustain, instead of
+        piling up retries of throttled requests.
+
+        ```python
+        limiter = AdaptiveConcurrencyLimiter(max_limit=32)
+        blob_storage_interface = BlobStorageInterface(
+            storage_acct_name="workspaceperso5448820782",
+            storage_acct_key="XXXXX-XXXX-XXXXX-XXXX",
+            concurrency_limiter=limiter,
+        )
+        blob_storage_interface.upload_directory("data/", "project-mlops-mk-5448820782", max_workers=32)
+        print(limiter.stats)
+        ```
+
+        !!! info "Information"
+
+            The limiter only holds back the requests, the thread pools of the transfers must be large enough for the
+            limit to grow, eg `max_workers=max_limit`.
+
+        Args:
+            initial_limit (int, optional): The limit at creation. Defaults to 4.
+            min_limit (int, optional): The lowest limit. Defaults to 1.
+            max_limit (int, optional): The highest limit. Defaults to 64.
+            decrease_factor (float, optional): The factor applied to the limit on throttling. Defaults to 0.5.
+            throughput_window (float, optional): The duration over which the throughput is measured, in seconds.
+                Defaults to 5.
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.throughput_window = throughput_window
+
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._successes = 0
+        self._throttled = 0
+        self._successes_since_decrease = 0
+        self._last_decrease = float("-inf")
+        self._transfers: Deque[Tuple[float, int]] = deque()
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """The current number of requests allowed at the same time."""
+        return int(self._limit)
+
+    @property
+    def mb_per_s(self) -> float:
+        """The throughput of the successful requests over the last `throughput_window` seconds, in MB/s."""
+        with self._condition:
+            self._trim_transfers(time.monotonic())
+            return (
+                sum(size for _, size in self._transfers) / self.throughput_window / 1e6
+            )
+
+    @property
+    def stats(self) -> ConcurrencyStats:
+        mb_per_s = self.mb_per_s
+        with self._condition:
+            return ConcurrencyStats(
+                limit=self.limit,
+                in_flight=self._in_flight,
+                successes=self._successes,
+                throttled=self._throttled,
+                mb_per_s=mb_per_s,
+            )
+
+    @contextmanager
+    def slot(self) -> Iterator[None]:
+        """Wait until the number of requests in flight is under the limit, and hold a slot meanwhile."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._in_flight < self.limit)
+            self._in_flight += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify()
+
+    def on_success(self, size: int = 0):
+        """Record a successful request.
+
+        Args:
+            size (int, optional): The number of bytes transferred. Defaults to 0.
+        """
+        with self._condition:
+            self._successes += 1
+            self._successes_since_decrease += 1
+            now = time.monotonic()
+            self._transfers.append((now, size))
+            self._trim_transfers(now)
+            if self._limit < self.max_limit:
+                previous_limit = self.limit
+                self._limit = min(self._limit + 1 / self._limit, self.max_limit)
+                if self.limit > previous_limit:
+                    self._condition.notify()
+
+    def on_throttled(self):
+        """Record a request throttled by the storage account."""
+        with self._condition:
+            self._throttled += 1
+            # Only decrease once per round of requests, as the ones already in flight are likely throttled too.
+            now = time.monotonic()
+            if (
+                self._successes_since_decrease < self.limit
+                and now - self._last_decrease < THROTTLING_COOLDOWN
+            ):
+                return
+            self._successes_since_decrease = 0
+            self._last_decrease = now
+            self._limit = max(self._limit * self.decrease_factor, self.min_limit)
+        log.warning(
+            f"Storage account is throttling, concurrency decreased to {self.limit}.",
+        )
+
+    def response_hook(self, response: Any):
+        """Record the outcome of a request, as the `raw_response_hook` of the Azure SDK.
+
+        The hook is called for each attempt of a request, so the throttled attempts retried by the SDK are recorded
+        too.
+
+        Args:
+            response (Any): The `PipelineResponse` of the request.
+        """
+        http_request = response.http_request
+        http_response = response.http_response
+        if is_throttled(
+            http_response.status_code,
+            http_response.headers.get("x-ms-error-code"),
+        ):
+            self.on_throttled()
+        elif http_response.status_code < 400:
+            size = int(http_request.headers.get("Content-Length") or 0)
+            if http_request.method == "GET":
+                size += int(http_response.headers.get("Content-Length") or 0)
+            self.on_success(size)
+
+    def _trim_transfers(self, now: float):
+        while self._transfers and self._transfers[0][0] < now - self.throughput_window:
+            self._transfers.popleft()
+
+
+def is_throttled(status_code: int, error_code: Optional[str]) -> bool:
+    """Whether a response of the storage account means the request was throttled.
+
+    Args:
+        status_code (int): The HTTP status code of the response.
+        error_code (Optional[str]): The `x-ms-error-code` header of the response.
+
+    Returns:
+        bool: True if the request was throttled.
+    """
+    return (
+        status_code in THROTTLING_STATUS_CODES or error_code in THROTTLING_ERROR_CODES
+    )
+
+
+@contextmanager
+def limited(limiter: Optional[AdaptiveConcurrencyLimiter]) -> Iterator[Dict[str, Any]]:
+    """Hold a slot of a concurrency limiter, if any, during a transfer.
+
+    Args:
+        limiter (Optional[AdaptiveConcurrencyLimiter]): The limiter, or None for no limit.
+
+    Yields:
+        Dict[str, Any]: The keyword arguments to give to the requests of the transfer, so the limiter sees their
+            responses.
+    """
+    if limiter is None:
+        yield {}
+        return
+    with limiter.slot():
+        yield {"raw_response_hook": limiter.response_hook}
+
+
+def iter_limited(
+    chunks: Iterable[bytes],
+    limiter: Optional[AdaptiveConcurrencyLimiter],
+) -> Iterator[bytes]:
+    """Hold a slot of a concurrency limiter, if any, while each chunk of a download is fetched.
+
+    The slot is released while the chunk is consumed, so a slow consumer, or a stream left open, does not hold it.
+
+    Args:
+        chunks (Iterable[bytes]): The chunks, eg of a blob being downloaded.
+        limiter (Optional[AdaptiveConcurrencyLimiter]): The limiter, or None for no limit.
+
+    Yields:
+        bytes: The next chunk.
+    """
+    iterator = iter(chunks)
+    while True:
+        with limited(limiter):
+            chunk = next(iterator, None)
+        if chunk is None:
+            return
+        yield chunk
@@ -0,0 +1,525 @@
+import base64
+import hashlib
+import os
+import queue
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from io import SEEK_CUR, SEEK_END, SEEK_SET, BytesIO, RawIOBase
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Union,
+)
+
+from azure.storage.blob import BlobBlock, BlobClient, BlobProperties
+from pydantic import BaseModel
+
+from azure_helper.interfaces.blob_bandwidth import BandwidthLimiter, TransferProgress
+from azure_helper.interfaces.blob_throttling import AdaptiveConcurrencyLimiter, limited
+
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+PREFETCH_POLL_INTERVAL = 0.1
+_END_OF_CHUNKS = object()
+# metadata holding the MD5 of the uncompressed datas of a compressed blob.
+SOURCE_MD5_KEY = "source_md5"
+
+
+class UploadResult(BaseModel):
+    """Summary of an upload.
+
+    Attributes:
+        blob_path (str): The path of the blob.
+        bytes_sent (int): The number of bytes actually sent to the storage account.
+        bytes_skipped (int): The number of bytes not sent because the blob already contained the same datas.
+        bytes_resumed (int): The number of bytes not sent because they were staged by a previous, interrupted upload.
+        elapsed (float): The duration of the upload, in seconds.
+    """
+
+    blob_path: str
+    bytes_sent: int = 0
+    bytes_skipped: int = 0
+    bytes_resumed: int = 0
+    elapsed: float = 0
+
+    @property
+    def skipped(self) -> bool:
+        return self.bytes_skipped > 0
+
+
+class UploadOptions(BaseModel):
+    """How to upload a blob, see [`upload_to_blob`][azure_helper.interfaces.blob_storage_interface.BlobStorageInterface.upload_to_blob].
+
+    Attributes:
+        block_size (Optional[int]): The size of the blocks of a chunked upload, in bytes.
+        max_concurrency (int): The number of blocks staged in parallel.
+        overwrite (bool): Whether to replace an existing blob in a single request.
+        skip_unchanged (bool): Whether to skip the upload if the blob already contains the same datas.
+        content_encoding (Optional[str]): The codec used to compress the datas, if any.
+        compression_level (Optional[int]): The compression level of the codec.
+        journal_dir (Optional[str]): The directory of the journal of a resumable upload, if any.
+        progress_callback (Optional[Callable[[TransferProgress], None]]): Called after each block uploaded, if any.
+    """
+
+    block_size: Optional[int] = None
+    max_concurrency: int = 1
+    overwrite: bool = False
+    skip_unchanged: bool = False
+    content_encoding: Optional[str] = None
+    compression_level: Optional[int] = None
+    journal_dir: Optional[str] = None
+    progress_callback: Optional[Callable[[TransferProgress], None]] = None
+
+    @property
+    def chunked(self) -> bool:
+        return (
+            self.block_size is not None
+            or self.max_concurrency > 1
+            or self.content_encoding is not None
+            or self.journal_dir is not None
+            or self.progress_callback is not None
+        )
+
+
+class DownloadResult(BaseModel):
+    """Summary of the download of a blob to a local file.
+
+    Attributes:
+        blob_path (str): The path of the blob.
+        local_path (str): The path of the local file.
+        bytes_received (int): The number of bytes downloaded.
+        skipped (bool): Whether the local file was already up to date.
+        elapsed (float): The duration of the download, in seconds.
+        error (Optional[str]): The last error met, if the download failed after all its retries.
+    """
+
+    blob_path: str
+    local_path: str
+    bytes_received: int = 0
+    skipped: bool = False
+    elapsed: float = 0
+    error: Optional[str] = None
+
+
+class CopyResult(BaseModel):
+    """Summary of the server-side copy of a blob.
+
+    Attributes:
+        source_path (str): The path of the source blob.
+        blob_path (str): The path of the copy.
+        size (int): The size of the blob, in bytes, copied by the storage account.
+        status (str): The status of the copy, one of `pending`, `success`, `failed` or `aborted`.
+        copy_id (Optional[str]): The id of the copy, to abort it.
+        elapsed (float): The duration of the copy, in seconds.
+        error (Optional[str]): The error met, if the copy failed.
+    """
+
+    source_path: str
+    blob_path: str
+    size: int = 0
+    status: str = "pending"
+    copy_id: Optional[str] = None
+    elapsed: float = 0
+    error: Optional[str] = None
+
+
+@contextmanager
+def open_source(dataset: Any) -> Iterator[Union[bytes, IO[bytes]]]:
+    """Open the datas to upload.
+
+    The `dataset` can either be :
+
+    * a path to a local file (`pathlib.Path` or any `os.PathLike`), which is opened in binary mode,
+    * a binary file-like object (anything with a `read` method), which is left as is,
+    * in-memory datas (`bytes`, `bytearray` or `str`, which will be utf-8 encoded).
+
+    Args:
+        dataset (Any): The datas you want to upload.
+
+    Yields:
+        Union[bytes, IO[bytes]]: The in-memory datas, or a binary stream over them.
+    """
+    if isinstance(dataset, os.PathLike):
+        with open(dataset, "rb") as file_obj:
+            yield file_obj
+    elif isinstance(dataset, str):
+        yield dataset.encode()
+    else:
+        yield dataset
+
+
+def dataset_size(dataset: Any) -> Optional[int]:
+    """Get the size of the datas to upload, without reading them.
+
+    Args:
+        dataset (Any): The datas, see `open_source`.
+
+    Returns:
+        Optional[int]: The size of the datas, in bytes, None for a file-like object.
+    """
+    if isinstance(dataset, os.PathLike):
+        return os.path.getsize(dataset)
+    if isinstance(dataset, str):
+        return len(dataset.encode())
+    if isinstance(dataset, (bytes, bytearray)):
+        return len(dataset)
+    return None
+
+
+def as_stream(source: Union[bytes, IO[bytes]]) -> IO[bytes]:
+    """Get a binary stream over datas opened with `open_source`.
+
+    Args:
+        source (Union[bytes, IO[bytes]]): The datas.
+
+    Returns:
+        IO[bytes]: A binary stream over the datas.
+    """
+    if hasattr(source, "read"):
+        return source  # type: ignore
+    return BytesIO(source)
+
+
+def is_seekable(source: Union[bytes, IO[bytes]]) -> bool:
+    """Whether the datas opened with `open_source` can be read more than once.
+
+    Args:
+        source (Union[bytes, IO[bytes]]): The datas.
+
+    Returns:
+        bool: True for in-memory datas and seekable streams.
+    """
+    if not hasattr(source, "read"):
+        return True
+    return hasattr(source, "seekable") and source.seekable()
+
+
+def source_md5(source: Union[bytes, IO[bytes]]) -> bytes:
+    """Compute the MD5 digest of seekable datas, rewinding the stream afterward.
+
+    Args:
+        source (Union[bytes, IO[bytes]]): The datas, see `is_seekable`.
+
+    Returns:
+        bytes: The MD5 digest of the datas.
+    """
+    if not hasattr(source, "read"):
+        return hashlib.md5(source).digest()  # noqa: S303
+    stream: IO[bytes] = source  # type: ignore
+    position = stream.tell()
+    md5 = hashlib.md5()  # noqa: S303
+    for block in iter_blocks(stream, DEFAULT_BLOCK_SIZE):
+        md5.update(block)
+    stream.seek(position)
+    return md5.digest()
+
+
+def is_unchanged(properties: Optional[BlobProperties], md5: bytes) -> bool:
+    """Whether a blob already contains the datas of MD5 digest `md5`.
+
+    Args:
+        properties (Optional[BlobProperties]): The properties of the blob, None if it does not exist.
+        md5 (bytes): The MD5 digest of the datas.
+
+    Returns:
+        bool: True if the content MD5 of the blob, or the MD5 of its uncompressed datas, is `md5`.
+    """
+    if properties is None:
+        return False
+    if (properties.metadata or {}).get(SOURCE_MD5_KEY) == md5.hex():
+        return True
+    remote_md5 = properties.content_settings.content_md5
+    return remote_md5 is not None and bytes(remote_md5) == md5
+
+
+def is_downloaded(local_path: Path, properties: BlobProperties) -> bool:
+    """Whether a blob was already downloaded to a local file.
+
+    Args:
+        local_path (Path): The path of the local file.
+        properties (BlobProperties): The properties of the blob.
+
+    Returns:
+        bool: True if the local file has the same size and modification time as the blob.
+    """
+    try:
+        stat = local_path.stat()
+    except FileNotFoundError:
+        return False
+    return stat.st_size == properties.size and int(stat.st_mtime) == int(
+        properties.last_modified.timestamp(),
+    )
+
+
+def iter_blocks(stream: IO[bytes], block_size: int) -> Iterator[bytes]:
+    """Read a binary stream as successive blocks of at most `block_size` bytes.
+
+    Args:
+        stream (IO[bytes]): The stream to read.
+        block_size (int): The maximum size of a block, in bytes.
+
+    Yields:
+        bytes: The next block of datas.
+    """
+    while True:
+        block = stream.read(block_size)
+        if not block:
+            return
+        yield block
+
+
+def iter_hashed(blocks: Iterable[bytes], md5: Any) -> Iterator[bytes]:
+    """Update a hash with each block of a stream, while passing them through.
+
+    Args:
+        blocks (Iterable[bytes]): The blocks of datas.
+        md5 (Any): A `hashlib` hash object.
+
+    Yields:
+        bytes: The same blocks.
+    """
+    for block in blocks:
+        md5.update(block)
+        yield block
+
+
+def make_block_id(index: int) -> str:
+    """Build the id of the `index`-th block of a blob.
+
+    Azure requires all the block ids of a blob to have the same length, they are then
+    derived from the position of the block.
+
+    Args:
+        index (int): The position of the block in the blob.
+
+    Returns:
+        str: The base64 encoded block id.
+    """
+    return base64.b64encode(f"{index:032d}".encode()).decode()
+
+
+def stage_blocks(
+    blob_client: BlobClient,
+    blocks: Iterable[bytes],
+    max_concurrency: int,
+    limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+    request_kwargs: Optional[Dict[str, Any]] = None,
+    staged_ids: Optional[Set[str]] = None,
+    on_staged: Optional[Callable[[str, int], None]] = None,
+    bandwidth_limiter: Optional[BandwidthLimiter] = None,
+) -> List[BlobBlock]:
+    """Stage blocks of datas in parallel, without committing them.
+
+    At most `max_concurrency` blocks are in flight at the same time, so the memory
+    used is bounded by `max_concurrency` times the size of a block.
+
+    Args:
+        blob_client (BlobClient): The client of the blob the blocks belong to.
+        blocks (Iterable[bytes]): The blocks of datas, in order.
+        max_concurrency (int): The number of blocks staged at the same time.
+        limiter (Optional[AdaptiveConcurrencyLimiter], optional): A limiter further reducing the number of blocks
+            staged at the same time when the storage account is throttling. Defaults to None.
+        request_kwargs (Optional[Dict[str, Any]], optional): Extra keyword arguments of `BlobClient.stage_block`.
+            Defaults to None.
+        staged_ids (Optional[Set[str]], optional): The ids of the blocks already staged, which are not sent again.
+            Defaults to None.
+        on_staged (Optional[Callable[[str, int], None]], optional): Called with the id and the size of each block
+            once staged, or skipped as already staged. Defaults to None.
+        bandwidth_limiter (Optional[BandwidthLimiter], optional): A limiter of the throughput of the blocks staged.
+            Defaults to None.
+
+    Returns:
+        List[BlobBlock]: The ordered block list, to give to `commit_block_list`.
+    """
+
+    def stage_one(block_id: str, block: bytes):
+        if bandwidth_limiter is not None:
+            bandwidth_limiter.consume(len(block))
+        with limited(limiter) as limiter_kwargs:
+            blob_client.stage_block(
+                block_id,
+                block,
+                **(request_kwargs or {}),
+                **limiter_kwargs,
+            )
+        if on_staged is not None:
+            on_staged(block_id, len(block))
+
+    block_list = []
+    pending: Set["Future[None]"] = set()
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        for index, block in enumerate(blocks):
+            if len(pending) >= max_concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            block_id = make_block_id(index)
+            if staged_ids is None or block_id not in staged_ids:
+                pending.add(executor.submit(stage_one, block_id, block))
+            elif on_staged is not None:
+                on_staged(block_id, len(block))
+            blob_block = BlobBlock(block_id=block_id)
+            blob_block.size = len(block)
+            block_list.append(blob_block)
+        for future in pending:
+            future.result()
+    return block_list
+
+
+def iter_prefetched(chunks: Iterable[bytes], depth: int) -> Iterator[bytes]:
+    """Pull chunks from an iterator in a background thread, up to `depth` chunks ahead of the consumer.
+
+    This overlaps the download of the next chunks with the processing of the current one. Exceptions raised while
+    pulling a chunk are raised again by the consumer.
+
+    Args:
+        chunks (Iterable[bytes]): The chunks, eg of a blob being downloaded.
+        depth (int): The maximum number of chunks waiting to be consumed.
+
+    Yields:
+        bytes: The next chunk.
+    """
+    pending: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                pending.put(item, timeout=PREFETCH_POLL_INTERVAL)
+            except queue.Full:
+                continue
+            return True
+        return False
+
+    def prefetch():
+        try:
+            for chunk in chunks:
+                if not put(chunk):
+                    return
+        except BaseException as err:  # noqa: WPS424
+            put(err)
+            return
+        put(_END_OF_CHUNKS)
+
+    worker = threading.Thread(target=prefetch, daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = pending.get()
+            if item is _END_OF_CHUNKS:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # the consumer may stop early, the worker must not stay blocked on a full queue.
+        stop.set()
+        worker.join()
+
+
+class ChunkReader(RawIOBase):
+    def __init__(self, chunks: Iterable[bytes]):
+        """Read-only, non seekable, file-like object over an iterator of chunks of bytes.
+
+        Chunks are pulled lazily from the iterator, only when the datas they contain are read, so at most one chunk
+        is held in memory at a time.
+
+        Args:
+            chunks (Iterable[bytes]): The successive chunks of the file.
+        """
+        self._chunks = iter(chunks)
+        self._pending = memoryview(b"")
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                return 0
+            self._pending = memoryview(chunk)
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+class BlobRangeReader(RawIOBase):
+    def __init__(
+        self,
+        blob_client: BlobClient,
+        size: Optional[int] = None,
+        limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        request_kwargs: Optional[Dict[str, Any]] = None,
+        bandwidth_limiter: Optional[BandwidthLimiter] = None,
+    ):
+        """Read-only, seekable, file-like object over a blob.
+
+        Each read is a ranged GET of the blob, so readers which seek, like `pyarrow` on a parquet file, only download
+        the parts of the blob they actually need.
+
+        Args:
+            blob_client (BlobClient): The client of the blob to read.
+            size (Optional[int], optional): The size of the blob, if known. Defaults to None, ie fetched from the
+                blob properties.
+            limiter (Optional[AdaptiveConcurrencyLimiter], optional): The limiter of the concurrent requests, holding
+                a slot during each read. Defaults to None, ie no limit.
+            request_kwargs (Optional[Dict[str, Any]], optional): Extra keyword arguments of the ranged requests, eg
+                to measure them. Defaults to None.
+            bandwidth_limiter (Optional[BandwidthLimiter], optional): The limiter of the throughput, taking the size
+                of each range read. Defaults to None, ie no limit.
+
+        Attributes:
+            bytes_read (int): The number of bytes downloaded so far.
+        """
+        self._blob_client = blob_client
+        self._limiter = limiter
+        self._request_kwargs = request_kwargs or {}
+        self._bandwidth_limiter = bandwidth_limiter
+        self.bytes_read = 0
+        self._size = blob_client.get_blob_properties().size if size is None else size
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = SEEK_SET) -> int:
+        if whence == SEEK_CUR:
+            offset += self._position
+        elif whence == SEEK_END:
+            offset += self._size
+        self._position = max(offset, 0)
+        return self._position
+
+    def readinto(self, buffer) -> int:
+        length = min(len(buffer), self._size - self._position)
+        if length <= 0:
+            return 0
+        with limited(self._limiter) as limiter_kwargs:
+            datas = self._blob_client.download_blob(
+                offset=self._position,
+                length=length,
+                **self._request_kwargs,
+                **limiter_kwargs,
+            ).readall()
+        if self._bandwidth_limiter is not None:
+            self._bandwidth_limiter.consume(len(datas))
+        buffer[: len(datas)] = datas
+        self.bytes_read += len(datas)
+        self._position += len(datas)
+        return len(datas)
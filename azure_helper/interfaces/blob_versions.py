@@ -0,0 +1,89 @@
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+VERSIONS_SUFFIX = ".versions.json"
+
+
+class BlobVersion(BaseModel):
+    """A version of a blob, kept as a snapshot of the blob.
+
+    Attributes:
+        version (int): The number of the version, starting at 1.
+        snapshot (str): The id of the snapshot holding the datas of the version.
+        size (int): The size of the version, in bytes.
+        created_at (datetime): When the version was uploaded.
+    """
+
+    version: int
+    snapshot: str
+    size: int
+    created_at: datetime
+
+
+class VersionIndex(BaseModel):
+    """The list of the versions of a blob, stored in a `<blob_path>.versions.json` blob next to it.
+
+    Attributes:
+        versions (List[BlobVersion]): The versions, from the oldest to the newest.
+    """
+
+    versions: List[BlobVersion] = []
+
+    def find(
+        self,
+        version: Optional[int] = None,
+        as_of: Optional[datetime] = None,
+    ) -> BlobVersion:
+        """Find a version by number, or the last version uploaded before a date.
+
+        Args:
+            version (Optional[int], optional): The number of the version. Defaults to None.
+            as_of (Optional[datetime], optional): The date, in UTC if it has no time zone. Defaults to None.
+
+        Raises:
+            ValueError: If both, or none, of `version` and `as_of` are given.
+            KeyError: If there is no such version.
+
+        Returns:
+            BlobVersion: The version.
+        """
+        if (version is None) == (as_of is None):
+            raise ValueError("Exactly one of 'version' and 'as_of' must be given.")
+        found: List[BlobVersion] = []
+        if version is not None:
+            found = [
+                blob_version
+                for blob_version in self.versions
+                if blob_version.version == version
+            ]
+        elif as_of is not None:
+            if as_of.tzinfo is None:
+                as_of = as_of.replace(tzinfo=timezone.utc)
+            found = [
+                blob_version
+                for blob_version in self.versions
+                if blob_version.created_at <= as_of
+            ]
+        if not found:
+            raise KeyError(
+                f"No version {version if version is not None else f'as of {as_of}'}.",
+            )
+        return found[-1]
+
+    @property
+    def next_version(self) -> int:
+        return self.versions[-1].version + 1 if self.versions else 1
+
+
+def versions_path(blob_path: str) -> str:
+    """Get the path of the version index of a blob.
+
+    Args:
+        blob_path (str): The path of the blob.
+
+    Returns:
+        str: The path of its version index, next to it.
+    """
+    return f"{blob_path}{VERSIONS_SUFFIX}"
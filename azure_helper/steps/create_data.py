@@ -1,6 +1,9 @@
+from typing import List
+
 import pandas as pd
 
 from azure_helper.interfaces.blob_storage_interface import BlobStorageInterface
+from azure_helper.interfaces.blob_transfer import UploadResult
 
 
 class CreateData:
@@ -13,6 +16,9 @@ class CreateData:
         """This class is just a wrapper around the [BlobStorageInterface][azure_helper.utils.blob_storage_interface] and
         might disappear, as it is not really needed.
 
+        Existing blobs are overwritten in a single request, and not uploaded again if they already contain the same
+        datas, so re-running it on unchanged datas does not transfer anything.
+
         Args:
             project_name (str): _description_
             train_datastore (str, optional): _description_. Defaults to "train".
@@ -27,72 +33,96 @@ class CreateData:
         blob_storage_interface: BlobStorageInterface,
         x_train: pd.DataFrame,
         y_train: pd.DataFrame,
-    ):
+    ) -> List[UploadResult]:
         """Upload datas to the training blob storage.
 
         Args:
             blob_storage_interface (BlobStorageInterface): The interface with your storage account.
             x_train (pd.DataFrame): Train datas.
             y_train (pd.DataFrame): Train datas.
+
+        Returns:
+            List[UploadResult]: The number of bytes sent, and skipped, for each dataframe.
         """
-        blob_storage_interface.upload_df_to_blob(
+        x_result = blob_storage_interface.upload_df_to_blob(
             dataframe=x_train,
             container_name=f"{self.project_name}",
             blob_path=f"{self.train_datastore}/X_train.csv",
+            overwrite=True,
+            skip_unchanged=True,
         )
-        blob_storage_interface.upload_df_to_blob(
+        y_result = blob_storage_interface.upload_df_to_blob(
             dataframe=y_train,
             container_name=f"{self.project_name}",
             blob_path=f"{self.train_datastore}/y_train.csv",
+            overwrite=True,
+            skip_unchanged=True,
         )
+        return [x_result, y_result]
 
     def upload_validation_data(
         self,
         blob_storage_interface: BlobStorageInterface,
         x_valid: pd.DataFrame,
         y_valid: pd.DataFrame,
-    ):
+    ) -> List[UploadResult]:
         """Upload datas to the validation blob storage.
 
         Args:
             blob_storage_interface (BlobStorageInterface): The interface with your storage account.
             x_valid (pd.DataFrame): Validation datas.
             y_valid (pd.DataFrame): Validation datas.
+
+        Returns:
+            List[UploadResult]: The number of bytes sent, and skipped, for each dataframe.
         """
         # Data to be used during model validation
-        blob_storage_interface.upload_df_to_blob(
+        x_result = blob_storage_interface.upload_df_to_blob(
             dataframe=x_valid,
             container_name=f"{self.project_name}",
             blob_path=f"{self.train_datastore}/X_valid.csv",
+            overwrite=True,
+            skip_unchanged=True,
         )
-        blob_storage_interface.upload_df_to_blob(
+        y_result = blob_storage_interface.upload_df_to_blob(
             dataframe=y_valid,
             container_name=f"{self.project_name}",
             blob_path=f"{self.train_datastore}/y_valid.csv",
+            overwrite=True,
+            skip_unchanged=True,
         )
+        return [x_result, y_result]
 
     def upload_test_data(
         self,
         blob_storage_interface: BlobStorageInterface,
         x_test: pd.DataFrame,
         y_test: pd.DataFrame,
-    ):
+    ) -> List[UploadResult]:
         """Upload datas to the test blob storage.
 
         Args:
             blob_storage_interface (BlobStorageInterface): The interface with your storage account.
             x_test (pd.DataFrame): Test datas.
             y_test (pd.DataFrame): Test datas.
+
+        Returns:
+            List[UploadResult]: The number of bytes sent, and skipped, for each dataframe.
         """
         # Data to be used during model evaluation
         # So stored in the training container
-        blob_storage_interface.upload_df_to_blob(
+        x_result = blob_storage_interface.upload_df_to_blob(
             dataframe=x_test,
             container_name=f"{self.project_name}",
             blob_path=f"{self.test_datastore}/X_test.csv",
+            overwrite=True,
+            skip_unchanged=True,
         )
-        blob_storage_interface.upload_df_to_blob(
+        y_result = blob_storage_interface.upload_df_to_blob(
             dataframe=y_test,
             container_name=f"{self.project_name}",
             blob_path=f"{self.test_datastore}/y_test.csv",
+            overwrite=True,
+            skip_unchanged=True,
         )
+        return [x_result, y_result]
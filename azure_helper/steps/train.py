@@ -127,7 +127,8 @@ class TrainingLoopExample(Train):
             The fetched datas as a dataframe.
         """
         # In our example we only have single files,
-        # but these may be daily data dumps
+        # but these may be daily data dumps, see
+        # BlobStorageInterface.append_df and BlobStorageInterface.read_partitions
         log.info(f"Loading dataset {datastore_path} from datastore {datastore.name}")
         datastore_cfg = [(datastore, datastore_path)]
         dataset = Dataset.Tabular.from_delimited_files(
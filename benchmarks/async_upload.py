@@ -0,0 +1,79 @@
+"""Many small uploads with asyncio vs a thread pool, against a local Azurite emulator.
+
+Start Azurite first (see `benchmarks/upload_concurrency.py`), then run
+`python benchmarks/async_upload.py`.
+"""
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from azure.storage.blob.aio import BlobServiceClient
+from upload_concurrency import (
+    AZURITE_ACCT_KEY,
+    AZURITE_ACCT_NAME,
+    AZURITE_CONN_STR,
+    CONTAINER_NAME,
+    azurite_interface,
+)
+
+from azure_helper.interfaces.async_blob_storage_interface import (
+    AsyncBlobStorageInterface,
+)
+
+N_FILES = 1000
+FILE_SIZE = 64 * 1024
+THREAD_POOL_SIZES = (8, 32, 64)
+
+
+def thread_pool_upload(payload: bytes, max_workers: int) -> float:
+    blob_storage_interface = azurite_interface()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                blob_storage_interface.upload_to_blob,
+                payload,
+                CONTAINER_NAME,
+                f"async_upload/threads/{idx}.bin",
+                overwrite=True,
+            )
+            for idx in range(N_FILES)
+        ]
+        for future in futures:
+            future.result()
+    return time.perf_counter() - start
+
+
+async def async_upload(payload: bytes) -> float:
+    blob_storage_interface = AsyncBlobStorageInterface(
+        AZURITE_ACCT_NAME,
+        AZURITE_ACCT_KEY,
+    )
+    blob_storage_interface.blob_service_client = (
+        BlobServiceClient.from_connection_string(AZURITE_CONN_STR)
+    )
+    async with blob_storage_interface:
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                blob_storage_interface.upload_to_blob(
+                    payload,
+                    CONTAINER_NAME,
+                    f"async_upload/asyncio/{idx}.bin",
+                    overwrite=True,
+                )
+                for idx in range(N_FILES)
+            ),
+        )
+        return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    payload = os.urandom(FILE_SIZE)
+    print(f"{N_FILES} uploads of {FILE_SIZE // 1024} KiB")
+    for max_workers in THREAD_POOL_SIZES:
+        elapsed = thread_pool_upload(payload, max_workers)
+        print(f"    thread pool ({max_workers:>2} workers) : {elapsed:6.2f}s")
+    elapsed = asyncio.run(async_upload(payload))
+    print(f"    asyncio.gather            : {elapsed:6.2f}s")
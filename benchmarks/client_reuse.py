@@ -0,0 +1,59 @@
+"""Time to first byte with a new client per request vs a shared pooled client, against a local Azurite emulator.
+
+Start Azurite first (see `benchmarks/upload_concurrency.py`), then run
+`python benchmarks/client_reuse.py`.
+"""
+import statistics
+import time
+
+from azure.storage.blob import BlobServiceClient
+from upload_concurrency import AZURITE_CONN_STR, CONTAINER_NAME, azurite_interface
+
+from azure_helper.interfaces.blob_clients import get_blob_service_client
+
+N_REQUESTS = 500
+BLOB_PATH = "client_reuse/small.bin"
+
+
+def time_to_first_byte(make_client) -> float:
+    start = time.perf_counter()
+    blob_client = make_client().get_blob_client(
+        container=CONTAINER_NAME,
+        blob=BLOB_PATH,
+    )
+    next(blob_client.download_blob().chunks())
+    return time.perf_counter() - start
+
+
+def report(name: str, timings):
+    timings = sorted(timings)
+    print(
+        f"{name:<24} : p50 {statistics.median(timings) * 1000:6.2f}ms, "
+        + f"p95 {timings[int(len(timings) * 0.95)] * 1000:6.2f}ms",
+    )
+
+
+if __name__ == "__main__":
+    azurite_interface().upload_to_blob(
+        dataset=b"0" * 1024,
+        container_name=CONTAINER_NAME,
+        blob_path=BLOB_PATH,
+        overwrite=True,
+    )
+
+    report(
+        "new client per request",
+        [
+            time_to_first_byte(
+                lambda: BlobServiceClient.from_connection_string(AZURITE_CONN_STR),
+            )
+            for _ in range(N_REQUESTS)
+        ],
+    )
+    report(
+        "shared pooled client",
+        [
+            time_to_first_byte(lambda: get_blob_service_client(AZURITE_CONN_STR))
+            for _ in range(N_REQUESTS)
+        ],
+    )
@@ -0,0 +1,71 @@
+"""Wall-clock crossover points of compressed uploads, by payload size, codec and level.
+
+The compression time is measured locally, the transfer time is modelled from a set of link bandwidths :
+`python benchmarks/compression.py`.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from azure_helper.interfaces.blob_compression import iter_compressed
+from azure_helper.interfaces.blob_transfer import DEFAULT_BLOCK_SIZE
+
+PAYLOAD_SIZES = (1024**2, 16 * 1024**2, 128 * 1024**2)
+CODECS = (("gzip", 1), ("gzip", 6), ("zstd", 1), ("zstd", 3), ("zstd", 9))
+BANDWIDTHS = {"100 Mbit/s": 100e6 / 8, "1 Gbit/s": 1e9 / 8, "10 Gbit/s": 10e9 / 8}
+
+
+def make_csv(size: int) -> bytes:
+    rng = np.random.default_rng(seed=42)
+    n_rows = size // 20
+    dataframe = pd.DataFrame(
+        {
+            "id": np.arange(n_rows),
+            "category": rng.choice(["train", "test", "valid"], n_rows),
+            "value": rng.standard_normal(n_rows).round(4),
+            "count": rng.integers(0, 1000, n_rows),
+        },
+    )
+    return dataframe.to_csv(index=False).encode()[:size]
+
+
+def compress(payload: bytes, content_encoding: str, level: int) -> int:
+    blocks = (
+        payload[idx : idx + DEFAULT_BLOCK_SIZE]
+        for idx in range(0, len(payload), DEFAULT_BLOCK_SIZE)
+    )
+    return sum(
+        len(block)
+        for block in iter_compressed(
+            blocks,
+            content_encoding,
+            DEFAULT_BLOCK_SIZE,
+            level,
+        )
+    )
+
+
+if __name__ == "__main__":
+    for payload_size in PAYLOAD_SIZES:
+        payload = make_csv(payload_size)
+        print(f"{len(payload) / 1024**2:.0f} MiB csv")
+        print(
+            "    {:<12}".format("raw")
+            + "".join(
+                f"{name} {len(payload) / bandwidth:7.2f}s  "
+                for name, bandwidth in BANDWIDTHS.items()
+            ),
+        )
+        for content_encoding, level in CODECS:
+            start = time.perf_counter()
+            compressed_size = compress(payload, content_encoding, level)
+            compress_time = time.perf_counter() - start
+            print(
+                f"    {content_encoding}-{level:<7}"
+                + "".join(
+                    f"{name} {compress_time + compressed_size / bandwidth:7.2f}s  "
+                    for name, bandwidth in BANDWIDTHS.items()
+                )
+                + f"(ratio {len(payload) / compressed_size:4.1f}x)",
+            )
@@ -0,0 +1,46 @@
+"""Parse throughput of a csv file with pandas vs pyarrow, by number of cores.
+
+Runs locally, without any storage account : `python benchmarks/csv_engines.py`.
+"""
+import os
+import time
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pyarrow
+
+from azure_helper.interfaces.blob_formats import deserialize_df
+
+N_ROWS = 2_000_000
+N_COLS = 20
+
+
+def make_payload() -> bytes:
+    rng = np.random.default_rng(seed=42)
+    dataframe = pd.DataFrame(
+        rng.standard_normal((N_ROWS, N_COLS)),
+        columns=[f"col_{idx}" for idx in range(N_COLS)],
+    )
+    return dataframe.to_csv(index=False).encode()
+
+
+def throughput(payload: bytes, engine: str) -> float:
+    start = time.perf_counter()
+    deserialize_df(BytesIO(payload), "csv", engine=engine)
+    return len(payload) / (time.perf_counter() - start) / 1024**2
+
+
+if __name__ == "__main__":
+    payload = make_payload()
+    print(f"{len(payload) / 1024**2:.0f} MiB csv file")
+    print(f"pandas            : {throughput(payload, 'pandas'):7.1f} MiB/s")
+
+    n_cores = os.cpu_count() or 1
+    for cpu_count in sorted({1, 2, 4, 8, 16, 32, n_cores}):
+        if cpu_count > n_cores:
+            continue
+        pyarrow.set_cpu_count(cpu_count)
+        print(
+            f"pyarrow, {cpu_count:>2} cores : {throughput(payload, 'pyarrow'):7.1f} MiB/s",
+        )
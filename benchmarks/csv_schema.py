@@ -0,0 +1,70 @@
+"""Parsing of a csv file with inferred dtypes vs the dtypes of its schema sidecar.
+
+Runs locally, without any storage account : `python benchmarks/csv_schema.py`.
+
+The schema read is not faster than inference, which leaves the dates as strings and drops the leading zeros of the
+ids : it measures the cost of getting the dtypes back, with and without exact floats.
+"""
+import time
+import tracemalloc
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from azure_helper.interfaces.blob_formats import deserialize_df
+from azure_helper.interfaces.blob_schema import (
+    format_datetimes,
+    make_schema,
+    read_csv_with_schema,
+)
+
+N_ROWS = 1_000_000
+
+
+def make_frame(n_rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed=42)
+    return pd.DataFrame(
+        {
+            "customer_id": [f"{idx:08d}" for idx in rng.integers(0, 10**8, n_rows)],
+            "amount": rng.standard_normal(n_rows),
+            "quantity": rng.integers(0, 100, n_rows).astype("int16"),
+            "country": pd.Categorical(rng.choice(["FR", "DE", "IT", "ES"], n_rows)),
+            "day": pd.Timestamp("2022-01-01")
+            + pd.to_timedelta(rng.integers(0, 365, n_rows), unit="D"),
+        },
+    )
+
+
+def measure(parse):
+    start = time.perf_counter()
+    dataframe = parse()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024**2, dataframe
+
+
+if __name__ == "__main__":
+    dataframe = make_frame(N_ROWS)
+    schema = make_schema(dataframe)
+    payload = format_datetimes(dataframe, schema).to_csv(index=False).encode()
+
+    for name, parse in (
+        ("inferred dtypes", lambda: deserialize_df(BytesIO(payload), "csv")),
+        ("schema sidecar", lambda: read_csv_with_schema(BytesIO(payload), schema)),
+        (
+            "exact floats",
+            lambda: read_csv_with_schema(BytesIO(payload), schema, exact_floats=True),
+        ),
+    ):
+        elapsed, peak, output = measure(parse)
+        size = output.memory_usage(deep=True).sum() / 1024**2
+        lossless = output.dtypes.equals(dataframe.dtypes) and output.equals(dataframe)
+        print(
+            f"{name:<16} : {elapsed:6.2f}s, peak {peak:7.1f} MiB, "
+            + f"dataframe {size:6.1f} MiB, lossless {lossless}",
+        )
@@ -0,0 +1,46 @@
+"""Serialization and deserialization of dataframes as csv and parquet.
+
+Runs locally, without any storage account : `python benchmarks/df_formats.py`.
+"""
+import time
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from azure_helper.interfaces.blob_formats import deserialize_df, serialize_df
+
+FRAMES = {
+    "wide (10k rows x 1000 cols)": (10_000, 1_000),
+    "long (5M rows x 10 cols)": (5_000_000, 10),
+}
+FORMATS = (("csv", None), ("parquet", "snappy"), ("parquet", "zstd"))
+
+
+def make_frame(n_rows: int, n_cols: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed=42)
+    return pd.DataFrame(
+        rng.standard_normal((n_rows, n_cols)),
+        columns=[f"col_{idx}" for idx in range(n_cols)],
+    )
+
+
+if __name__ == "__main__":
+    for frame_name, shape in FRAMES.items():
+        dataframe = make_frame(*shape)
+        print(frame_name)
+        for file_format, compression in FORMATS:
+            start = time.perf_counter()
+            payload = serialize_df(dataframe, file_format, compression)
+            serialize_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            deserialize_df(BytesIO(payload), file_format)
+            deserialize_time = time.perf_counter() - start
+
+            print(
+                f"    {file_format:<8} {str(compression):<7}: "
+                + f"{len(payload) / 1024**2:8.1f} MiB, "
+                + f"serialize {serialize_time:6.2f}s, "
+                + f"deserialize {deserialize_time:6.2f}s",
+            )
@@ -0,0 +1,61 @@
+"""Peak memory of full vs streaming downloads against a local Azurite emulator.
+
+Start Azurite first (see `benchmarks/upload_concurrency.py`), then run
+`python benchmarks/download_memory.py`.
+
+Each read runs in a fresh process, and its peak is the growth of the peak resident set size (RSS) of that process
+during the read, so the native buffers of the Azure SDK and of the parsers are counted too.
+"""
+import multiprocessing
+import resource
+
+from upload_concurrency import CONTAINER_NAME, azurite_interface
+
+BLOB_SIZES = (64 * 1024**2, 256 * 1024**2, 1024**3)
+LINE = b"0123456789," * 9 + b"\n"
+READ_SIZE = 1024**2
+
+
+def max_rss() -> float:
+    # ru_maxrss is in KiB on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def read_blob(blob_path: str, streaming: bool) -> float:
+    blob_storage_interface = azurite_interface()
+    rss_before = max_rss()
+    if streaming:
+        reader = blob_storage_interface.stream_from_blob(CONTAINER_NAME, blob_path)
+        while reader.read(READ_SIZE):
+            pass
+    else:
+        blob_storage_interface.download_from_blob(CONTAINER_NAME, blob_path)
+    return max_rss() - rss_before
+
+
+def peak_memory(pool, blob_path: str, streaming: bool) -> float:
+    return pool.apply(read_blob, (blob_path, streaming))
+
+
+if __name__ == "__main__":
+    blob_storage_interface = azurite_interface()
+    context = multiprocessing.get_context("spawn")
+
+    for blob_size in BLOB_SIZES:
+        blob_path = f"download_memory/{blob_size}.csv"
+        blob_storage_interface.upload_to_blob(
+            dataset=LINE * (blob_size // len(LINE)),
+            container_name=CONTAINER_NAME,
+            blob_path=blob_path,
+            max_concurrency=8,
+        )
+        # a new process per read, as the peak RSS of a process never goes down.
+        with context.Pool(1, maxtasksperchild=1) as pool:
+            full_peak = peak_memory(pool, blob_path, streaming=False)
+        with context.Pool(1, maxtasksperchild=1) as pool:
+            stream_peak = peak_memory(pool, blob_path, streaming=True)
+        print(
+            f"{blob_size / 1024**2:6.0f} MiB blob : "
+            + f"download_from_blob peak RSS {full_peak:8.1f} MiB, "
+            + f"stream_from_blob peak RSS {stream_peak:6.1f} MiB",
+        )
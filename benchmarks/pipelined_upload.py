@@ -0,0 +1,68 @@
+"""Sequential vs pipelined uploads of many dataframes, against a local Azurite emulator.
+
+Start Azurite first (see `benchmarks/upload_concurrency.py`), then run
+`python benchmarks/pipelined_upload.py`.
+"""
+import time
+
+import numpy as np
+import pandas as pd
+from upload_concurrency import CONTAINER_NAME, azurite_interface
+
+from azure_helper.interfaces.blob_formats import serialize_df
+
+N_FRAMES = 16
+SHAPE = (500_000, 10)
+
+
+def make_frames():
+    rng = np.random.default_rng(seed=42)
+    return [
+        (
+            pd.DataFrame(
+                rng.standard_normal(SHAPE),
+                columns=[f"col_{idx}" for idx in range(SHAPE[1])],
+            ),
+            f"pipelined_upload/part-{idx}.csv",
+        )
+        for idx in range(N_FRAMES)
+    ]
+
+
+if __name__ == "__main__":
+    blob_storage_interface = azurite_interface()
+    frames = make_frames()
+
+    start = time.perf_counter()
+    payloads = [
+        (serialize_df(dataframe, "csv"), blob_path) for dataframe, blob_path in frames
+    ]
+    serialize_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    blob_storage_interface.upload_many(
+        payloads,
+        CONTAINER_NAME,
+        max_workers=4,
+        skip_unchanged=False,
+    )
+    transfer_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for dataframe, blob_path in frames:
+        blob_storage_interface.upload_df_to_blob(
+            dataframe,
+            CONTAINER_NAME,
+            blob_path,
+            overwrite=True,
+        )
+    sequential_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    blob_storage_interface.upload_dfs(frames, CONTAINER_NAME, skip_unchanged=False)
+    pipelined_time = time.perf_counter() - start
+
+    print(f"serialization only : {serialize_time:6.2f}s")
+    print(f"transfer only      : {transfer_time:6.2f}s")
+    print(f"sequential         : {sequential_time:6.2f}s")
+    print(f"pipelined          : {pipelined_time:6.2f}s")
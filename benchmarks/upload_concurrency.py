@@ -0,0 +1,58 @@
+"""Throughput of chunked uploads against a local Azurite emulator.
+
+Start Azurite first, eg with docker :
+
+```sh
+docker run -p 10000:10000 mcr.microsoft.com/azure-storage/azurite azurite-blob --blobHost 0.0.0.0
+```
+
+Then run `python benchmarks/upload_concurrency.py`.
+"""
+import os
+import time
+
+from azure.storage.blob import BlobServiceClient
+
+from azure_helper.interfaces.blob_storage_interface import BlobStorageInterface
+
+AZURITE_ACCT_NAME = "devstoreaccount1"
+AZURITE_ACCT_KEY = "Eby8vdM02xNOcqFlqUwJPLlmEtlCDXJ1OUzFT50uSRZ6IFsuFq2UVErCz4I6tq/K1SZFPTOtr/KBHBeksoGMGw=="
+AZURITE_CONN_STR = (
+    "DefaultEndpointsProtocol=http;"
+    + f"AccountName={AZURITE_ACCT_NAME};"
+    + f"AccountKey={AZURITE_ACCT_KEY};"
+    + f"BlobEndpoint=http://127.0.0.1:10000/{AZURITE_ACCT_NAME};"
+)
+
+CONTAINER_NAME = "benchmarks"
+PAYLOAD_SIZE = 512 * 1024 * 1024
+BLOCK_SIZE = 8 * 1024 * 1024
+WORKERS = (1, 4, 8, 16)
+
+
+def azurite_interface() -> BlobStorageInterface:
+    blob_storage_interface = BlobStorageInterface(AZURITE_ACCT_NAME, AZURITE_ACCT_KEY)
+    blob_storage_interface.blob_service_client = (
+        BlobServiceClient.from_connection_string(AZURITE_CONN_STR)
+    )
+    return blob_storage_interface
+
+
+if __name__ == "__main__":
+    blob_storage_interface = azurite_interface()
+    payload = os.urandom(PAYLOAD_SIZE)
+
+    for max_concurrency in WORKERS:
+        start = time.perf_counter()
+        blob_storage_interface.upload_to_blob(
+            dataset=payload,
+            container_name=CONTAINER_NAME,
+            blob_path=f"upload_concurrency/{max_concurrency}.bin",
+            block_size=BLOCK_SIZE,
+            max_concurrency=max_concurrency,
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"{max_concurrency:>2} workers : {elapsed:6.2f}s, "
+            + f"{PAYLOAD_SIZE / elapsed / 1024**2:8.1f} MiB/s",
+        )
@@ -0,0 +1,156 @@
+import asyncio
+import gzip
+import hashlib
+from unittest.mock import AsyncMock, Mock
+
+import pandas as pd
+from azure.core.exceptions import ResourceExistsError
+from pytest import fixture
+
+from azure_helper.interfaces.async_blob_storage_interface import (
+    AsyncBlobStorageInterface,
+)
+
+test_module = "azure_helper.interfaces.async_blob_storage_interface"
+
+
+@fixture
+def async_blob_storage_resources(mocker):
+    blob_service_client_obj = Mock()
+    blob_service_client_obj.create_container = AsyncMock()
+    blob_service_client_obj.close = AsyncMock()
+
+    mock_blob_service_client = mocker.patch(f"{test_module}.BlobServiceClient")
+    mock_blob_service_client.from_connection_string.return_value = (
+        blob_service_client_obj
+    )
+
+    blob_storage_interface = AsyncBlobStorageInterface(
+        "test_storage_acct_name",
+        "test_storage_acct_key",
+    )
+
+    return mock_blob_service_client, blob_service_client_obj, blob_storage_interface
+
+
+class TestAsyncBlobStorageInterface:
+    def test_init(self, async_blob_storage_resources):
+
+        mock_blob_service_client, _, _ = async_blob_storage_resources
+
+        mock_blob_service_client.from_connection_string.assert_called_once_with(
+            "DefaultEndpointsProtocol=https;"
+            + "AccountName=test_storage_acct_name;"
+            + "AccountKey=test_storage_acct_key;"
+            + "EndpointSuffix=core.windows.net",
+        )
+
+    def test_upload_df_to_blob(self, async_blob_storage_resources, mocker):
+
+        (
+            _,
+            blob_service_client_obj,
+            blob_storage_interface,
+        ) = async_blob_storage_resources
+
+        uploads = iter([None, ResourceExistsError, None])
+
+        def upload_blob(stream, length, **kwargs):
+            assert len(stream.read()) == length
+            error = next(uploads)
+            if error is not None:
+                raise error
+
+        mock_blob_client = Mock()
+        mock_blob_client.upload_blob = AsyncMock(side_effect=upload_blob)
+        mock_blob_client.delete_blob = AsyncMock()
+        mock_blob_client.set_http_headers = AsyncMock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+        source_md5 = mocker.patch(f"{test_module}.source_md5")
+
+        test_df = pd.DataFrame([{"a": 1, "b": 2}, {"a": 3, "b": 4}])
+
+        async def upload_twice():
+            async with blob_storage_interface:
+                return await asyncio.gather(
+                    blob_storage_interface.upload_df_to_blob(
+                        test_df,
+                        "test_container_name",
+                        "test_remote_path",
+                    ),
+                    blob_storage_interface.upload_df_to_blob(
+                        test_df,
+                        "test_container_name",
+                        "test_remote_path",
+                    ),
+                )
+
+        results = asyncio.run(upload_twice())
+
+        assert [result.bytes_sent for result in results] == [12, 12]
+        # The existing blob is overwritten, never deleted.
+        mock_blob_client.delete_blob.assert_not_awaited()
+        assert mock_blob_client.upload_blob.await_count == 3
+        assert mock_blob_client.upload_blob.await_args.kwargs["overwrite"] is True
+        # Without skip_unchanged, the datas are hashed while they are sent, not read beforehand.
+        source_md5.assert_not_called()
+        (content_settings,), _ = mock_blob_client.set_http_headers.await_args
+        assert (
+            bytes(content_settings.content_md5)
+            == hashlib.md5(
+                test_df.to_csv(index=False).encode(),
+            ).digest()
+        )
+        blob_service_client_obj.close.assert_awaited_once()
+
+    def test_download_blob_to_df(self, async_blob_storage_resources):
+
+        (
+            _,
+            blob_service_client_obj,
+            blob_storage_interface,
+        ) = async_blob_storage_resources
+
+        mock_blob_client = Mock()
+        mock_stream = Mock()
+        mock_stream.readall = AsyncMock(return_value=b"a,b\n1,2\n3,4")
+        mock_blob_client.download_blob = AsyncMock(return_value=mock_stream)
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+
+        output_df = asyncio.run(
+            blob_storage_interface.download_blob_to_df(
+                "test_container_name",
+                "test_remote_path",
+            ),
+        )
+
+        assert output_df.loc[1, "b"] == 4
+        blob_service_client_obj.get_blob_client.assert_called_once_with(
+            container="test_container_name",
+            blob="test_remote_path",
+        )
+
+    def test_download_from_blob_gzip(self, async_blob_storage_resources):
+
+        (
+            _,
+            blob_service_client_obj,
+            blob_storage_interface,
+        ) = async_blob_storage_resources
+
+        mock_blob_client = Mock()
+        mock_stream = Mock()
+        mock_stream.readall = AsyncMock(return_value=gzip.compress(b"a,b\n1,2\n"))
+        mock_stream.properties.content_settings.content_encoding = "gzip"
+        mock_blob_client.download_blob = AsyncMock(return_value=mock_stream)
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+
+        buffer = asyncio.run(
+            blob_storage_interface.download_from_blob(
+                "test_container_name",
+                "test_remote_path",
+            ),
+        )
+
+        assert buffer.getvalue() == "a,b\n1,2\n"
+        mock_blob_client.download_blob.assert_awaited_once_with(decompress=False)
@@ -0,0 +1,90 @@
+from unittest.mock import Mock
+
+from pytest import raises
+
+from azure_helper.interfaces.blob_bandwidth import (
+    BandwidthLimiter,
+    ProgressTracker,
+    throttled,
+)
+from azure_helper.interfaces.blob_transfer import BlobRangeReader, stage_blocks
+
+test_module = "azure_helper.interfaces.blob_bandwidth"
+
+
+def test_token_bucket(mocker):
+    clock = Mock(return_value=100.0)
+    mocker.patch(f"{test_module}.time.monotonic", clock)
+    sleep = mocker.patch(f"{test_module}.time.sleep")
+
+    limiter = BandwidthLimiter(bytes_per_s=1000, burst=500)
+
+    # The burst goes through at once.
+    limiter.consume(500)
+    sleep.assert_not_called()
+
+    # Then each block waits for the bucket to refill, whoever sends it.
+    limiter.consume(250)
+    sleep.assert_called_once_with(0.25)
+    limiter.consume(250)
+    assert sleep.call_args[0][0] == 0.5
+
+    # The bucket refills with time, up to the burst.
+    clock.return_value = 110.0
+    sleep.reset_mock()
+    limiter.consume(500)
+    sleep.assert_not_called()
+
+    with raises(ValueError):
+        BandwidthLimiter(bytes_per_s=0)
+
+
+def test_progress():
+    reports = []
+    tracker = ProgressTracker(reports.append, total_bytes=30)
+
+    tracker.update(10)
+    tracker.update(20)
+
+    assert [report.bytes_done for report in reports] == [10, 30]
+    assert reports[0].eta > 0
+    assert reports[-1].eta == 0
+    assert reports[-1].bytes_per_s > 0
+
+
+def test_stage_blocks_bandwidth():
+    blob_client = Mock()
+    limiter = Mock()
+    staged = []
+
+    block_list = stage_blocks(
+        blob_client,
+        [b"1234", b"56"],
+        max_concurrency=2,
+        on_staged=lambda block_id, size: staged.append(size),
+        bandwidth_limiter=limiter,
+    )
+
+    assert [block.size for block in block_list] == [4, 2]
+    assert sorted(call[0][0] for call in limiter.consume.call_args_list) == [2, 4]
+    assert sorted(staged) == [2, 4]
+
+
+def test_throttled():
+    limiter = Mock()
+
+    chunks = list(throttled([b"a" * 10, b"b" * 20], limiter))
+
+    assert chunks == [b"a" * 10, b"b" * 20]
+    assert [call[0][0] for call in limiter.consume.call_args_list] == [10, 20]
+
+
+def test_range_reader_bandwidth():
+    blob_client = Mock()
+    blob_client.download_blob.return_value.readall.return_value = b"0123"
+    limiter = Mock()
+
+    range_reader = BlobRangeReader(blob_client, size=4, bandwidth_limiter=limiter)
+
+    assert range_reader.read(10) == b"0123"
+    limiter.consume.assert_called_once_with(4)
@@ -0,0 +1,91 @@
+import os
+from unittest.mock import patch
+
+from azure_helper.interfaces.blob_cache import BlobCache
+
+
+class TestBlobCache:
+    def test_open(self, tmp_path):
+
+        blob_cache = BlobCache(tmp_path)
+        downloads = []
+
+        def download(file_obj):
+            downloads.append(file_obj)
+            file_obj.write(b"a,b\n1,2\n")
+
+        with blob_cache.open(
+            "acct/container/path.csv",
+            '"etag-1"',
+            download,
+        ) as file_obj:
+            assert file_obj.read() == b"a,b\n1,2\n"
+        with blob_cache.open(
+            "acct/container/path.csv",
+            '"etag-1"',
+            download,
+        ) as file_obj:
+            assert file_obj.read() == b"a,b\n1,2\n"
+
+        # The second read is served from the disk.
+        assert len(downloads) == 1
+        assert blob_cache.stats.hits == 1
+        assert blob_cache.stats.misses == 1
+        assert blob_cache.stats.hit_rate == 0.5
+
+        # A new ETag means a new version of the blob, which replaces the old one.
+        with blob_cache.open("acct/container/path.csv", '"etag-2"', download):
+            pass
+        assert len(downloads) == 2
+        assert len(list(tmp_path.iterdir())) == 1
+
+    def test_evict(self, tmp_path):
+
+        blob_cache = BlobCache(tmp_path, max_bytes=20)
+
+        def download(file_obj):
+            file_obj.write(b"0123456789")
+
+        for idx in range(2):
+            with blob_cache.open(f"acct/container/{idx}", "etag", download):
+                pass
+            # Make the access times distinct.
+            newest = max(tmp_path.iterdir(), key=os.path.getmtime)
+            os.utime(newest, (idx, idx))
+
+        # Reading blob 0 makes blob 1 the least recently used, evicted by blob 2.
+        with blob_cache.open("acct/container/0", "etag", download):
+            pass
+        with blob_cache.open("acct/container/2", "etag", download):
+            pass
+        assert sum(path.stat().st_size for path in tmp_path.iterdir()) == 20
+
+        with blob_cache.open("acct/container/0", "etag", download):
+            pass
+        assert blob_cache.stats.hits == 2
+        with blob_cache.open("acct/container/1", "etag", download):
+            pass
+        assert blob_cache.stats.misses == 4
+
+    def test_open_evicted(self, tmp_path):
+
+        blob_cache = BlobCache(tmp_path)
+        downloads = []
+
+        def download(file_obj):
+            downloads.append(file_obj)
+            file_obj.write(b"0123456789")
+
+        with blob_cache.open("acct/container/path", "etag", download):
+            pass
+
+        # Another process evicts the file between its opening and the update of its access time.
+        with patch(
+            "azure_helper.interfaces.blob_cache.os.utime",
+            side_effect=FileNotFoundError,
+        ):
+            with blob_cache.open("acct/container/path", "etag", download) as file_obj:
+                assert file_obj.read() == b"0123456789"
+        assert len(downloads) == 2
+        assert blob_cache.stats.hits == 0
+        assert blob_cache.stats.misses == 2
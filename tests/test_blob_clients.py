@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import fixture
+
+from azure_helper.interfaces.blob_clients import (
+    TransportOptions,
+    clear_blob_service_clients,
+    get_blob_service_client,
+    make_session,
+)
+from azure_helper.interfaces.blob_storage_interface import BlobStorageInterface
+
+test_module = "azure_helper.interfaces.blob_clients"
+
+
+@fixture
+def mock_blob_service_client(mocker):
+    mock_blob_service_client = mocker.patch(f"{test_module}.BlobServiceClient")
+    mock_blob_service_client.from_connection_string.side_effect = (
+        lambda *args, **kwargs: mocker.Mock()
+    )
+    yield mock_blob_service_client
+    clear_blob_service_clients()
+
+
+def test_make_session():
+    session = make_session(TransportOptions(pool_maxsize=64, keep_alive=False))
+
+    adapter = session.get_adapter("https://account.blob.core.windows.net")
+    assert adapter._pool_maxsize == 64
+    assert adapter.max_retries.total is False
+    assert session.headers["Connection"] == "close"
+
+
+def test_get_blob_service_client(mock_blob_service_client):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        clients = list(
+            executor.map(lambda _: get_blob_service_client("conn_str"), range(32)),
+        )
+
+    # A single client is created, whatever the number of threads asking for it.
+    assert all(client is clients[0] for client in clients)
+    mock_blob_service_client.from_connection_string.assert_called_once()
+    transport = mock_blob_service_client.from_connection_string.call_args.kwargs[
+        "transport"
+    ]
+    assert transport.connection_config.read_timeout == 60
+
+    assert get_blob_service_client("other_conn_str") is not clients[0]
+    assert (
+        get_blob_service_client("conn_str", TransportOptions(read_timeout=300))
+        is not clients[0]
+    )
+
+    clear_blob_service_clients()
+    clients[0].close.assert_called_once()
+    assert get_blob_service_client("conn_str") is not clients[0]
+
+
+def test_shared_client(mock_blob_service_client):
+    first = BlobStorageInterface(
+        "test_storage_acct_name",
+        "test_storage_acct_key",
+        shared_client=True,
+    )
+    second = BlobStorageInterface(
+        "test_storage_acct_name",
+        "test_storage_acct_key",
+        shared_client=True,
+    )
+
+    assert first.blob_service_client is second.blob_service_client
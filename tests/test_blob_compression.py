@@ -0,0 +1,24 @@
+import pytest
+
+from azure_helper.interfaces.blob_compression import iter_compressed, iter_decompressed
+
+
+@pytest.mark.parametrize("content_encoding", ["gzip", "zstd"])
+def test_compression_round_trip(content_encoding):
+    if content_encoding == "zstd":
+        pytest.importorskip("zstandard")
+
+    datas = b"a,b\n" + b"1,2\n" * 100000
+    blocks = [datas[idx : idx + 4096] for idx in range(0, len(datas), 4096)]
+
+    compressed = list(iter_compressed(blocks, content_encoding, block_size=256))
+
+    assert all(len(block) <= 256 for block in compressed)
+    assert sum(len(block) for block in compressed) < len(datas) / 10
+    assert b"".join(iter_decompressed(compressed, content_encoding)) == datas
+
+
+def test_unknown_encoding():
+    assert list(iter_decompressed([b"datas"], None)) == [b"datas"]
+    with pytest.raises(ValueError):
+        list(iter_compressed([b"datas"], "brotli", block_size=256))
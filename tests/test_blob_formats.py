@@ -0,0 +1,23 @@
+from io import BytesIO
+
+import pandas as pd
+from pytest import raises
+
+from azure_helper.interfaces.blob_formats import check_csv_engine, deserialize_df
+
+
+def test_check_csv_engine():
+    assert check_csv_engine("pyarrow") == "pyarrow"
+    with raises(ValueError):
+        check_csv_engine("polars")
+    with raises(ValueError):
+        deserialize_df(BytesIO(b"a\n1\n"), "csv", engine="polars")
+
+
+def test_csv_engines():
+    test_csv = b"a,b,c\n1,2.5,x\n3,4.5,y\n"
+
+    pandas_df = deserialize_df(BytesIO(test_csv), "csv", engine="pandas")
+    arrow_df = deserialize_df(BytesIO(test_csv), "csv", engine="pyarrow")
+
+    pd.testing.assert_frame_equal(arrow_df, pandas_df, check_dtype=False)
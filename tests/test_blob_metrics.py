@@ -0,0 +1,114 @@
+import json
+from unittest.mock import Mock
+
+from pytest import raises
+
+from azure_helper.interfaces.blob_metrics import BlobMetrics, iter_measured, measured
+from azure_helper.interfaces.blob_storage_interface import BlobStorageInterface
+
+test_module = "azure_helper.interfaces.blob_storage_interface"
+
+
+def test_snapshot():
+    metrics = BlobMetrics()
+    for idx in range(100):
+        metrics.record("upload", "container", elapsed=(idx + 1) / 100, size=10_000)
+    metrics.record("download", "container", elapsed=1, retries=2, error=True)
+
+    download, upload = metrics.snapshot()
+
+    assert (download.operation, download.errors, download.retries) == ("download", 1, 2)
+    assert upload.count == 100
+    assert upload.bytes == 1_000_000
+    assert (upload.p50, upload.p95, upload.p99) == (0.51, 0.96, 1.0)
+    assert round(upload.mb_per_s, 4) == round(1 / 50.5, 4)
+
+    metrics.reset()
+    assert metrics.snapshot() == []
+
+
+def test_measured():
+    metrics = BlobMetrics()
+
+    with measured(metrics, "upload", "container") as measurement:
+        measurement.request_kwargs["retry_hook"](retry_count=0, location_mode="primary")
+        measurement.size = 42
+    with raises(ValueError):
+        with measured(metrics, "upload", "container"):
+            raise ValueError
+
+    (stats,) = metrics.snapshot()
+    assert (stats.count, stats.errors, stats.retries, stats.bytes) == (2, 1, 1, 42)
+
+    with measured(None, "upload", "container") as measurement:
+        assert measurement.request_kwargs == {}
+
+
+def test_iter_measured():
+    metrics = BlobMetrics()
+    requests = []
+
+    def download(request_kwargs):
+        requests.append(request_kwargs)
+        yield from (b"012", b"345", b"678")
+
+    assert b"".join(iter_measured(metrics, "download", "container", download)) == (
+        b"012345678"
+    )
+    # A stream closed before its end is measured up to there, and is not an error.
+    chunks = iter_measured(metrics, "download", "container", download)
+    next(chunks)
+    chunks.close()
+
+    (stats,) = metrics.snapshot()
+    assert (stats.count, stats.errors, stats.bytes) == (2, 0, 12)
+    assert "retry_hook" in requests[0]
+
+
+def test_exports():
+    metrics = BlobMetrics()
+    metrics.record("upload", "container", elapsed=0.5, size=1000)
+
+    assert json.loads(metrics.to_json())[0]["bytes"] == 1000
+    prometheus = metrics.to_prometheus()
+    assert (
+        'azure_helper_blob_operation_seconds{operation="upload",container="container",quantile="0.99"} 0.5'
+        in prometheus
+    )
+    assert (
+        'azure_helper_blob_operation_bytes_total{operation="upload",container="container"} 1000'
+        in prometheus
+    )
+
+
+def test_interface_metrics(mocker):
+    mock_blob_service_client = mocker.patch(f"{test_module}.BlobServiceClient")
+    blob_service_client_obj = (
+        mock_blob_service_client.from_connection_string.return_value
+    )
+    mock_blob_client = Mock(container_name="test_container_name")
+    blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+    mock_blob_client.download_blob.return_value.readall.return_value = b"0123"
+
+    metrics = BlobMetrics()
+    blob_storage_interface = BlobStorageInterface(
+        "test_storage_acct_name",
+        "test_storage_acct_key",
+        metrics=metrics,
+    )
+    blob_storage_interface.upload_to_blob(
+        b"0123456789",
+        "test_container_name",
+        "test_remote_path",
+        overwrite=True,
+    )
+    blob_storage_interface.read_range("test_container_name", "test_remote_path", 0, 4)
+
+    read_range, upload = metrics.snapshot()
+    assert (upload.operation, upload.container, upload.bytes) == (
+        "upload",
+        "test_container_name",
+        10,
+    )
+    assert (read_range.operation, read_range.bytes) == ("read_range", 4)
+    assert "retry_hook" in mock_blob_client.upload_blob.call_args.kwargs
@@ -0,0 +1,85 @@
+import json
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from azure_helper.interfaces.blob_schema import (
+    dumps_schema,
+    format_datetimes,
+    make_schema,
+    read_csv_with_schema,
+    schema_path,
+)
+
+
+def make_df():
+    return pd.DataFrame(
+        {
+            "id": ["007", "012", "999"],
+            # Empty strings and strings like NA are not nulls.
+            "comment": ["", None, "NA"],
+            "duration": pd.to_timedelta(["1 days 00:00:01.5", None, "-2h"]),
+            "count": pd.array([1, None, 3], dtype="Int64"),
+            "small": np.array([1, 2, 3], dtype="int32"),
+            "ratio": [0.1, 1 / 3, np.nan],
+            "flag": [True, False, True],
+            "label": pd.Categorical(
+                ["x", "y", "x"],
+                categories=["y", "x"],
+                ordered=True,
+            ),
+            "when": pd.to_datetime(
+                ["2020-01-01 00:00:00.123456", None, "2021-06-01 00:00:00.000000"],
+            ),
+            "when_tz": pd.to_datetime(
+                ["2020-01-01 00:00", "2020-07-01 12:00", "2021-03-28 02:30"],
+            )
+            .tz_localize("UTC")
+            .tz_convert("Europe/Paris"),
+        },
+    )
+
+
+def test_schema_path():
+    assert schema_path("train/x_train.csv") == "train/x_train.csv.schema.json"
+
+
+def test_round_trip():
+    test_df = make_df()
+    schema = json.loads(dumps_schema(make_schema(test_df)))
+    test_csv = format_datetimes(test_df, schema).to_csv(index=False).encode()
+
+    output_df = read_csv_with_schema(BytesIO(test_csv), schema, exact_floats=True)
+
+    pd.testing.assert_frame_equal(output_df, test_df, check_exact=True)
+    # Ids keep their leading zeros.
+    assert output_df["id"].tolist() == ["007", "012", "999"]
+
+
+def test_exact_floats():
+    test_df = pd.DataFrame(
+        {"ratio": np.random.default_rng(seed=0).standard_normal(100)},
+    )
+    schema = make_schema(test_df)
+    test_csv = test_df.to_csv(index=False).encode()
+
+    # The default parser is only close, the round trip one is exact.
+    output_df = read_csv_with_schema(BytesIO(test_csv), schema)
+    pd.testing.assert_frame_equal(output_df, test_df)
+    output_df = read_csv_with_schema(BytesIO(test_csv), schema, exact_floats=True)
+    assert output_df["ratio"].tolist() == test_df["ratio"].tolist()
+
+
+def test_columns():
+    test_df = make_df()
+    schema = make_schema(test_df)
+    test_csv = format_datetimes(test_df, schema).to_csv(index=False).encode()
+
+    output_df = read_csv_with_schema(
+        BytesIO(test_csv),
+        schema,
+        columns=["label", "when_tz"],
+    )
+
+    pd.testing.assert_frame_equal(output_df, test_df[["label", "when_tz"]])
@@ -1,8 +1,18 @@
+import gzip
+import hashlib
+import os
+from datetime import date, datetime, timezone
 from unittest.mock import Mock
 
 import pandas as pd
-from azure.core.exceptions import ResourceExistsError
-from pytest import fixture
+from azure.core.exceptions import (
+    HttpResponseError,
+    ResourceExistsError,
+    ResourceModifiedError,
+    ResourceNotFoundError,
+    ServiceRequestError,
+)
+from pytest import fixture, raises
 
 from azure_helper.interfaces.blob_storage_interface import BlobStorageInterface
 
@@ -26,6 +36,68 @@ def blob_storage_resources(mocker):
     return mock_blob_service_client, blob_service_client_obj, blob_storage_interface
 
 
+@fixture
+def blob_store(blob_storage_resources):
+    # In-memory blobs, with their ETag, and snapshots, behind the mocked blob clients.
+    _, blob_service_client_obj, _ = blob_storage_resources
+    blobs = {}
+    snapshots = {}
+
+    def make_blob_client(container, blob, snapshot=None):
+        blob_client = Mock(url=f"https://account/{container}/{blob}")
+
+        def upload_blob(
+            datas,
+            overwrite=False,
+            etag=None,
+            match_condition=None,
+            **kwargs,
+        ):
+            if blob in blobs and not overwrite:
+                raise ResourceExistsError
+            if etag is not None and blobs[blob][1] != etag:
+                raise ResourceModifiedError
+            datas = datas if isinstance(datas, bytes) else datas.read()
+            blobs[blob] = (datas, f"etag-{len(blobs)}-{len(datas)}")
+
+        def download_blob(**kwargs):
+            if blob not in blobs:
+                raise ResourceNotFoundError
+            datas = blobs[blob][0] if snapshot is None else snapshots[snapshot][1]
+            stream = Mock(size=len(datas))
+            stream.readall.return_value = datas
+            stream.chunks.return_value = iter([datas])
+            stream.properties.etag = blobs[blob][1]
+            stream.properties.content_settings.content_encoding = None
+            return stream
+
+        def create_snapshot():
+            snapshots[f"snapshot-{len(snapshots)}"] = (blob, blobs[blob][0])
+            return {"snapshot": f"snapshot-{len(snapshots) - 1}"}
+
+        def delete_blob(delete_snapshots=None, **kwargs):
+            blob_snapshots = [name for name, (of, _) in snapshots.items() if of == blob]
+            if blob_snapshots and delete_snapshots != "include":
+                raise HttpResponseError("SnapshotsPresent")
+            for name in blob_snapshots:
+                del snapshots[name]
+            del blobs[blob]
+
+        def start_copy_from_url(source_url, **kwargs):
+            blobs[blob] = blobs[source_url.split("/", 4)[4]]
+            return {"copy_id": f"id-{blob}", "copy_status": "success"}
+
+        blob_client.upload_blob.side_effect = upload_blob
+        blob_client.download_blob.side_effect = download_blob
+        blob_client.create_snapshot.side_effect = create_snapshot
+        blob_client.delete_blob.side_effect = delete_blob
+        blob_client.start_copy_from_url.side_effect = start_copy_from_url
+        return blob_client
+
+    blob_service_client_obj.get_blob_client.side_effect = make_blob_client
+    return blobs, snapshots
+
+
 class TestBlobStorageInterface:
     def test_init(self, blob_storage_resources):
 
@@ -110,15 +182,18 @@ class TestBlobStorageInterface:
             "test_container_name",
             "test_remote_path",
         )
-        assert len(caplog.records) == 7
+        # The container is now known, so it is not created a second time.
+        blob_service_client_obj.create_container.assert_called_once()
+        assert len(caplog.records) == 6
         assert (
-            "Blob path test_remote_path already contains datas. Now deleting old datas tu upload the new ones."
-            in caplog.records[5].message
+            "Blob path test_remote_path already contains datas. Now overwriting old datas with the new ones."
+            in caplog.records[4].message
         )
         # Second time upload_df_to_blob is called, there is a
-        # ResourceExistsError raised so the blob is deleted first
-        mock_blob_client.delete_blob.assert_called_once()
-        mock_blob_client.upload_blob.assert_called()
+        # ResourceExistsError raised so the blob is overwritten, not deleted
+        mock_blob_client.delete_blob.assert_not_called()
+        _, kwargs = mock_blob_client.upload_blob.call_args
+        assert kwargs["overwrite"] is True
 
     def test_download_blob_to_df(self, blob_storage_resources, caplog):
 
@@ -126,11 +201,12 @@ class TestBlobStorageInterface:
 
         mock_blob_client = Mock()
         mock_stream = Mock()
-        test_csv_str = "a,b\n1,2\n3,4"
+        test_csv = b"a,b\n1,2\n3,4"
 
         blob_service_client_obj.get_blob_client.return_value = mock_blob_client
         mock_blob_client.download_blob.return_value = mock_stream
-        mock_stream.content_as_text.return_value = test_csv_str
+        mock_stream.readall.return_value = test_csv
+        mock_stream.size = len(test_csv)
 
         output_df = blob_storage_interface.download_blob_to_df(
             "test_container_name",
@@ -146,10 +222,1060 @@ class TestBlobStorageInterface:
             blob="test_remote_path",
         )
         mock_blob_client.download_blob.assert_called_once()
-        mock_stream.content_as_text.assert_called_once()
+        mock_stream.readall.assert_called_once()
 
         assert len(caplog.records) == 2
         assert (
             "Download from test_container_name ended successfully."
             in caplog.records[1].message
         )
+
+    def test_known_containers(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        blob_storage_interface.upload_to_blob(b"a", "test_container_name", "path_a")
+        blob_storage_interface.upload_to_blob(b"b", "test_container_name", "path_b")
+        blob_service_client_obj.create_container.assert_called_once_with(
+            "test_container_name",
+        )
+
+        blob_storage_interface.forget_container("test_container_name")
+        blob_storage_interface.upload_to_blob(b"c", "test_container_name", "path_c")
+        assert blob_service_client_obj.create_container.call_count == 2
+
+    def test_upload_to_blob_chunked(self, blob_storage_resources, tmp_path, mocker):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+        source_md5 = mocker.patch(f"{test_module}.source_md5")
+
+        mock_blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+
+        test_file = tmp_path / "test_data.bin"
+        test_file.write_bytes(b"0123456789")
+
+        blob_storage_interface.upload_to_blob(
+            test_file,
+            "test_container_name",
+            "test_remote_path",
+            block_size=4,
+            max_concurrency=2,
+        )
+
+        # 10 bytes in blocks of 4 bytes gives 3 blocks, staged then committed
+        # in order, without any single request upload.
+        assert mock_blob_client.stage_block.call_count == 3
+        staged = sorted(
+            mock_blob_client.stage_block.call_args_list,
+            key=lambda call: call.args[0],
+        )
+        assert b"".join(call.args[1] for call in staged) == b"0123456789"
+
+        (block_list,), _ = mock_blob_client.commit_block_list.call_args
+        assert [block.id for block in block_list] == [call.args[0] for call in staged]
+        mock_blob_client.upload_blob.assert_not_called()
+        # The file is read once, its Content-MD5 is the digest of the blocks staged.
+        source_md5.assert_not_called()
+        _, kwargs = mock_blob_client.commit_block_list.call_args
+        assert (
+            bytes(kwargs["content_settings"].content_md5)
+            == hashlib.md5(
+                b"0123456789",
+            ).digest()
+        )
+
+    def test_stream_from_blob(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        mock_blob_client = Mock()
+        mock_stream = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+        mock_blob_client.download_blob.return_value = mock_stream
+        mock_stream.chunks.return_value = iter([b"a,b\n1,", b"2\n3,4", b"\n"])
+
+        reader = blob_storage_interface.stream_from_blob(
+            "test_container_name",
+            "test_remote_path",
+        )
+        output_df = pd.read_csv(reader)
+
+        assert output_df.loc[1, "b"] == 4
+        # The blob is never materialized as a whole.
+        mock_stream.content_as_text.assert_not_called()
+        mock_stream.readall.assert_not_called()
+
+    def test_parquet_round_trip(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        mock_blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+
+        test_df = pd.DataFrame({"a": [1, 3], "b": [2.0, 4.0], "c": ["x", "y"]})
+
+        blob_storage_interface.upload_df_to_blob(
+            test_df,
+            "test_container_name",
+            "test_remote_path.parquet",
+        )
+        (uploaded,), _ = mock_blob_client.upload_blob.call_args
+        # Parquet files start with the "PAR1" magic bytes.
+        assert uploaded[:4] == b"PAR1"
+
+        def download_range(offset, length):
+            stream = Mock()
+            stream.readall.return_value = uploaded[offset : offset + length]
+            return stream
+
+        mock_blob_client.get_blob_properties.return_value.size = len(uploaded)
+        mock_blob_client.download_blob.side_effect = download_range
+
+        output_df = blob_storage_interface.download_blob_to_df(
+            "test_container_name",
+            "test_remote_path.parquet",
+            columns=["a", "c"],
+        )
+
+        pd.testing.assert_frame_equal(output_df, test_df[["a", "c"]])
+        # Only ranges of the file are downloaded, never the whole blob at once.
+        for call in mock_blob_client.download_blob.call_args_list:
+            assert "length" in call.kwargs
+
+    def test_upload_to_blob_overwrite(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        mock_blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+
+        result = blob_storage_interface.upload_to_blob(
+            b"0123456789",
+            "test_container_name",
+            "test_remote_path",
+            overwrite=True,
+        )
+
+        # A single request replaces the existing blob, and sets its Content-MD5 whatever its size.
+        mock_blob_client.upload_blob.assert_called_once()
+        args, kwargs = mock_blob_client.upload_blob.call_args
+        assert args == (b"0123456789",)
+        assert kwargs["overwrite"]
+        assert (
+            kwargs["content_settings"].content_md5
+            == hashlib.md5(b"0123456789").digest()
+        )
+        mock_blob_client.delete_blob.assert_not_called()
+        assert result.bytes_sent == 10
+        assert result.bytes_skipped == 0
+
+    def test_upload_to_blob_skip_unchanged(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        mock_blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+        properties = mock_blob_client.get_blob_properties.return_value
+        properties.size = 10
+        properties.content_settings.content_md5 = bytearray(
+            hashlib.md5(b"0123456789").digest(),
+        )
+
+        result = blob_storage_interface.upload_to_blob(
+            b"0123456789",
+            "test_container_name",
+            "test_remote_path",
+            overwrite=True,
+            skip_unchanged=True,
+        )
+        mock_blob_client.upload_blob.assert_not_called()
+        assert result.skipped
+        assert result.bytes_sent == 0
+        assert result.bytes_skipped == 10
+
+        result = blob_storage_interface.upload_to_blob(
+            b"9876543210",
+            "test_container_name",
+            "test_remote_path",
+            overwrite=True,
+            skip_unchanged=True,
+        )
+        mock_blob_client.upload_blob.assert_called_once()
+        assert not result.skipped
+        assert result.bytes_sent == 10
+
+    def test_upload_directory(self, blob_storage_resources, tmp_path):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        (tmp_path / "day=1").mkdir()
+        (tmp_path / "day=1" / "part-0.csv").write_bytes(b"a,b\n1,2\n")
+        (tmp_path / "day=2").mkdir()
+        (tmp_path / "day=2" / "part-0.csv").write_bytes(b"a,b\n3,4\n")
+
+        # The first partition is already uploaded.
+        unchanged = Mock()
+        unchanged.name = "raw/day=1/part-0.csv"
+        unchanged.size = 8
+        unchanged.content_settings.content_md5 = bytearray(
+            hashlib.md5(b"a,b\n1,2\n").digest(),
+        )
+        container_client = blob_service_client_obj.get_container_client.return_value
+        container_client.list_blobs.return_value = [unchanged]
+
+        mock_blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+
+        results = blob_storage_interface.upload_directory(
+            tmp_path,
+            "test_container_name",
+            prefix="raw",
+            max_workers=2,
+        )
+
+        container_client.list_blobs.assert_called_once_with(
+            name_starts_with="raw/",
+            include=["metadata"],
+        )
+        assert [result.blob_path for result in results] == [
+            "raw/day=1/part-0.csv",
+            "raw/day=2/part-0.csv",
+        ]
+        assert results[0].skipped
+        assert results[1].bytes_sent == 8
+        # Unchanged files are skipped without any per-file request.
+        mock_blob_client.get_blob_properties.assert_not_called()
+        mock_blob_client.upload_blob.assert_called_once()
+
+    def test_download_prefix(self, blob_storage_resources, tmp_path, mocker):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+        mocker.patch(f"{test_module}.RETRY_BACKOFF", 0)
+
+        last_modified = datetime(2022, 9, 1, tzinfo=timezone.utc)
+        remote_blobs = []
+        for name in ("train/x_train.csv", "train/sub/y_train.csv", "train/done.csv"):
+            properties = Mock()
+            properties.name = name
+            properties.size = 4
+            properties.last_modified = last_modified
+            remote_blobs.append(properties)
+        container_client = blob_service_client_obj.get_container_client.return_value
+        container_client.list_blobs.return_value = remote_blobs
+
+        # "done.csv" was already downloaded by a previous, interrupted, sync.
+        done_path = tmp_path / "done.csv"
+        done_path.write_bytes(b"done")
+        os.utime(done_path, (last_modified.timestamp(), last_modified.timestamp()))
+
+        def readinto(file_obj):
+            return file_obj.write(b"data")
+
+        mock_blob_client = Mock()
+        # The first download fails, and is retried.
+        mock_blob_client.download_blob.side_effect = [
+            ServiceRequestError("connection reset"),
+            Mock(readinto=readinto),
+            Mock(readinto=readinto),
+        ]
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+
+        reports = []
+        results = blob_storage_interface.download_prefix(
+            "test_container_name",
+            "train/",
+            tmp_path,
+            max_workers=1,
+            progress_callback=reports.append,
+        )
+
+        assert [result.error for result in results] == [None, None, None]
+        assert [report.bytes_done for report in reports] == [4, 8, 12]
+        assert all(report.total_bytes == 12 for report in reports)
+        assert [result.skipped for result in results] == [False, False, True]
+        assert (tmp_path / "x_train.csv").read_bytes() == b"data"
+        assert (tmp_path / "sub" / "y_train.csv").read_bytes() == b"data"
+        assert not list(tmp_path.rglob("*.part"))
+        assert mock_blob_client.download_blob.call_count == 3
+
+    def test_download_prefix_folder(self, blob_storage_resources, tmp_path):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        remote_blobs = []
+        for name in ("raw/x.csv", "raw2/x.csv"):
+            properties = Mock(size=4)
+            properties.name = name
+            properties.last_modified = datetime(2022, 9, 1, tzinfo=timezone.utc)
+            remote_blobs.append(properties)
+        container_client = blob_service_client_obj.get_container_client.return_value
+        container_client.list_blobs.side_effect = lambda name_starts_with, **kwargs: [
+            properties
+            for properties in remote_blobs
+            if properties.name.startswith(name_starts_with)
+        ]
+        blob_service_client_obj.get_blob_client.return_value.download_blob.return_value = Mock(
+            readinto=lambda file_obj: file_obj.write(b"data"),
+        )
+
+        # "raw" is the folder raw/, its sibling raw2/ is not downloaded.
+        results = blob_storage_interface.download_prefix(
+            "test_container_name",
+            "raw",
+            tmp_path,
+        )
+
+        assert [result.blob_path for result in results] == ["raw/x.csv"]
+        assert [path.name for path in tmp_path.iterdir()] == ["x.csv"]
+
+    def test_download_blob_to_df_cached(self, mocker, tmp_path):
+
+        blob_service_client_obj = Mock()
+        mock_blob_service_client = mocker.patch(f"{test_module}.BlobServiceClient")
+        mock_blob_service_client.from_connection_string.return_value = (
+            blob_service_client_obj
+        )
+        blob_storage_interface = BlobStorageInterface(
+            "test_storage_acct_name",
+            "test_storage_acct_key",
+            cache_dir=tmp_path,
+        )
+
+        mock_blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+        mock_blob_client.get_blob_properties.return_value.etag = '"etag"'
+        mock_blob_client.download_blob.return_value.chunks.return_value = iter(
+            [b"a,b\n1,2\n3,4"],
+        )
+
+        for _ in range(2):
+            output_df = blob_storage_interface.download_blob_to_df(
+                "test_container_name",
+                "test_remote_path",
+            )
+            assert output_df.loc[1, "b"] == 4
+
+        # The second read only costs a metadata request.
+        mock_blob_client.download_blob.assert_called_once()
+        assert mock_blob_client.get_blob_properties.call_count == 2
+        assert blob_storage_interface.cache.stats.hits == 1
+
+    def test_compressed_round_trip(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        mock_blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+        staged = {}
+        mock_blob_client.stage_block.side_effect = (
+            lambda block_id, block: staged.update({block_id: block})
+        )
+
+        test_csv = b"a,b\n" + b"1,2\n" * 10000
+        result = blob_storage_interface.upload_to_blob(
+            test_csv,
+            "test_container_name",
+            "test_remote_path.csv",
+            content_encoding="gzip",
+        )
+
+        (block_list,), kwargs = mock_blob_client.commit_block_list.call_args
+        assert kwargs["content_settings"].content_encoding == "gzip"
+        assert kwargs["metadata"] == {"source_md5": hashlib.md5(test_csv).hexdigest()}
+        compressed = b"".join(staged[block.id] for block in block_list)
+        assert result.bytes_sent == len(compressed) < len(test_csv)
+
+        mock_stream = mock_blob_client.download_blob.return_value
+        mock_stream.properties.content_settings.content_encoding = "gzip"
+        mock_stream.chunks.return_value = iter(
+            [compressed[:100], compressed[100:]],
+        )
+
+        buffer = blob_storage_interface.download_from_blob(
+            "test_container_name",
+            "test_remote_path.csv",
+        )
+
+        assert buffer.getvalue() == test_csv.decode()
+        mock_blob_client.download_blob.assert_called_once_with(decompress=False)
+
+    def test_upload_df_to_blob_chunked(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        mock_blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+        staged = {}
+        mock_blob_client.stage_block.side_effect = (
+            lambda block_id, block: staged.update({block_id: block})
+        )
+
+        test_df = pd.DataFrame({"a": range(1000), "b": [0.5] * 1000})
+
+        result = blob_storage_interface.upload_df_to_blob(
+            test_df,
+            "test_container_name",
+            "test_remote_path.csv",
+            chunksize=100,
+            block_size=1024,
+            max_concurrency=2,
+        )
+
+        (block_list,), _ = mock_blob_client.commit_block_list.call_args
+        uploaded = b"".join(staged[block.id] for block in block_list)
+        # The file is the same as the one serialized at once, cut in blocks.
+        assert uploaded == test_df.to_csv(index=False, header=True).encode()
+        assert all(block.size <= 1024 for block in block_list)
+        assert result.bytes_sent == len(uploaded)
+        mock_blob_client.upload_blob.assert_not_called()
+
+    def test_iter_df_chunks(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        test_csv = b"a,b,c\n" + b"".join(
+            f"{idx},{idx},x\n".encode() for idx in range(100)
+        )
+        mock_blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+        mock_blob_client.download_blob.return_value.chunks.return_value = iter(
+            [test_csv[idx : idx + 64] for idx in range(0, len(test_csv), 64)],
+        )
+
+        chunks = list(
+            blob_storage_interface.iter_df_chunks(
+                "test_container_name",
+                "test_remote_path.csv",
+                chunksize=30,
+                usecols=["a", "b"],
+                dtype={"a": "int32"},
+            ),
+        )
+
+        assert [len(chunk) for chunk in chunks] == [30, 30, 30, 10]
+        assert list(chunks[0].columns) == ["a", "b"]
+        assert chunks[0]["a"].dtype == "int32"
+        assert chunks[-1]["b"].iloc[-1] == 99
+
+    def test_iter_df_chunks_error(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        def failing_chunks():
+            yield b"a,b\n1,2\n"
+            raise ServiceRequestError("connection reset")
+
+        mock_blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+        mock_blob_client.download_blob.return_value.chunks.return_value = (
+            failing_chunks()
+        )
+
+        # Errors of the background download are raised to the consumer.
+        with raises(ServiceRequestError):
+            list(
+                blob_storage_interface.iter_df_chunks(
+                    "test_container_name",
+                    "test_remote_path.csv",
+                    chunksize=1,
+                ),
+            )
+
+    def test_range_reads(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        test_csv = b"a,b\n" + b"".join(
+            f"{idx},{idx * 2}\n".encode() for idx in range(1000)
+        )
+
+        def ranged_download(offset=0, length=None, **kwargs):
+            downloader = Mock()
+            downloader.readall.return_value = test_csv[offset : offset + length]
+            return downloader
+
+        mock_blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+        mock_blob_client.get_blob_properties.return_value.size = len(test_csv)
+        mock_blob_client.download_blob.side_effect = ranged_download
+
+        assert (
+            blob_storage_interface.read_range(
+                "test_container_name",
+                "test_remote_path.csv",
+                4,
+                8,
+            )
+            == b"0,0\n"
+        )
+
+        head = blob_storage_interface.head_df(
+            "test_container_name",
+            "test_remote_path.csv",
+            nrows=5,
+        )
+        assert head["a"].tolist() == [0, 1, 2, 3, 4]
+
+        sample = blob_storage_interface.sample_df(
+            "test_container_name",
+            "test_remote_path.csv",
+            n_samples=50,
+            random_state=0,
+        )
+        assert 0 < len(sample) <= 50
+        assert (sample["b"] == sample["a"] * 2).all()
+        assert sample["a"].is_monotonic_increasing
+
+    def test_range_reads_edge_cases(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        blobs = {}
+
+        def make_blob_client(container, blob):
+            test_csv = blobs[blob]
+
+            properties = Mock(size=len(test_csv))
+            properties.content_settings.content_encoding = (
+                "gzip" if blob.endswith(".gz") else None
+            )
+
+            def ranged_download(offset=0, length=0, **kwargs):
+                downloader = Mock(properties=properties)
+                downloader.readall.return_value = test_csv[offset : offset + length]
+                downloader.chunks.return_value = [test_csv]
+                return downloader
+
+            mock_blob_client = Mock()
+            mock_blob_client.get_blob_properties.return_value = properties
+            mock_blob_client.download_blob.side_effect = ranged_download
+            return mock_blob_client
+
+        blob_service_client_obj.get_blob_client.side_effect = make_blob_client
+
+        # Headers and rows longer than the first range read.
+        long_header = ",".join(f"column_{idx}" for idx in range(10000)).encode()
+        long_rows = [b",".join([str(row).encode() * 9] * 10000) for row in range(4)]
+        blobs["wide.csv"] = b"\n".join([long_header, *long_rows])
+        sample = blob_storage_interface.sample_df(
+            "test_container_name",
+            "wide.csv",
+            n_samples=20,
+            random_state=0,
+        )
+        assert sample.shape == (3, 10000)
+        assert sample["column_0"].tolist() == [111111111, 222222222, 333333333]
+
+        blobs["empty.csv"] = b""
+        assert blob_storage_interface.sample_df(
+            "test_container_name",
+            "empty.csv",
+            n_samples=5,
+        ).empty
+
+        # Compressed blobs are decompressed by head_df, and can not be sampled.
+        blobs["test.csv.gz"] = gzip.compress(b"a,b\n1,2\n3,4\n")
+        head = blob_storage_interface.head_df(
+            "test_container_name",
+            "test.csv.gz",
+            nrows=1,
+        )
+        assert head.to_dict("records") == [{"a": 1, "b": 2}]
+        with raises(ValueError):
+            blob_storage_interface.sample_df(
+                "test_container_name",
+                "test.csv.gz",
+                n_samples=5,
+            )
+
+    def test_schema_round_trip(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        blob_clients = {}
+        blob_service_client_obj.get_blob_client.side_effect = (
+            lambda container, blob: blob_clients.setdefault(blob, Mock())
+        )
+
+        test_df = pd.DataFrame(
+            {
+                "id": ["007", "012"],
+                "count": pd.array([1, None], dtype="Int64"),
+                "day": pd.to_datetime(["2022-01-01", "2022-01-02"]),
+            },
+        )
+        blob_storage_interface.upload_df_to_blob(
+            test_df,
+            "test_container_name",
+            "test_remote_path.csv",
+            overwrite=True,
+            write_schema=True,
+        )
+
+        for blob_client in blob_clients.values():
+            (uploaded,), _ = blob_client.upload_blob.call_args
+            blob_client.download_blob.return_value.readall.return_value = uploaded
+
+        assert set(blob_clients) == {
+            "test_remote_path.csv",
+            "test_remote_path.csv.schema.json",
+        }
+        output_df = blob_storage_interface.download_blob_to_df(
+            "test_container_name",
+            "test_remote_path.csv",
+            use_schema=True,
+        )
+        pd.testing.assert_frame_equal(output_df, test_df)
+
+        with raises(ValueError):
+            blob_storage_interface.upload_df_to_blob(
+                test_df,
+                "test_container_name",
+                "test_remote_path.parquet",
+                write_schema=True,
+            )
+
+    def test_download_blob_to_df_arrow_engine(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        test_csv = b"a,b\n1,2\n3,4\n"
+        mock_blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+        mock_stream = mock_blob_client.download_blob.return_value
+        mock_stream.size = len(test_csv)
+        mock_stream.readall.return_value = test_csv
+
+        output_df = blob_storage_interface.download_blob_to_df(
+            "test_container_name",
+            "test_remote_path.csv",
+            columns=["b"],
+            engine="pyarrow",
+        )
+
+        # The bytes are parsed as is, without decoding them first.
+        mock_stream.content_as_text.assert_not_called()
+        assert output_df["b"].tolist() == [2, 4]
+        assert list(output_df.columns) == ["b"]
+
+    def test_upload_dfs(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        blob_clients = {}
+        blob_service_client_obj.get_blob_client.side_effect = (
+            lambda container, blob: blob_clients.setdefault(blob, Mock())
+        )
+        test_dfs = [
+            (
+                pd.DataFrame({"a": range(idx * 10), "b": [0.5] * idx * 10}),
+                f"part-{idx}.csv",
+            )
+            for idx in range(6)
+        ]
+
+        results = blob_storage_interface.upload_dfs(
+            test_dfs,
+            "test_container_name",
+            max_serializers=2,
+            max_uploads=2,
+            queue_size=2,
+            skip_unchanged=False,
+        )
+
+        assert [result.blob_path for result in results] == [
+            blob_path for _, blob_path in test_dfs
+        ]
+        for dataframe, blob_path in test_dfs:
+            (uploaded,), kwargs = blob_clients[blob_path].upload_blob.call_args
+            assert uploaded == dataframe.to_csv(index=False).encode()
+            assert kwargs["overwrite"]
+
+    def test_upload_dfs_error(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        mock_blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = mock_blob_client
+        mock_blob_client.upload_blob.side_effect = ServiceRequestError(
+            "connection reset",
+        )
+
+        with raises(ServiceRequestError):
+            blob_storage_interface.upload_dfs(
+                [(pd.DataFrame({"a": [idx]}), f"part-{idx}.csv") for idx in range(10)],
+                "test_container_name",
+                max_serializers=1,
+                max_uploads=1,
+                queue_size=1,
+                skip_unchanged=False,
+            )
+
+    def test_partitions(self, blob_storage_resources, blob_store):
+
+        _, _, blob_storage_interface = blob_storage_resources
+        blobs, _ = blob_store
+
+        for day in range(1, 4):
+            blob_storage_interface.append_df(
+                pd.DataFrame({"day": [day] * day}),
+                "test_container_name",
+                "raw/sales",
+                partition_date=date(2022, 9, day),
+            )
+
+        manifest = blob_storage_interface.get_manifest(
+            "test_container_name",
+            "raw/sales",
+        )
+        assert [partition.rows for partition in manifest.partitions] == [1, 2, 3]
+        assert manifest.partitions[1].blob_path.startswith(
+            "raw/sales/date=2022-09-02/part-",
+        )
+        # Appending never rewrites the existing partitions.
+        assert len(blobs) == 4
+
+        window = blob_storage_interface.read_partitions(
+            "test_container_name",
+            "raw/sales",
+            start=date(2022, 9, 2),
+            end=date(2022, 9, 3),
+        )
+        assert window["day"].tolist() == [2, 2, 3, 3, 3]
+
+    def test_sync_directory(self, blob_storage_resources, blob_store, tmp_path):
+
+        _, _, blob_storage_interface = blob_storage_resources
+        blobs, _ = blob_store
+
+        for index in range(5):
+            (tmp_path / "part").mkdir(exist_ok=True)
+            (tmp_path / "part" / f"{index}.csv").write_text(f"a\n{index}\n")
+
+        results = blob_storage_interface.sync_directory(
+            tmp_path,
+            "test_container_name",
+            "features",
+        )
+        assert sum(result.bytes_sent for result in results) == 20
+        assert set(blobs) == {f"features/part/{index}.csv" for index in range(5)} | {
+            "features/_sync_manifest.json",
+        }
+
+        (tmp_path / "part" / "3.csv").write_text("a\n33\n")
+        results = blob_storage_interface.sync_directory(
+            tmp_path,
+            "test_container_name",
+            "features",
+        )
+        assert [result.bytes_sent for result in results] == [0, 0, 0, 5, 0]
+        assert [result.bytes_skipped for result in results] == [4, 4, 4, 0, 4]
+        assert blobs["features/part/3.csv"][0] == b"a\n33\n"
+
+        results = blob_storage_interface.sync_dfs(
+            [
+                (pd.DataFrame({"a": [3]}), "part/3.csv"),
+                (pd.DataFrame({"a": [4]}), "part/4.csv"),
+            ],
+            "test_container_name",
+            "features",
+        )
+        assert [result.bytes_sent for result in results] == [4, 0]
+
+        # Dataframes are pulled, serialized and uploaded one worker at a time, not all up front.
+        uploaded_when_pulled = []
+
+        def dataframes():
+            for index in range(4):
+                uploaded_when_pulled.append(len(blobs))
+                yield pd.DataFrame({"a": [index]}), f"lazy/{index}.csv"
+
+        before = len(blobs)
+        blob_storage_interface.sync_dfs(
+            dataframes(),
+            "test_container_name",
+            "features",
+            max_workers=1,
+        )
+        assert all(
+            uploaded >= before + index - 1
+            for index, uploaded in enumerate(uploaded_when_pulled)
+        )
+
+    def test_move_prefix(self, blob_storage_resources, mocker):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+        mocker.patch(f"{test_module}.time.sleep")
+
+        sources = []
+        for name, size in (("raw/a.csv", 10), ("raw/b.csv", 20), ("raw/c.csv", 30)):
+            properties = Mock(size=size)
+            properties.name = name
+            sources.append(properties)
+        blob_service_client_obj.get_container_client.return_value.list_blobs.return_value = (
+            sources
+        )
+
+        blob_clients = {}
+
+        def make_blob_client(container, blob):
+            if blob not in blob_clients:
+                blob_client = Mock(url=f"https://account/{container}/{blob}")
+                blob_client.start_copy_from_url.return_value = {
+                    "copy_id": f"id-{blob}",
+                    # b.csv is copied asynchronously, c.csv fails.
+                    "copy_status": "pending" if blob != "train/a.csv" else "success",
+                }
+                copy = Mock(
+                    status="success" if blob == "train/b.csv" else "failed",
+                    status_description="Boom",
+                )
+                blob_client.get_blob_properties.return_value.copy = copy
+                blob_clients[blob] = blob_client
+            return blob_clients[blob]
+
+        blob_service_client_obj.get_blob_client.side_effect = make_blob_client
+
+        results = blob_storage_interface.move_prefix(
+            "test_container_name",
+            "raw/",
+            "test_container_name",
+            "train/",
+        )
+
+        assert [result.blob_path for result in results] == [
+            "train/a.csv",
+            "train/b.csv",
+            "train/c.csv",
+        ]
+        assert [result.status for result in results] == ["success", "success", "failed"]
+        assert results[2].error == "Boom"
+        blob_clients["train/a.csv"].start_copy_from_url.assert_called_once_with(
+            "https://account/test_container_name/raw/a.csv",
+        )
+        blob_clients["train/a.csv"].get_blob_properties.assert_not_called()
+        # Only the sources copied successfully are deleted.
+        blob_clients["raw/a.csv"].delete_blob.assert_called_once()
+        blob_clients["raw/b.csv"].delete_blob.assert_called_once()
+        blob_clients["raw/c.csv"].delete_blob.assert_not_called()
+
+        # Prefixes without their trailing slash are folders, not name prefixes.
+        list_blobs = (
+            blob_service_client_obj.get_container_client.return_value.list_blobs
+        )
+        results = blob_storage_interface.copy_prefix(
+            "test_container_name",
+            "raw",
+            "test_container_name",
+            "train",
+            timeout=0,
+        )
+        assert list_blobs.call_args.kwargs["name_starts_with"] == "raw/"
+        assert [result.blob_path for result in results] == [
+            "train/a.csv",
+            "train/b.csv",
+            "train/c.csv",
+        ]
+
+    def test_versions(self, blob_storage_resources, blob_store):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+        blobs, snapshots = blob_store
+
+        before = datetime.now(timezone.utc)
+        for content in (b"a\n1\n", b"a\n2\n"):
+            blob_storage_interface.upload_to_blob(
+                content,
+                "test_container_name",
+                "raw/data.csv",
+                keep_version=True,
+            )
+
+        index = blob_storage_interface.list_versions(
+            "test_container_name",
+            "raw/data.csv",
+        )
+        assert [
+            (blob_version.version, blob_version.snapshot)
+            for blob_version in index.versions
+        ] == [
+            (1, "snapshot-0"),
+            (2, "snapshot-1"),
+        ]
+        assert (
+            blob_storage_interface.download_from_blob(
+                "test_container_name",
+                "raw/data.csv",
+                version=1,
+            ).read()
+            == "a\n1\n"
+        )
+        assert blob_storage_interface.download_blob_to_df(
+            "test_container_name",
+            "raw/data.csv",
+            as_of=datetime.now(timezone.utc),
+        )["a"].tolist() == [2]
+        with raises(KeyError):
+            blob_storage_interface.download_from_blob(
+                "test_container_name",
+                "raw/data.csv",
+                as_of=before,
+            )
+
+        # A blob with versions is overwritten by a default upload, not deleted with its snapshots.
+        blob_storage_interface.upload_to_blob(
+            b"a\n3\n",
+            "test_container_name",
+            "raw/data.csv",
+        )
+        assert blobs["raw/data.csv"][0] == b"a\n3\n"
+        assert (
+            blob_storage_interface.download_from_blob(
+                "test_container_name",
+                "raw/data.csv",
+                version=2,
+            ).read()
+            == "a\n2\n"
+        )
+
+        # Its versions are only deleted on request when it is moved.
+        def list_blobs(name_starts_with=None, **kwargs):
+            for name in sorted(blobs):
+                if name.startswith(name_starts_with):
+                    properties = Mock(size=len(blobs[name][0]))
+                    properties.name = name
+                    yield properties
+
+        blob_service_client_obj.get_container_client.return_value.list_blobs.side_effect = (
+            list_blobs
+        )
+        results = blob_storage_interface.move_prefix(
+            "test_container_name",
+            "raw",
+            "test_container_name",
+            "train",
+        )
+        assert [result.blob_path for result in results] == [
+            "train/data.csv",
+            "train/data.csv.versions.json",
+        ]
+        assert results[0].error.startswith(
+            "Copied, but the source could not be deleted",
+        )
+        assert results[1].error is None
+        assert set(blobs) == {
+            "raw/data.csv",
+            "train/data.csv",
+            "train/data.csv.versions.json",
+        }
+        blob_storage_interface.move_prefix(
+            "test_container_name",
+            "raw",
+            "test_container_name",
+            "train",
+            delete_versions=True,
+        )
+        assert set(blobs) == {"train/data.csv", "train/data.csv.versions.json"}
+        assert not snapshots
+
+    def test_resumable_upload(self, blob_storage_resources, tmp_path):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        blob_client = Mock(url="https://account/test_container_name/raw/data.csv")
+        blob_service_client_obj.get_blob_client.return_value = blob_client
+        staged = {}
+
+        def stage_block(block_id, block, **kwargs):
+            if len(staged) == 2 and blob_client.get_block_list.call_count == 1:
+                raise ServiceRequestError("Connection reset")
+            staged[block_id] = block
+
+        blob_client.stage_block.side_effect = stage_block
+        blob_client.get_block_list.side_effect = lambda list_type: (
+            [],
+            [Mock(id=block_id) for block_id in staged],
+        )
+
+        dataset = tmp_path / "data.csv"
+        dataset.write_bytes(b"0123456789")
+        journal_dir = tmp_path / "journals"
+
+        with raises(ServiceRequestError):
+            blob_storage_interface.upload_to_blob(
+                dataset,
+                "test_container_name",
+                "raw/data.csv",
+                block_size=4,
+                journal_dir=journal_dir,
+            )
+        blob_client.commit_block_list.assert_not_called()
+
+        result = blob_storage_interface.upload_to_blob(
+            dataset,
+            "test_container_name",
+            "raw/data.csv",
+            block_size=4,
+            journal_dir=journal_dir,
+        )
+
+        assert blob_client.stage_block.call_count == 4
+        assert (result.bytes_sent, result.bytes_resumed) == (2, 8)
+        block_list = blob_client.commit_block_list.call_args[0][0]
+        assert b"".join(staged[block.id] for block in block_list) == b"0123456789"
+        assert list(journal_dir.iterdir()) == []
+
+        with raises(ValueError):
+            blob_storage_interface.upload_to_blob(
+                b"datas",
+                "test_container_name",
+                "raw/data.csv",
+                journal_dir=journal_dir,
+            )
+
+    def test_bandwidth_limited_upload(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = blob_client
+        blob_storage_interface.bandwidth_limiter = Mock()
+        reports = []
+
+        result = blob_storage_interface.upload_to_blob(
+            b"0123456789",
+            "test_container_name",
+            "raw/data.csv",
+            overwrite=True,
+            block_size=4,
+            progress_callback=reports.append,
+        )
+
+        # Limited uploads are sent block by block, each block taking its share of the bandwidth.
+        blob_client.upload_blob.assert_not_called()
+        assert blob_client.stage_block.call_count == 3
+        assert blob_storage_interface.bandwidth_limiter.consume.call_count == 3
+        assert result.bytes_sent == 10
+        assert [report.bytes_done for report in reports] == [4, 8, 10]
+        assert all(report.total_bytes == 10 for report in reports)
+
+    def test_bandwidth_limited_range_reads(self, blob_storage_resources):
+
+        _, blob_service_client_obj, blob_storage_interface = blob_storage_resources
+
+        blob_client = Mock()
+        blob_service_client_obj.get_blob_client.return_value = blob_client
+        blob_client.download_blob.return_value.readall.return_value = b"0123"
+        blob_storage_interface.bandwidth_limiter = Mock()
+
+        datas = blob_storage_interface.read_range(
+            "test_container_name",
+            "raw/data.csv",
+            0,
+            4,
+        )
+
+        # Ranged reads, and the samples made of them, take their share of the bandwidth too.
+        assert datas == b"0123"
+        blob_storage_interface.bandwidth_limiter.consume.assert_called_once_with(4)
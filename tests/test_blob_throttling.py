@@ -0,0 +1,127 @@
+import threading
+import time
+from unittest.mock import Mock
+
+from azure_helper.interfaces.blob_throttling import (
+    AdaptiveConcurrencyLimiter,
+    iter_limited,
+)
+from azure_helper.interfaces.blob_transfer import BlobRangeReader, stage_blocks
+
+
+def make_response(
+    status_code,
+    method="PUT",
+    request_size=0,
+    response_size=0,
+    error_code=None,
+):
+    response = Mock()
+    response.http_request.method = method
+    response.http_request.headers = {"Content-Length": str(request_size)}
+    response.http_response.status_code = status_code
+    response.http_response.headers = {"Content-Length": str(response_size)}
+    if error_code is not None:
+        response.http_response.headers["x-ms-error-code"] = error_code
+    return response
+
+
+def test_aimd():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=8)
+
+    # About one more slot per round of successful requests.
+    for _ in range(4 + 6):
+        limiter.response_hook(make_response(201, request_size=1000))
+    assert limiter.limit == 6
+
+    # A burst of throttled requests only halves the limit once.
+    for _ in range(6):
+        limiter.response_hook(make_response(503, error_code="ServerBusy"))
+    assert limiter.limit == 3
+
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 8
+
+    stats = limiter.stats
+    assert stats.throttled == 6
+    assert stats.successes == 110
+    assert stats.mb_per_s > 0
+
+
+def test_throughput():
+    limiter = AdaptiveConcurrencyLimiter(throughput_window=2)
+
+    limiter.response_hook(make_response(200, method="GET", response_size=3_000_000))
+    limiter.response_hook(make_response(206, method="HEAD", response_size=3_000_000))
+    limiter.response_hook(make_response(404, method="GET", response_size=3_000_000))
+
+    assert limiter.mb_per_s == 1.5
+
+
+def test_slot():
+    limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def request():
+        with limiter.slot():
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            time.sleep(0.01)
+            with lock:
+                running.pop()
+
+    threads = [threading.Thread(target=request) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) == 2
+    assert limiter.stats.in_flight == 0
+
+
+def test_stage_blocks_limited():
+    limiter = AdaptiveConcurrencyLimiter()
+    blob_client = Mock()
+
+    block_list = stage_blocks(
+        blob_client,
+        [b"a", b"b"],
+        max_concurrency=4,
+        limiter=limiter,
+    )
+
+    assert len(block_list) == 2
+    for call in blob_client.stage_block.call_args_list:
+        assert call.kwargs["raw_response_hook"] == limiter.response_hook
+
+
+def test_iter_limited():
+    limiter = AdaptiveConcurrencyLimiter()
+    in_flight = []
+
+    def chunks():
+        for chunk in (b"a", b"b"):
+            in_flight.append(limiter.stats.in_flight)
+            yield chunk
+
+    for chunk in iter_limited(chunks(), limiter):
+        # The slot is only held while a chunk is fetched.
+        assert limiter.stats.in_flight == 0
+    assert in_flight == [1, 1]
+
+
+def test_range_reader_limited():
+    limiter = AdaptiveConcurrencyLimiter()
+    blob_client = Mock()
+    blob_client.download_blob.return_value.readall.return_value = b"0123"
+
+    assert BlobRangeReader(blob_client, size=4, limiter=limiter).read(4) == b"0123"
+    assert (
+        blob_client.download_blob.call_args.kwargs["raw_response_hook"]
+        == limiter.response_hook
+    )